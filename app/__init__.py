@@ -1,55 +1,84 @@
 from flask import Flask
-from flask_marshmallow import Marshmallow
-from flask_migrate import Migrate
+from app.config import load_config
 from app.models.base import db
-import os
+import click
+import logging
 
-ma = Marshmallow()
-migrate = Migrate()
-
-def create_app():
+def create_app(profile=None):
     flask_app = Flask(__name__)
+    # orjson-backed, byte-for-byte the output of the default provider
+    from app.serialization import FastJSONProvider
+    flask_app.json = FastJSONProvider(flask_app)
 
-    flask_app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv(
-        'DATABASE_URL',
-        'postgresql+psycopg2://postgres:piyush@db:5432/medical_db'
-    )
-    flask_app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-    flask_app.config['SECRET_KEY'] = os.getenv(
-        'SECRET_KEY',
-        'super-secret-key-change-me'
-    )
+    # Typed settings for the APP_ENV profile, overridable per variable from the environment
+    config = load_config(profile)
+    for warning in config.validate():
+        logging.getLogger(__name__).warning(f"Configuration: {warning}")
+    flask_app.config.from_object(config)
 
     db.init_app(flask_app)
-    ma.init_app(flask_app)
-    migrate.init_app(flask_app, db)
+    from app.db.session import replica_router
+    replica_router.init_app(flask_app)
+
+    # Alembic is only needed by `flask db ...`; serving processes never import it
+    if flask_app.config['MIGRATIONS_ENABLED'] or click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(flask_app, db)
+
+    from app.security import jwt as jwt_security
+    from app.security.revocation import revocation_list
+    from app.security.password_hasher import HashingBusy, password_hasher
+    jwt_security.init_app(flask_app)
+    revocation_list.init_app(flask_app)
+    password_hasher.init_app(flask_app)
+
+    from app.security.rate_limit import rate_limiter
+    rate_limiter.init_app(flask_app)
 
     # Logging Configuration
-    import logging
     logging.basicConfig(level=logging.INFO)
     flask_app.logger.setLevel(logging.INFO)
 
     # Swagger Configuration
-    from flask_swagger_ui import get_swaggerui_blueprint
-    SWAGGER_URL = '/docs'
-    API_URL = '/static/swagger.json'
-    swaggerui_blueprint = get_swaggerui_blueprint(
-        SWAGGER_URL,
-        API_URL,
-        config={'app_name': "Medical Backend API"}
-    )
-    flask_app.register_blueprint(swaggerui_blueprint)
+    if flask_app.config['DOCS_ENABLED']:
+        from flask_swagger_ui import get_swaggerui_blueprint
+        SWAGGER_URL = '/docs'
+        API_URL = '/static/swagger.json'
+        swaggerui_blueprint = get_swaggerui_blueprint(
+            SWAGGER_URL,
+            API_URL,
+            config={'app_name': "Medical Backend API"}
+        )
+        flask_app.register_blueprint(swaggerui_blueprint)
 
     # Register Blueprints
     from app.controllers.auth_controller import auth_bp
     from app.controllers.admin_controller import admin_bp
     from app.controllers.availability_controller import availability_bp
     from app.controllers.appointment_controller import appointment_bp
+    from app.controllers.metrics_controller import metrics_bp
     flask_app.register_blueprint(auth_bp)
     flask_app.register_blueprint(admin_bp)
     flask_app.register_blueprint(availability_bp)
     flask_app.register_blueprint(appointment_bp)
+    flask_app.register_blueprint(metrics_bp)
+
+    # In-process caches
+    from app.services.availability_cache import availability_cache
+    availability_cache.init_app(flask_app)
+
+    # Request / SQL instrumentation exposed on /metrics. Registered before
+    # admission control so requests it sheds are counted and timed too.
+    from app.metrics import instrumentation
+    instrumentation.init_app(flask_app)
+
+    # Per-endpoint concurrency limits; sheds load with 503 before a view runs
+    from app.admission import admission_control
+    admission_control.init_app(flask_app)
+
+    @flask_app.errorhandler(HashingBusy)
+    def handle_hashing_busy(e):
+        return {"message": str(e)}, 503, {"Retry-After": str(e.retry_after)}
 
     # Global Error Handler
     @flask_app.errorhandler(Exception)
@@ -66,8 +95,21 @@ def create_app():
         from app import models
 
 
+    @flask_app.cli.command('prune-revoked-tokens')
+    def prune_revoked_tokens():
+        """Delete denylist entries whose tokens have expired anyway."""
+        import datetime
+        from app.repositories.revoked_token_repository import RevokedTokenRepository
+        deleted = RevokedTokenRepository.delete_expired(datetime.datetime.utcnow())
+        print(f"Deleted {deleted} expired revoked tokens")
+
     @flask_app.route('/')
     def index():
         return {"status": "ok", "message": "Medical Backend Running"}
 
+    # Outermost, so rate limits and logs see the client address the trusted proxies forwarded
+    if flask_app.config['PROXY_FIX_X_FOR']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        flask_app.wsgi_app = ProxyFix(flask_app.wsgi_app, x_for=flask_app.config['PROXY_FIX_X_FOR'])
+
     return flask_app
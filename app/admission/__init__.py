@@ -0,0 +1,3 @@
+from app.admission.pools import AdmissionControl, AdmissionPool, admission_control
+
+__all__ = ["AdmissionControl", "AdmissionPool", "admission_control"]
@@ -0,0 +1,244 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from flask import Flask, g, jsonify, request
+
+from app.metrics.registry import Gauge, registry
+
+logger = logging.getLogger(__name__)
+
+# Pools of slow requests; together they must leave the auth pool a thread.
+SLOW_POOLS = ('booking', 'appointment_lists', 'admin')
+
+
+def default_pools(threads: int) -> Dict[str, dict]:
+    """
+    Pool name -> settings for workers with `threads` request threads. `match`
+    lists endpoints ('blueprint.view') or whole blueprints; anything unmatched
+    runs in 'default'. Override or extend with the ADMISSION_POOLS config
+    (merged per pool name).
+
+    A queued request holds its thread while it waits, so limit + queue is what
+    a pool can occupy. Every pool but auth leaves a quarter of the threads (at
+    least one) free, and the slow pools do not queue, so a burst of bookings or
+    listings is shed while logins still find a thread.
+    """
+    reserved = max(1, threads // 4)
+    shared = max(1, threads - reserved)
+    slow = max(1, threads // 4)
+    return {
+        'auth': {'match': ['auth'], 'limit': threads, 'queue': threads, 'max_wait_ms': 500},
+        'availability': {'match': ['availability'], 'limit': shared, 'queue': 0},
+        'booking': {'match': ['appointments.book_appointment'], 'limit': slow, 'queue': 0},
+        'appointment_lists': {'match': ['appointments.get_appointments'], 'limit': slow, 'queue': 0},
+        'admin': {'match': ['admin'], 'limit': 1, 'queue': 0},
+        'default': {'match': [], 'limit': shared, 'queue': 0},
+    }
+
+
+def capacity_warnings(pools: Dict[str, "AdmissionPool"], threads: int) -> List[str]:
+    """Ways the pools can still take every request thread away from the auth pool."""
+    def occupancy(pool: AdmissionPool) -> int:
+        limit = pool.max_limit if pool.target_latency is not None else pool.limit
+        return limit + pool.queue
+
+    warnings = [
+        f"admission pool '{name}' can hold {occupancy(pool)} requests, every one of the {threads} threads"
+        for name, pool in pools.items() if name != 'auth' and occupancy(pool) >= threads
+    ]
+    slow = sum(occupancy(pools[name]) for name in SLOW_POOLS if name in pools)
+    if slow >= threads:
+        warnings.append(f"admission pools {', '.join(SLOW_POOLS)} together can hold {slow} requests, "
+                        f"every one of the {threads} threads")
+    return warnings
+# Never shed: health check, scrapes and docs must answer even when the database is down.
+DEFAULT_EXEMPT = ('index', 'metrics', 'static', 'swagger_ui')
+
+REJECTED = registry.counter(
+    "admission_rejected_total", "Requests shed with 503, by pool and reason.", ("pool", "reason")
+)
+WAIT_TIME = registry.histogram(
+    "admission_wait_seconds", "Time spent queued for a pool slot.", ("pool",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+class AdmissionPool:
+    """
+    Concurrency limit with a short bounded wait queue.
+
+    With `target_latency_ms` set the limit adapts (AIMD): every `window`
+    completions it shrinks by 10% when the average latency of the window is
+    above target and grows by one when requests had to queue and latency was
+    fine, staying within [min_limit, max_limit].
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue: int = 0,
+        max_wait_ms: float = 0,
+        target_latency_ms: Optional[float] = None,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        window: int = 50,
+        match: Iterable[str] = (),
+    ):
+        self.name = name
+        self.limit = limit
+        self.queue = queue
+        self.max_wait = max_wait_ms / 1000
+        self.target_latency = target_latency_ms / 1000 if target_latency_ms else None
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit * 4
+        self.window = window
+        self.match = tuple(match)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+        self._window_count = 0
+        self._window_latency = 0.0
+        self._window_queued = False
+
+    def try_acquire(self) -> Optional[str]:
+        """Take a slot; returns None on success or the reason ('queue_full', 'timeout') for shedding."""
+        with self._cond:
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                return None
+            if self.waiting >= self.queue or self.max_wait <= 0:
+                self.rejected += 1
+                return 'queue_full'
+
+            self.waiting += 1
+            self._window_queued = True
+            deadline = time.monotonic() + self.max_wait
+            try:
+                while self.in_flight >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        return 'timeout'
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                return None
+            finally:
+                self.waiting -= 1
+
+    def release(self, latency: float) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if self.target_latency is not None:
+                self._observe(latency)
+            self._cond.notify()
+
+    def _observe(self, latency: float) -> None:
+        self._window_count += 1
+        self._window_latency += latency
+        if self._window_count < self.window:
+            return
+        average = self._window_latency / self._window_count
+        previous = self.limit
+        if average > self.target_latency:
+            self.limit = max(self.min_limit, int(self.limit * 0.9))
+        elif self._window_queued:
+            self.limit = min(self.max_limit, self.limit + 1)
+        if self.limit != previous:
+            logger.info(f"Admission pool '{self.name}' limit {previous} -> {self.limit} (avg {average * 1000:.1f} ms)")
+            # A raised limit may admit waiters right away
+            self._cond.notify_all()
+        self._window_count = 0
+        self._window_latency = 0.0
+        self._window_queued = False
+
+
+class AdmissionControl:
+    """
+    Routes every request to the admission pool of its endpoint or blueprint,
+    so a slow class of requests (booking writes, admin listings) exhausts its
+    own slots instead of every worker thread. Limits are per process; they only
+    matter with threaded workers.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.pools: Dict[str, AdmissionPool] = {}
+        self._by_endpoint: Dict[str, AdmissionPool] = {}
+        self._by_blueprint: Dict[str, AdmissionPool] = {}
+        self._exempt = frozenset(DEFAULT_EXEMPT)
+
+    def init_app(self, app: Flask) -> None:
+        self.enabled = app.config.get('ADMISSION_CONTROL_ENABLED', True)
+        self._exempt = frozenset(app.config.get('ADMISSION_EXEMPT', DEFAULT_EXEMPT))
+        threads = app.config.get('GUNICORN_THREADS', 4)
+        defaults = default_pools(threads)
+        configured = {
+            name: {**defaults.get(name, {}), **settings}
+            for name, settings in {**defaults, **app.config.get('ADMISSION_POOLS', {})}.items()
+        }
+        self.pools = {name: AdmissionPool(name, **settings) for name, settings in configured.items()}
+        if 'default' not in self.pools:
+            raise ValueError("ADMISSION_POOLS must keep a 'default' pool")
+        if self.enabled:
+            for warning in capacity_warnings(self.pools, threads):
+                logger.warning(f"Admission control: {warning}; logins can starve (see GUNICORN_THREADS)")
+
+        self._by_endpoint, self._by_blueprint = {}, {}
+        for pool in self.pools.values():
+            for target in pool.match:
+                (self._by_endpoint if '.' in target else self._by_blueprint)[target] = pool
+
+        app.before_request(self._admit)
+        app.teardown_request(self._release)
+        registry.register_collector("admission", self._collect)
+
+    def pool_for(self, endpoint: Optional[str], blueprint: Optional[str]) -> Optional[AdmissionPool]:
+        if endpoint is None or endpoint in self._exempt or blueprint in self._exempt:
+            return None
+        pool = self._by_endpoint.get(endpoint)
+        if pool is None:
+            pool = self._by_blueprint.get(blueprint, self.pools['default'])
+        return pool
+
+    def _admit(self):
+        if not self.enabled:
+            return None
+        pool = self.pool_for(request.endpoint, request.blueprint)
+        if pool is None:
+            return None
+
+        started = time.perf_counter()
+        reason = pool.try_acquire()
+        waited = time.perf_counter() - started
+        if waited > 0.0005:
+            WAIT_TIME.observe((pool.name,), waited)
+        if reason is not None:
+            REJECTED.inc((pool.name, reason))
+            return jsonify({'message': 'Server busy, retry later'}), 503, {'Retry-After': '1'}
+
+        g.admission = (pool, time.perf_counter())
+        return None
+
+    def _release(self, exc=None) -> None:
+        admitted = g.pop('admission', None)
+        if admitted is not None:
+            pool, started = admitted
+            pool.release(time.perf_counter() - started)
+
+    def _collect(self) -> List:
+        in_flight = Gauge("admission_in_flight", "Requests currently holding a pool slot.", ("pool",))
+        waiting = Gauge("admission_queued", "Requests waiting for a pool slot.", ("pool",))
+        limit = Gauge("admission_limit", "Current concurrency limit of the pool.", ("pool",))
+        for pool in self.pools.values():
+            in_flight.set((pool.name,), pool.in_flight)
+            waiting.set((pool.name,), pool.waiting)
+            limit.set((pool.name,), pool.limit)
+        return [in_flight, waiting, limit]
+
+
+admission_control = AdmissionControl()
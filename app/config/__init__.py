@@ -1 +1,31 @@
 # Config loader
+import os
+from typing import Dict, Optional, Type
+
+from app.config.default import Config, ConfigError
+from app.config.development import DevelopmentConfig, TestingConfig
+from app.config.production import ProductionConfig
+
+PROFILES: Dict[str, Type[Config]] = {
+    'default': Config,
+    'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production': ProductionConfig,
+}
+
+
+def load_config(profile: Optional[str] = None) -> Config:
+    """
+    Build the config for `profile` (default: APP_ENV, then 'production') from the environment.
+    An unset APP_ENV gets the strict profile: a deployment that forgot it fails
+    validation instead of serving with DEBUG on.
+    """
+    profile = profile or os.getenv('APP_ENV', 'production')
+    try:
+        config_class = PROFILES[profile]
+    except KeyError:
+        raise ConfigError(f"Unknown APP_ENV profile '{profile}', expected one of {', '.join(PROFILES)}") from None
+    return config_class.load()
+
+
+__all__ = ["Config", "ConfigError", "PROFILES", "load_config"]
@@ -1 +1,201 @@
 # Base configuration classes
+import ipaddress
+import json
+import os
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+
+from sqlalchemy.engine import make_url
+
+DEFAULT_SECRET_KEY = 'super-secret-key-change-me'
+
+
+class ConfigError(ValueError):
+    """Raised at startup when a setting is missing, malformed or unsafe for the profile."""
+
+
+class Config:
+    """
+    Every setting the application reads, with its type and default.
+
+    Any annotated attribute can be overridden by an environment variable of the
+    same name; values are coerced to the annotated type (dicts and lists are
+    given as JSON). `validate()` runs at startup, so a bad deployment fails
+    before it takes traffic.
+    """
+    PROFILE: str = 'default'
+    DEBUG: bool = False
+    TESTING: bool = False
+
+    SECRET_KEY: str = DEFAULT_SECRET_KEY
+    # Swagger UI on /docs
+    DOCS_ENABLED: bool = True
+    # Set up Flask-Migrate outside the `flask` CLI too (it is always set up for CLI commands)
+    MIGRATIONS_ENABLED: bool = False
+    SQLALCHEMY_DATABASE_URI: str = 'postgresql+psycopg2://postgres:piyush@db:5432/medical_db'
+    SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
+    SQLALCHEMY_ECHO: bool = False
+
+    # Connection pool (ignored for SQLite, which does not use a sized pool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_CONNECT_TIMEOUT: int = 10
+    # Server-side per-statement limit in ms (PostgreSQL); 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Compiled SQL cached per engine; hot repository statements must never be evicted
+    DB_QUERY_CACHE_SIZE: int = 1000
+    # psycopg 3 (postgresql+psycopg://) prepares a statement server-side after this many
+    # executions on a connection; empty disables it. psycopg2 has no prepared statements.
+    DB_PREPARE_THRESHOLD: Optional[int] = 5
+
+    # Read replicas (see app.db.session); read-only repository calls are spread over the healthy ones
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 5.0
+    READ_YOUR_WRITES_SECONDS: float = 10.0
+
+    # Tokens
+    JWT_ACCESS_TOKEN_MINUTES: int = 15
+    JWT_REFRESH_TOKEN_DAYS: int = 7
+    JWT_CACHE_SIZE: int = 10000
+    REVOCATION_SYNC_INTERVAL: float = 2.0
+
+    # Password hashing pool
+    PASSWORD_HASH_METHOD: str = 'scrypt'
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_QUEUE_DEPTH: int = 16
+    PASSWORD_HASH_TIMEOUT: float = 10.0
+
+    # Rate limiting and admission control (see app.security.rate_limit, app.admission)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORAGE: str = 'memory://'
+    RATE_LIMITS: Dict[str, Any] = {}
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted; 0 keys
+    # IP limits on the socket peer. Set it to the number of hops you run (ProxyFix x_for).
+    PROXY_FIX_X_FOR: int = 0
+    ADMISSION_CONTROL_ENABLED: bool = True
+    # Request threads per worker, shared with gunicorn.conf.py; the admission pools are sized from it
+    GUNICORN_THREADS: int = 4
+    ADMISSION_POOLS: Dict[str, Any] = {}
+
+    # Caches
+    # Part of every ETag; change it when a deploy changes response shapes
+    ETAG_SALT: str = ''
+    AVAILABILITY_CACHE_SIZE: int = 1024
+    AVAILABILITY_CACHE_TTL: float = 300.0
+    AVAILABILITY_CACHE_VERSION_CHECK_INTERVAL: float = 1.0
+
+    # Instrumentation
+    SLOW_REQUEST_THRESHOLD_MS: Optional[float] = None
+    SLOW_REQUEST_TOP_STATEMENTS: int = 3
+    # /metrics answers clients in these networks (after PROXY_FIX_X_FOR), and only with
+    # `Authorization: Bearer <METRICS_TOKEN>` when a token is set
+    METRICS_ALLOWED_NETWORKS: List[str] = ['127.0.0.1/32', '::1/128']
+    METRICS_TOKEN: Optional[str] = None
+
+    @classmethod
+    def load(cls, environ: Optional[Dict[str, str]] = None) -> "Config":
+        environ = os.environ if environ is None else environ
+        config = cls()
+        for name, annotation in get_type_hints(cls).items():
+            # DATABASE_URL is the conventional name for the connection string
+            raw = environ.get('DATABASE_URL') if name == 'SQLALCHEMY_DATABASE_URI' else None
+            raw = environ.get(name, raw)
+            if raw is not None:
+                setattr(config, name, _coerce(name, raw, annotation))
+        return config
+
+    @property
+    def SQLALCHEMY_ENGINE_OPTIONS(self) -> Dict[str, Any]:
+        return self.engine_options(self.SQLALCHEMY_DATABASE_URI)
+
+    @property
+    def SQLALCHEMY_BINDS(self) -> Dict[str, Any]:
+        return {
+            f'replica_{index}': {'url': url, **self.engine_options(url)}
+            for index, url in enumerate(self.DATABASE_REPLICA_URLS)
+        }
+
+    def engine_options(self, database_url: str) -> Dict[str, Any]:
+        url = make_url(database_url)
+        if url.get_backend_name() == 'sqlite':
+            return {'connect_args': {'timeout': self.DB_CONNECT_TIMEOUT}, 'query_cache_size': self.DB_QUERY_CACHE_SIZE}
+
+        options: Dict[str, Any] = {
+            'query_cache_size': self.DB_QUERY_CACHE_SIZE,
+            'pool_size': self.DB_POOL_SIZE,
+            'max_overflow': self.DB_MAX_OVERFLOW,
+            'pool_timeout': self.DB_POOL_TIMEOUT,
+            'pool_recycle': self.DB_POOL_RECYCLE,
+            'pool_pre_ping': self.DB_POOL_PRE_PING,
+        }
+        if url.get_backend_name() == 'postgresql':
+            connect_args: Dict[str, Any] = {'connect_timeout': self.DB_CONNECT_TIMEOUT}
+            if self.DB_STATEMENT_TIMEOUT_MS:
+                connect_args['options'] = f'-c statement_timeout={self.DB_STATEMENT_TIMEOUT_MS}'
+            if url.get_driver_name() == 'psycopg':
+                connect_args['prepare_threshold'] = self.DB_PREPARE_THRESHOLD
+            options['connect_args'] = connect_args
+        return options
+
+    def validate(self) -> List[str]:
+        """Raise ConfigError on invalid settings; returns warnings worth logging."""
+        errors = []
+        for name, url in [('SQLALCHEMY_DATABASE_URI', self.SQLALCHEMY_DATABASE_URI)] + [
+            ('DATABASE_REPLICA_URLS', url) for url in self.DATABASE_REPLICA_URLS
+        ]:
+            try:
+                make_url(url)
+            except Exception:
+                errors.append(f"{name} contains an invalid database URL")
+        for name in ('DB_POOL_SIZE', 'DB_CONNECT_TIMEOUT', 'JWT_ACCESS_TOKEN_MINUTES', 'JWT_REFRESH_TOKEN_DAYS',
+                     'GUNICORN_THREADS'):
+            if getattr(self, name) <= 0:
+                errors.append(f"{name} must be positive")
+        for name in ('DB_MAX_OVERFLOW', 'DB_POOL_TIMEOUT', 'DB_STATEMENT_TIMEOUT_MS', 'PASSWORD_HASH_WORKERS',
+                     'PASSWORD_HASH_QUEUE_DEPTH', 'JWT_CACHE_SIZE', 'AVAILABILITY_CACHE_SIZE', 'DB_QUERY_CACHE_SIZE',
+                     'DB_PREPARE_THRESHOLD', 'PROXY_FIX_X_FOR'):
+            if (getattr(self, name) or 0) < 0:
+                errors.append(f"{name} must not be negative")
+        for network in self.METRICS_ALLOWED_NETWORKS:
+            try:
+                ipaddress.ip_network(network, strict=False)
+            except ValueError:
+                errors.append(f"METRICS_ALLOWED_NETWORKS contains an invalid network '{network}'")
+        if self.JWT_REFRESH_TOKEN_DAYS * 24 * 60 <= self.JWT_ACCESS_TOKEN_MINUTES:
+            errors.append("JWT_REFRESH_TOKEN_DAYS must outlive JWT_ACCESS_TOKEN_MINUTES")
+        if errors:
+            raise ConfigError(f"Invalid {self.PROFILE} configuration: " + "; ".join(errors))
+
+        warnings = []
+        if self.SECRET_KEY == DEFAULT_SECRET_KEY:
+            warnings.append("SECRET_KEY is the built-in default; set a real secret")
+        return warnings
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in dir(self) if name.isupper()}
+
+
+def _coerce(name: str, raw: str, annotation) -> Any:
+    target = get_origin(annotation) or annotation
+    if target is Union:
+        # Optional[X]: an empty variable means None
+        if raw == '':
+            return None
+        target = next(arg for arg in get_args(annotation) if arg is not type(None))
+    try:
+        if target is bool:
+            lowered = raw.strip().lower()
+            if lowered not in ('1', 'true', 'yes', 'on', '0', 'false', 'no', 'off'):
+                raise ValueError(raw)
+            return lowered in ('1', 'true', 'yes', 'on')
+        if target in (dict, list):
+            value = json.loads(raw)
+            if not isinstance(value, target):
+                raise ValueError(raw)
+            return value
+        return target(raw)
+    except (TypeError, ValueError):
+        raise ConfigError(f"{name}={raw!r} is not a valid {getattr(target, '__name__', target)}") from None
@@ -1 +1,20 @@
 # Dev-specific config
+from app.config.default import Config
+
+
+class DevelopmentConfig(Config):
+    PROFILE = 'development'
+    DEBUG = True
+    # A single developer does not need a hashing pool, and inline hashing keeps tracebacks readable
+    PASSWORD_HASH_WORKERS = 0
+
+
+class TestingConfig(Config):
+    PROFILE = 'testing'
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    PASSWORD_HASH_WORKERS = 0
+    # Cheap hashes keep test suites fast; never use these parameters elsewhere
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    RATE_LIMIT_ENABLED = False
+    ADMISSION_CONTROL_ENABLED = False
@@ -1 +1,39 @@
 # Prod-specific config
+from typing import List
+
+from app.config.default import Config, ConfigError, DEFAULT_SECRET_KEY
+
+
+class ProductionConfig(Config):
+    """
+    Pool settings sized for threaded workers behind admission control: a request
+    waits at most a few seconds for a connection and a runaway statement is
+    cancelled by the server instead of pinning a connection indefinitely.
+    """
+    PROFILE = 'production'
+    DOCS_ENABLED = False
+
+    DB_POOL_SIZE = 10
+    DB_MAX_OVERFLOW = 5
+    DB_POOL_TIMEOUT = 5.0
+    DB_POOL_RECYCLE = 900
+    DB_POOL_PRE_PING = True
+    DB_CONNECT_TIMEOUT = 5
+    DB_STATEMENT_TIMEOUT_MS = 15000
+
+    def validate(self) -> List[str]:
+        warnings = super().validate()
+        errors = []
+        if self.SECRET_KEY == DEFAULT_SECRET_KEY or len(self.SECRET_KEY) < 32:
+            errors.append("SECRET_KEY must be set to a random value of at least 32 characters")
+        if self.DEBUG:
+            errors.append("DEBUG must be off")
+        if self.DB_POOL_TIMEOUT > 10:
+            errors.append("DB_POOL_TIMEOUT above 10 s lets requests queue on the pool until clients time out")
+        if not self.DB_STATEMENT_TIMEOUT_MS:
+            errors.append("DB_STATEMENT_TIMEOUT_MS must be set")
+        if self.SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+            errors.append("SQLite is not supported in production")
+        if errors:
+            raise ConfigError("Invalid production configuration: " + "; ".join(errors))
+        return [w for w in warnings if not w.startswith('SECRET_KEY')]
@@ -1,13 +1,19 @@
 from flask import Blueprint, request, jsonify
-from app.services.admin_service import AdminService
 from app.schemas.department_schema import DepartmentSchema
 from app.schemas.doctor_schema import DoctorOnboardSchema, DoctorAssignmentSchema
 from app.security.decorators import token_required, roles_required
+from app.controllers.caching import versioned_etag
+from app.serialization import compile_schema
+from app.services.admin_service import AdminService, DEPARTMENTS_VERSION
 from marshmallow import ValidationError
 import logging
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 admin_service = AdminService()
+department_schema = DepartmentSchema()
+departments_schema = compile_schema(DepartmentSchema(many=True))
+doctor_onboard_schema = DoctorOnboardSchema()
+doctor_assignment_schema = DoctorAssignmentSchema()
 logger = logging.getLogger(__name__)
 
 @admin_bp.route('/departments', methods=['POST'])
@@ -19,21 +25,22 @@ def create_department():
         return jsonify({'message': 'No input data provided'}), 400
 
     try:
-        data = DepartmentSchema().load(json_data)
+        data = department_schema.load(json_data)
     except ValidationError as err:
         return jsonify(err.messages), 422
 
     success, message, dept = admin_service.create_department(data)
     if success:
-        return jsonify({'message': message, 'department': DepartmentSchema().dump(dept)}), 201
+        return jsonify({'message': message, 'department': department_schema.dump(dept)}), 201
     return jsonify({'message': message}), 409
 
 @admin_bp.route('/departments', methods=['GET'])
 @token_required
 @roles_required('admin')
+@versioned_etag(DEPARTMENTS_VERSION)
 def list_departments():
     departments = admin_service.list_departments()
-    return jsonify(DepartmentSchema(many=True).dump(departments)), 200
+    return jsonify(departments_schema.dump(departments)), 200
 
 @admin_bp.route('/doctors', methods=['POST'])
 @token_required
@@ -41,7 +48,7 @@ def list_departments():
 def onboard_doctor():
     json_data = request.json
     try:
-        data = DoctorOnboardSchema().load(json_data)
+        data = doctor_onboard_schema.load(json_data)
     except ValidationError as err:
         return jsonify(err.messages), 422
 
@@ -56,7 +63,7 @@ def onboard_doctor():
 def assign_doctor():
     json_data = request.json
     try:
-        data = DoctorAssignmentSchema().load(json_data)
+        data = doctor_assignment_schema.load(json_data)
     except ValidationError as err:
         return jsonify(err.messages), 422
 
@@ -1,22 +1,27 @@
-from flask import Blueprint, request, jsonify, g # Correction
+from flask import Blueprint, Response, current_app, request, jsonify, g, stream_with_context # Correction
 from marshmallow import ValidationError
 from sqlalchemy.exc import IntegrityError
 from app.services.appointment_service import AppointmentService
-from app.schemas.appointment_schema import AppointmentSchema
+from app.schemas.appointment_schema import AppointmentQuerySchema, AppointmentSchema, CursorField
 from app.security.decorators import token_required, roles_required
+from app.security.rate_limit import rate_limited
+from app.serialization import compile_schema
 from app.models.user import UserRole
 import logging
 
 appointment_bp = Blueprint('appointments', __name__, url_prefix='/api/appointments')
 appointment_service = AppointmentService()
 appointment_schema = AppointmentSchema()
-appointments_schema = AppointmentSchema(many=True)
+appointments_schema = compile_schema(AppointmentSchema(many=True))
+appointment_query_schema = AppointmentQuerySchema()
+cursor_field = CursorField()
 
 logger = logging.getLogger(__name__)
 
 @appointment_bp.route('', methods=['POST'])
 @token_required
 @roles_required(UserRole.MEMBER.value)
+@rate_limited('booking')
 def book_appointment():
     """
     Book an appointment.
@@ -52,9 +57,48 @@ def get_appointments():
     - Admins see all.
     - Doctors see theirs.
     - Members see theirs.
+
+    Optional filters: status, from, to, doctor_id, patient_id.
+    - ?limit=&cursor= returns one keyset page: {"items": [...], "next_cursor": ...}
+    - ?format=ndjson (or Accept: application/x-ndjson) streams one appointment per line.
+    - Without either, returns the full list as before.
     """
     user_id = g.user_id
     role = g.role
-    
-    appointments = appointment_service.get_appointments_for_user(user_id, role)
+
+    try:
+        query = appointment_query_schema.load(request.args)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    limit = query.pop('limit', None)
+    cursor = query.pop('cursor', None)
+    output = query.pop('format', None)
+    if output is None and request.accept_mimetypes.best == 'application/x-ndjson':
+        output = 'ndjson'
+
+    if output == 'ndjson':
+        rows = appointment_service.stream_appointments(user_id, role, query)
+        dumps = current_app.json.dumps
+
+        def generate():
+            for appointment in rows:
+                # Compact separators take the provider's orjson path
+                yield dumps(appointments_schema.dump(appointment, many=False), separators=(",", ":")) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    if limit is not None or cursor is not None:
+        limit = limit or 50
+        page, has_more = appointment_service.list_appointments(user_id, role, query, limit, cursor)
+        next_cursor = None
+        if has_more:
+            last = page[-1]
+            next_cursor = cursor_field.serialize('cursor', {'cursor': (last.date, last.start_time, last.id)})
+        return jsonify({'items': appointments_schema.dump(page), 'next_cursor': next_cursor}), 200
+
+    if query:
+        appointments = list(appointment_service.stream_appointments(user_id, role, query))
+    else:
+        appointments = appointment_service.get_appointments_for_user(user_id, role)
     return jsonify(appointments_schema.dump(appointments)), 200
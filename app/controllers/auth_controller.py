@@ -1,21 +1,27 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from app.services.auth_service import AuthService
-from app.schemas.auth_schema import LoginSchema, RegisterSchema
+from app.schemas.auth_schema import LoginSchema, RefreshSchema, RegisterSchema
+from app.security.decorators import token_required
+from app.security.rate_limit import rate_limited
 from marshmallow import ValidationError
 import logging
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 auth_service = AuthService()
+register_schema = RegisterSchema()
+login_schema = LoginSchema()
+refresh_schema = RefreshSchema()
 logger = logging.getLogger(__name__)
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limited('register')
 def register():
     json_data = request.json
     if not json_data:
         return jsonify({'message': 'No input data provided'}), 400
     
     try:
-        data = RegisterSchema().load(json_data)
+        data = register_schema.load(json_data)
     except ValidationError as err:
         return jsonify(err.messages), 422
 
@@ -25,17 +31,41 @@ def register():
     return jsonify({'message': message}), 409
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited('login')
 def login():
     json_data = request.json
     if not json_data:
         return jsonify({'message': 'No input data provided'}), 400
 
     try:
-        data = LoginSchema().load(json_data)
+        data = login_schema.load(json_data)
     except ValidationError as err:
         return jsonify(err.messages), 422
 
-    success, message, token = auth_service.login_user(data)
+    success, message, tokens = auth_service.login_user(data)
     if success:
-        return jsonify({'message': message, 'token': token}), 200
+        return jsonify({'message': message, **tokens}), 200
     return jsonify({'message': message}), 401
+
+@auth_bp.route('/refresh', methods=['POST'])
+@rate_limited('refresh')
+def refresh():
+    json_data = request.json
+    if not json_data:
+        return jsonify({'message': 'No input data provided'}), 400
+
+    try:
+        data = refresh_schema.load(json_data)
+    except ValidationError as err:
+        return jsonify(err.messages), 422
+
+    success, message, tokens = auth_service.refresh_tokens(data['refresh_token'])
+    if success:
+        return jsonify({'message': message, **tokens}), 200
+    return jsonify({'message': message}), 401
+
+@auth_bp.route('/logout', methods=['POST'])
+@token_required
+def logout():
+    auth_service.logout(g.token_claims)
+    return jsonify({'message': 'Logged out'}), 200
@@ -1,15 +1,27 @@
+from datetime import date, timedelta
 from flask import Blueprint, request, jsonify, g
 from marshmallow import ValidationError
 from app.services.availability_service import AvailabilityService
-from app.schemas.availability_schema import DoctorAvailabilitySchema
+from app.schemas.availability_schema import (
+    DoctorAvailabilitySchema,
+    EarliestSlotQuerySchema,
+    SlotQuerySchema,
+    SlotSchema,
+)
 from app.security.decorators import token_required, roles_required
+from app.controllers.caching import versioned_etag
+from app.serialization import compile_schema
+from app.services.availability_cache import AVAILABILITY_VERSION
 from app.models.user import UserRole
 import logging
 
 availability_bp = Blueprint('availability', __name__, url_prefix='/api/availability')
 availability_service = AvailabilityService()
 availability_schema = DoctorAvailabilitySchema()
-availabilities_schema = DoctorAvailabilitySchema(many=True)
+availabilities_schema = compile_schema(DoctorAvailabilitySchema(many=True))
+slot_query_schema = SlotQuerySchema()
+earliest_query_schema = EarliestSlotQuerySchema()
+slots_schema = compile_schema(SlotSchema(many=True))
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +49,7 @@ def create_or_update_availability():
 
 @availability_bp.route('/<int:doctor_id>', methods=['GET'])
 @token_required
+@versioned_etag(AVAILABILITY_VERSION, cache_control='private, max-age=30')
 def get_availability(doctor_id):
     """
     Get availability for a specific doctor.
@@ -48,6 +61,7 @@ def get_availability(doctor_id):
 @availability_bp.route('/me', methods=['GET'])
 @token_required
 @roles_required(UserRole.DOCTOR.value)
+@versioned_etag(AVAILABILITY_VERSION)
 def get_my_availability():
     """
     Get current logged-in doctor's availability.
@@ -55,3 +69,41 @@ def get_my_availability():
     doctor_id = g.user_id
     availabilities = availability_service.get_doctor_availability(doctor_id)
     return jsonify(availabilities_schema.dump(availabilities)), 200
+
+@availability_bp.route('/<int:doctor_id>/slots', methods=['GET'])
+@token_required
+def get_free_slots(doctor_id):
+    """
+    Get free bookable slots for a doctor between ?from= and ?to= (inclusive, YYYY-MM-DD).
+    Defaults to the next 7 days starting today.
+    """
+    try:
+        query = slot_query_schema.load(request.args)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    start_date = query.get('start_date') or date.today()
+    end_date = query.get('end_date') or start_date + timedelta(days=6)
+
+    try:
+        slots = availability_service.find_free_slots(doctor_id, start_date, end_date)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify(slots_schema.dump(slots)), 200
+
+@availability_bp.route('/departments/<int:department_id>/earliest', methods=['GET'])
+@token_required
+def get_earliest_department_slots(department_id):
+    """
+    Get the earliest free slots across all doctors of a department.
+    Optional ?from= (YYYY-MM-DD, defaults to today) and ?limit= (1-100, defaults to 10).
+    """
+    try:
+        query = earliest_query_schema.load(request.args)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+
+    start_date = query.get('start_date') or date.today()
+    slots = availability_service.find_earliest_in_department(department_id, start_date, query['limit'])
+    return jsonify(slots_schema.dump(slots)), 200
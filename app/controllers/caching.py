@@ -0,0 +1,46 @@
+import hashlib
+from functools import wraps
+
+from flask import current_app, g, make_response, request
+
+from app.db.session import read_only
+from app.repositories.data_version_repository import DataVersionRepository
+
+# Versions are read like the data they describe, so a replica serving the
+# list also serves the counter and the tag never runs ahead of the body.
+_read_version = read_only(DataVersionRepository.get)
+
+
+def versioned_etag(*version_names: str, cache_control: str = 'private, no-cache'):
+    """
+    Strong ETag and conditional GET for views whose output only changes when
+    one of the named DataVersion counters is bumped.
+
+    The tag is built from the counters before the view runs. A matching
+    If-None-Match is answered with 304 after a single primary-key lookup,
+    without running the view's query or serializing anything. Writers bump the
+    counter in the same transaction as their change and the counter is read
+    first, so a body is never older than its tag. The path and the caller are
+    part of the tag, so one browser shared by two users never revalidates the
+    other's copy. ETAG_SALT is too; change it when a deploy changes response shapes.
+
+    Apply below the auth decorators so 304s are only given to callers allowed to see the data.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            versions = '.'.join(str(_read_version(name)) for name in version_names)
+            scope = f"{current_app.config.get('ETAG_SALT', '')}|{request.path}|{getattr(g, 'user_id', '')}"
+            etag = f"{versions}-{hashlib.blake2s(scope.encode(), digest_size=8).hexdigest()}"
+
+            if etag in request.if_none_match:
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,37 @@
+import hmac
+import ipaddress
+from functools import lru_cache
+from typing import Tuple
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.metrics import registry
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@lru_cache(maxsize=8)
+def _networks(specs: Tuple[str, ...]):
+    return tuple(ipaddress.ip_network(spec, strict=False) for spec in specs)
+
+
+def _allowed() -> bool:
+    """METRICS_ALLOWED_NETWORKS must contain the client, and METRICS_TOKEN (if set) must be presented."""
+    try:
+        client = ipaddress.ip_address(request.remote_addr or '')
+    except ValueError:
+        return False
+    if not any(client in network for network in _networks(tuple(current_app.config['METRICS_ALLOWED_NETWORKS']))):
+        return False
+    token = current_app.config['METRICS_TOKEN']
+    if token:
+        scheme, _, presented = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(presented.encode(), token.encode())
+    return True
+
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (per worker process), restricted by METRICS_ALLOWED_NETWORKS and METRICS_TOKEN."""
+    if not _allowed():
+        return jsonify({"message": "Forbidden"}), 403
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
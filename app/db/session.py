@@ -1 +1,179 @@
 # SQLAlchemy scoped_session setup
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from functools import wraps
+from itertools import count
+from typing import Dict, List, Optional
+
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+logger = logging.getLogger(__name__)
+
+# Bind keys of read replicas are REPLICA_BIND_PREFIX + index (see Config.SQLALCHEMY_BINDS)
+REPLICA_BIND_PREFIX = 'replica_'
+
+_prefer_replica: ContextVar[bool] = ContextVar('prefer_replica', default=False)
+
+_LAG_QUERIES = {
+    # Caught up when everything received has been replayed; otherwise age of the last replayed commit
+    'postgresql': text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() "
+        "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+_PING = text("SELECT 0")
+
+
+def read_only(f):
+    """
+    Mark a repository call as safe to serve from a read replica.
+    The session still uses the primary while the current transaction has written,
+    for users inside their read-your-writes window, and when no replica is healthy.
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        token = _prefer_replica.set(True)
+        try:
+            result = f(*args, **kwargs)
+        finally:
+            _prefer_replica.reset(token)
+        return result
+    return wrapper
+
+
+class ReplicaState:
+    __slots__ = ('bind_key', 'healthy', 'lag', 'checked_at')
+
+    def __init__(self, bind_key: str):
+        self.bind_key = bind_key
+        self.healthy = True
+        self.lag = 0.0
+        self.checked_at = float('-inf')
+
+
+class ReplicaRouter:
+    """
+    Picks a healthy replica for read-only calls and tracks read-your-writes windows.
+
+    Health is checked lazily: at most once every `check_interval` seconds one
+    request measures each replica's replication lag (without blocking the
+    others). A replica that fails the check or lags more than `max_lag` seconds
+    is skipped until a later check passes. After a user commits a write, their
+    reads go to the primary for `sticky_seconds`. That window is tracked per
+    process, so `max_lag` is what bounds staleness when the next request lands
+    on another worker.
+    """
+
+    def __init__(self, max_lag: float = 5.0, check_interval: float = 5.0, sticky_seconds: float = 10.0):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        self.replicas: List[ReplicaState] = []
+        self._next = count()
+        self._next_check = 0.0
+        self._check_lock = threading.Lock()
+        self._sticky: Dict[str, float] = {}
+
+    def init_app(self, app) -> None:
+        self.max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', self.max_lag)
+        self.check_interval = app.config.get('REPLICA_HEALTH_CHECK_INTERVAL', self.check_interval)
+        self.sticky_seconds = app.config.get('READ_YOUR_WRITES_SECONDS', self.sticky_seconds)
+        binds = app.config.get('SQLALCHEMY_BINDS') or {}
+        self.replicas = [ReplicaState(key) for key in sorted(binds) if key.startswith(REPLICA_BIND_PREFIX)]
+        self._next_check = 0.0
+        self._sticky = {}
+
+    def pick(self, engines) -> Optional[object]:
+        """Round-robin over healthy replicas; None sends the read to the primary."""
+        if not self.replicas:
+            return None
+        if time.monotonic() >= self._next_check:
+            self._check(engines)
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return engines[healthy[next(self._next) % len(healthy)].bind_key]
+
+    def mark_sticky(self, user_id) -> None:
+        now = time.monotonic()
+        if len(self._sticky) > 10000:
+            self._sticky = {user: until for user, until in self._sticky.items() if until > now}
+        self._sticky[str(user_id)] = now + self.sticky_seconds
+
+    def is_sticky(self, user_id) -> bool:
+        until = self._sticky.get(str(user_id))
+        return until is not None and until > time.monotonic()
+
+    def _check(self, engines) -> None:
+        if not self._check_lock.acquire(blocking=False):
+            return
+        try:
+            for replica in self.replicas:
+                engine = engines[replica.bind_key]
+                try:
+                    with engine.connect() as connection:
+                        query = _LAG_QUERIES.get(engine.dialect.name, _PING)
+                        replica.lag = float(connection.execute(query).scalar() or 0)
+                    healthy = replica.lag <= self.max_lag
+                except Exception as e:
+                    logger.warning(f"Read replica '{replica.bind_key}' failed its health check: {str(e)}")
+                    healthy = False
+                if healthy != replica.healthy:
+                    logger.warning(
+                        f"Read replica '{replica.bind_key}' is now {'healthy' if healthy else 'skipped'} "
+                        f"(lag {replica.lag:.1f}s)"
+                    )
+                replica.healthy = healthy
+                replica.checked_at = time.monotonic()
+        finally:
+            self._next_check = time.monotonic() + self.check_interval
+            self._check_lock.release()
+
+
+replica_router = ReplicaRouter()
+
+
+def _current_user_id() -> Optional[str]:
+    return getattr(g, 'user_id', None) if has_request_context() else None
+
+
+class RoutingSession(Session):
+    """
+    db.session class sending `read_only` repository calls to a read replica and
+    everything else (flushes, DML, transactions that have written) to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            # is_dml also covers ORM statements wrapping DML, e.g. INSERT ... RETURNING entities
+            writing = self._flushing or getattr(clause, 'is_dml', False)
+            if writing:
+                self.info['wrote'] = True
+            elif _prefer_replica.get() and not self.info.get('wrote'):
+                user_id = _current_user_id()
+                if user_id is None or not replica_router.is_sticky(user_id):
+                    # Keep one replica per session so reads within a request are monotonic
+                    engine = self.info.get('replica')
+                    if engine is None:
+                        engine = self.info['replica'] = replica_router.pick(self._db.engines)
+                    if engine is not None:
+                        return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    if session.info.pop('wrote', False):
+        user_id = _current_user_id()
+        if user_id is not None:
+            replica_router.mark_sticky(user_id)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('wrote', None)
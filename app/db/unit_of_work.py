@@ -0,0 +1,49 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
+from app.models.base import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+
+
+@contextmanager
+def unit_of_work() -> Iterator[Session]:
+    """
+    Run repository writes in one transaction.
+
+    Inside the block repository methods flush instead of committing, so
+    generated keys are still available. The outermost block commits once on
+    success and rolls everything back on an exception. Nested blocks join the
+    enclosing transaction.
+
+        with unit_of_work():
+            version_repository.bump(DEPARTMENTS_VERSION)
+            department_repository.create(name=name)
+    """
+    session = db.session()
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+    except BaseException:
+        if depth == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+
+
+def in_unit_of_work() -> bool:
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def commit() -> None:
+    """What repositories call after a write: commit, or only flush inside a unit of work."""
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
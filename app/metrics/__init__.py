@@ -0,0 +1,3 @@
+from app.metrics.registry import registry
+
+__all__ = ["registry"]
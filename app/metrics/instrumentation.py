@@ -0,0 +1,166 @@
+import logging
+import time
+import weakref
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from flask import Flask, request
+from sqlalchemy import event
+
+from app.metrics.registry import Counter, Gauge, registry
+from app.models.base import db
+
+logger = logging.getLogger(__name__)
+
+REQUEST_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "Request latency by endpoint.", ("endpoint", "method")
+)
+REQUESTS = registry.counter(
+    "http_requests_total", "Completed requests by endpoint and status.", ("endpoint", "method", "status")
+)
+REQUEST_STATEMENTS = registry.histogram(
+    "http_request_db_statements", "SQL statements issued per request.", ("endpoint",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+REQUEST_DB_TIME = registry.counter(
+    "http_request_db_seconds_total", "Time spent executing SQL, by endpoint.", ("endpoint",)
+)
+REQUEST_POOL_WAIT = registry.counter(
+    "http_request_pool_wait_seconds_total", "Time spent waiting for a pooled connection, by endpoint.", ("endpoint",)
+)
+POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Connection pool checkout latency.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+class RequestStats:
+    __slots__ = ("started", "statements", "db_time", "pool_wait", "slow_log")
+
+    def __init__(self, keep_statements: bool):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        # (duration, statement) pairs, only collected when slow-request logging is on
+        self.slow_log: Optional[List[Tuple[float, str]]] = [] if keep_statements else None
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_instrumented_engines = weakref.WeakSet()
+
+
+def init_app(app: Flask) -> None:
+    """
+    Record per-endpoint latency, SQL statement count, DB time and pool checkout
+    wait for every request. SLOW_REQUEST_THRESHOLD_MS enables a warning log with
+    the slowest statements of requests above the threshold.
+    """
+    threshold_ms = app.config.get('SLOW_REQUEST_THRESHOLD_MS')
+    top_statements = app.config.get('SLOW_REQUEST_TOP_STATEMENTS', 3)
+    keep_statements = bool(threshold_ms)
+
+    @app.before_request
+    def start_request_stats():
+        _current.set(RequestStats(keep_statements))
+
+    @app.after_request
+    def record_request_stats(response):
+        stats = _current.get()
+        if stats is None:
+            return response
+        _current.set(None)
+        elapsed = time.perf_counter() - stats.started
+        endpoint = request.endpoint or "unmatched"
+
+        REQUEST_LATENCY.observe((endpoint, request.method), elapsed)
+        REQUESTS.inc((endpoint, request.method, str(response.status_code)))
+        REQUEST_STATEMENTS.observe((endpoint,), stats.statements)
+        if stats.db_time:
+            REQUEST_DB_TIME.inc((endpoint,), stats.db_time)
+        if stats.pool_wait:
+            REQUEST_POOL_WAIT.inc((endpoint,), stats.pool_wait)
+
+        if keep_statements and elapsed * 1000 >= threshold_ms:
+            slowest = sorted(stats.slow_log, reverse=True)[:top_statements]
+            logger.warning(
+                "Slow request %s %s: %.1f ms, %d statements, %.1f ms in DB, %.1f ms pool wait. Top statements:\n%s",
+                request.method, request.path, elapsed * 1000, stats.statements,
+                stats.db_time * 1000, stats.pool_wait * 1000,
+                "\n".join(f"  {duration * 1000:.1f} ms: {statement}" for duration, statement in slowest),
+            )
+        return response
+
+    with app.app_context():
+        for engine in db.engines.values():
+            instrument_engine(engine)
+
+    from app.services.availability_cache import availability_cache
+    registry.register_collector("availability_cache", lambda: _cache_metrics(availability_cache.stats()))
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement timing and pool checkout timing to an engine (idempotent)."""
+    if engine in _instrumented_engines:
+        return
+    _instrumented_engines.add(engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        stats = _current.get()
+        if stats is None:
+            return
+        duration = time.perf_counter() - started
+        stats.statements += 1
+        stats.db_time += duration
+        if stats.slow_log is not None:
+            stats.slow_log.append((duration, statement))
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            started = context.connection.info.get("metrics_started")
+            if started:
+                started.pop()
+
+    @event.listens_for(engine, "engine_disposed")
+    def engine_disposed(disposed_engine):
+        # dispose() swaps in a fresh pool, which needs wrapping again
+        _instrument_pool(disposed_engine.pool)
+
+    _instrument_pool(engine.pool)
+
+
+def _instrument_pool(pool) -> None:
+    """
+    Time Pool.connect(), which is where a request blocks when the pool is exhausted.
+    The pool has no "checkout started" event, so the bound method is wrapped.
+    """
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            waited = time.perf_counter() - started
+            POOL_CHECKOUT_WAIT.observe((), waited)
+            stats = _current.get()
+            if stats is not None:
+                stats.pool_wait += waited
+
+    pool.connect = timed_connect
+
+
+def _cache_metrics(stats: dict) -> list:
+    events = Counter("availability_cache_events_total", "Availability template cache events.", ("event",))
+    for name in ("hits", "misses", "evictions", "invalidations"):
+        events.inc((name,), stats[name])
+    size = Gauge("availability_cache_entries", "Doctors currently held in the availability cache.")
+    size.set((), stats["size"])
+    return [events, size]
@@ -0,0 +1,148 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, labels: LabelValues = (), value: float = 0) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._values.items()]
+        lines = self.header()
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="%s"' % _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Minimal thread-safe metric store rendered in the Prometheus text format.
+    Values are per process; each worker is scraped on its own.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[_Metric]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def register_collector(self, key: str, collect: Callable[[], Iterable[_Metric]]) -> None:
+        """Register a callback producing metrics at scrape time; re-registering a key replaces it."""
+        with self._lock:
+            self._collectors[key] = collect
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collect in collectors:
+            for metric in collect():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -3,6 +3,8 @@ from app.models.user import User, UserRole
 from app.models.department import Department
 from app.models.doctor import DoctorDepartment, DoctorAvailability
 from app.models.appointment import Appointment, AppointmentStatus
+from app.models.data_version import DataVersion
+from app.models.token import RevokedToken
 
 __all__ = [
     "User",
@@ -12,4 +14,6 @@ __all__ = [
     "DoctorAvailability",
     "Appointment",
     "AppointmentStatus",
+    "DataVersion",
+    "RevokedToken",
 ]
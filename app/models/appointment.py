@@ -1,6 +1,7 @@
 from enum import Enum as PyEnum
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Integer, ForeignKey, Date, Time, Enum, UniqueConstraint
+from sqlalchemy import DDL, String, Integer, ForeignKey, Date, Time, Enum, Index, event, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import db, TimestampMixin
 
@@ -35,23 +36,63 @@ class Appointment(TimestampMixin, db.Model):
     doctor: Mapped["User"] = relationship("User", foreign_keys=[doctor_id], back_populates="appointments_as_doctor")
 
     # Constraint: A doctor cannot be double-booked at the exact same start time on the same date.
+    # Partial so that a cancelled appointment does not block rebooking its slot.
     __table_args__ = (
-        UniqueConstraint('doctor_id', 'date', 'start_time', name='uniq_doctor_date_start'),
+        Index(
+            'uniq_doctor_date_start', 'doctor_id', 'date', 'start_time',
+            unique=True,
+            postgresql_where=text("status <> 'CANCELLED'"),
+            sqlite_where=text("status <> 'CANCELLED'"),
+        ),
+        # Listings: per patient / per doctor (cancelled rows included, so the
+        # partial index above cannot serve them), by status, and date ranges in
+        # keyset order (date, start_time, id).
+        Index('ix_appointments_patient_date', 'patient_id', 'date', 'start_time'),
+        Index('ix_appointments_doctor_date', 'doctor_id', 'date', 'start_time'),
+        Index('ix_appointments_status_date', 'status', 'date', 'start_time', 'id'),
+        Index('ix_appointments_date_start', 'date', 'start_time', 'id'),
+        # PostgreSQL also rejects any two active appointments of a doctor whose
+        # [start, end) ranges overlap, e.g. after slot_duration_minutes changes.
+        ExcludeConstraint(
+            ('doctor_id', '='),
+            # 00:00 as end_time is midnight at the end of the day
+            (text("tsrange(date + start_time, date + end_time"
+                  " + CASE WHEN end_time < start_time THEN interval '1 day' ELSE interval '0' END)"), '&&'),
+            name='excl_doctor_overlap',
+            using='gist',
+            where=text("status <> 'CANCELLED'"),
+        ).ddl_if(dialect='postgresql'),
     )
 
     def __repr__(self):
         return f"<Appointment {self.id} {self.date} {self.start_time}>"
 
+    @property
+    def patient_name(self) -> str:
+        return self.patient.name if self.patient else "Unknown"
+
+    @property
+    def doctor_name(self) -> str:
+        return self.doctor.name if self.doctor else "Unknown"
+
     def to_dict(self):
         return {
             "id": self.id,
             "patient_id": self.patient_id,
-            "patient_name": self.patient.name if self.patient else "Unknown",
+            "patient_name": self.patient_name,
             "doctor_id": self.doctor_id,
-            "doctor_name": self.doctor.name if self.doctor else "Unknown",
+            "doctor_name": self.doctor_name,
             "date": self.date.isoformat(),
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat(),
             "status": self.status.value,
             "reason": self.reason
         }
+
+
+# btree_gist provides the "=" operator class on integers needed by excl_doctor_overlap.
+event.listen(
+    Appointment.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
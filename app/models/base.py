@@ -3,6 +3,7 @@ from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy import DateTime
+from app.db.session import RoutingSession
 
 
 class Base(DeclarativeBase):
@@ -10,7 +11,7 @@ class Base(DeclarativeBase):
 
 
 # SQLAlchemy instance
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={'class_': RoutingSession})
 
 
 class TimestampMixin:
@@ -0,0 +1,18 @@
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import db
+
+
+class DataVersion(db.Model):
+    """
+    Monotonic version counter per data set (usually a table name).
+    Writers bump it in the same transaction as their change so every worker
+    can cheaply detect that its in-process copies are stale.
+    """
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DataVersion {self.name}={self.version}>"
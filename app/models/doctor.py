@@ -1,6 +1,6 @@
 
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Boolean, Integer, ForeignKey
+from sqlalchemy import String, Boolean, Integer, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import db, TimestampMixin
 
@@ -19,6 +19,11 @@ class DoctorDepartment(TimestampMixin, db.Model):
     doctor: Mapped["User"] = relationship("User")
     department: Mapped["Department"] = relationship("Department", back_populates="doctor_assignments")
 
+    __table_args__ = (
+        Index('ix_doctor_departments_department_doctor', 'department_id', 'doctor_id'),
+        Index('ix_doctor_departments_doctor', 'doctor_id'),
+    )
+
 
 class DoctorAvailability(TimestampMixin, db.Model):
     """Doctor's available time slots."""
@@ -34,6 +39,10 @@ class DoctorAvailability(TimestampMixin, db.Model):
 
     doctor: Mapped["User"] = relationship("User", back_populates="availabilities")
 
+    __table_args__ = (
+        Index('ix_doctor_availabilities_doctor_day', 'doctor_id', 'day_of_week'),
+    )
+
     def __repr__(self) -> str:
         return f"<Availability Doctor:{self.doctor_id} Day:{self.day_of_week}>"
 
@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import db
+
+
+class RevokedToken(db.Model):
+    """
+    Denylist entry for a token id (`jti`) or a whole login session (`fam`).
+    Rows can be deleted once `expires_at` has passed, since the tokens they
+    cover are rejected as expired anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    jti: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<RevokedToken {self.jti}>"
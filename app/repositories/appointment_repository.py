@@ -1,42 +1,231 @@
-from typing import List, Optional
-from datetime import date, time
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+from datetime import date, time, datetime
+from sqlalchemy.orm import aliased
 from app.models.base import db
 from app.models.appointment import Appointment, AppointmentStatus
+from app.models.user import User
+from app.db.session import read_only
+from app.db.unit_of_work import commit, in_unit_of_work
+from app.repositories.base_repository import insert_for_dialect
+from app.repositories.read_models import AppointmentRecord, iter_records, to_records
 
 class AppointmentRepository:
     @staticmethod
     def create(appointment: Appointment) -> Appointment:
         db.session.add(appointment)
-        db.session.commit()
+        commit()
         return appointment
 
     @staticmethod
-    def find_conflicting_appointment(doctor_id: int, appt_date: date, start_time: time) -> Optional[Appointment]:
+    def create_if_free(appointment: Appointment) -> Optional[Appointment]:
+        """
+        Insert the appointment in a single statement unless the slot is taken.
+
+        The INSERT ... SELECT only produces a row when no active appointment
+        overlaps the new interval, and ON CONFLICT DO NOTHING absorbs a concurrent
+        insert that wins the race against the partial unique index (and, on
+        PostgreSQL, the overlap exclusion constraint). Returns the persisted
+        appointment, or None when the slot was already booked.
+        """
+        now = datetime.utcnow()
+        values = {
+            'patient_id': appointment.patient_id,
+            'doctor_id': appointment.doctor_id,
+            'date': appointment.date,
+            'start_time': appointment.start_time,
+            'end_time': appointment.end_time,
+            'status': appointment.status or AppointmentStatus.SCHEDULED,
+            'reason': appointment.reason,
+            'created_at': now,
+            'updated_at': now,
+        }
+        stmt = _insert_if_free(insert_for_dialect(), appointment.end_time is None)
+        created = db.session.execute(stmt, values).scalars().first()
+        if created is None:
+            # Nothing was written; only end a transaction this call owns
+            if not in_unit_of_work():
+                db.session.rollback()
+            return None
+        commit()
+        return created
+
+    @staticmethod
+    def find_conflicting_appointment(
+        doctor_id: int, appt_date: date, start_time: time, end_time: Optional[time] = None
+    ) -> Optional[Appointment]:
         """
         Check if there is already an active (not cancelled) appointment 
-        for the doctor at the same date and start time.
+        for the doctor on that date overlapping [start_time, end_time).
+        Without end_time, checks whether start_time falls inside an appointment.
         """
-        return db.session.execute(
-            db.select(Appointment).filter(
-                Appointment.doctor_id == doctor_id,
-                Appointment.date == appt_date,
-                Appointment.start_time == start_time,
-                Appointment.status != AppointmentStatus.CANCELLED
-            )
-        ).scalars().first()
+        stmt = _CONFLICTING_AT if end_time is None else _CONFLICTING
+        return db.session.execute(stmt, {
+            'doctor_id': doctor_id, 'date': appt_date, 'start_time': start_time, 'end_time': end_time,
+        }).scalars().first()
 
     @staticmethod
-    def find_by_patient(patient_id: int) -> List[Appointment]:
-        return db.session.execute(
-            db.select(Appointment).filter_by(patient_id=patient_id)
-        ).scalars().all()
+    @read_only
+    def find_by_patient(patient_id: int) -> List[AppointmentRecord]:
+        return to_records(AppointmentRecord, db.session.execute(_filtered(patient_id=patient_id)))
 
     @staticmethod
-    def find_by_doctor(doctor_id: int) -> List[Appointment]:
-        return db.session.execute(
-            db.select(Appointment).filter_by(doctor_id=doctor_id)
-        ).scalars().all()
+    @read_only
+    def find_by_doctor(doctor_id: int) -> List[AppointmentRecord]:
+        return to_records(AppointmentRecord, db.session.execute(_filtered(doctor_id=doctor_id)))
 
     @staticmethod
-    def find_all() -> List[Appointment]:
-        return db.session.execute(db.select(Appointment)).scalars().all()
+    @read_only
+    def find_all() -> List[AppointmentRecord]:
+        return to_records(AppointmentRecord, db.session.execute(_filtered()))
+
+    @staticmethod
+    @read_only
+    def find_page(
+        limit: int, after: Optional[Tuple[date, time, int]] = None, **filters
+    ) -> List[AppointmentRecord]:
+        """
+        Keyset pagination ordered by (date, start_time, id).
+        `after` is the sort key of the last row of the previous page.
+        """
+        stmt = _filtered(**filters).order_by(*_KEYSET_ORDER).limit(limit)
+        if after is not None:
+            stmt = stmt.where(db.tuple_(*_KEYSET_ORDER) > db.tuple_(*after))
+        return to_records(AppointmentRecord, db.session.execute(stmt))
+
+    @staticmethod
+    def iter_filtered(batch_size: int = 1000, **filters) -> Iterator[AppointmentRecord]:
+        """
+        Stream matching appointments in keyset order.
+        yield_per uses a server-side cursor where the driver supports it, so rows
+        are fetched and released batch by batch instead of all at once.
+        """
+        stmt = _filtered(**filters).order_by(*_KEYSET_ORDER).execution_options(yield_per=batch_size)
+        yield from iter_records(AppointmentRecord, db.session.execute(stmt))
+
+    @staticmethod
+    @read_only
+    def find_booked_intervals(doctor_ids: Iterable[int], start_date: date, end_date: date) -> List[Tuple[int, date, time, time]]:
+        """
+        Fetch (doctor_id, date, start_time, end_time) of every active appointment
+        for the given doctors between two dates (inclusive) in a single query.
+        """
+        return db.session.execute(
+            db.select(
+                Appointment.doctor_id,
+                Appointment.date,
+                Appointment.start_time,
+                Appointment.end_time
+            ).filter(
+                Appointment.doctor_id.in_(list(doctor_ids)),
+                Appointment.date >= start_date,
+                Appointment.date <= end_date,
+                Appointment.status != AppointmentStatus.CANCELLED
+            )
+        ).all()
+
+
+_KEYSET_ORDER = (Appointment.date, Appointment.start_time, Appointment.id)
+
+_BOOKING_COLUMNS = (
+    'patient_id', 'doctor_id', 'date', 'start_time', 'end_time', 'status', 'reason', 'created_at', 'updated_at',
+)
+
+_patient = aliased(User, name="patient")
+_doctor = aliased(User, name="doctor")
+
+# Listings read AppointmentRecord tuples, never ORM objects. The names come
+# from the same SELECT; outer joins and "Unknown" mirror the model properties.
+_RECORD_COLUMNS = (
+    Appointment.id,
+    Appointment.patient_id,
+    Appointment.doctor_id,
+    Appointment.date,
+    Appointment.start_time,
+    Appointment.end_time,
+    Appointment.status,
+    Appointment.reason,
+    db.func.coalesce(_patient.name, "Unknown").label("patient_name"),
+    db.func.coalesce(_doctor.name, "Unknown").label("doctor_name"),
+)
+
+
+def _filtered(
+    status: Optional[AppointmentStatus] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    doctor_id: Optional[int] = None,
+    patient_id: Optional[int] = None,
+):
+    """Select AppointmentRecord columns of appointments matching the optional list filters (dates inclusive)."""
+    stmt = (
+        db.select(*_RECORD_COLUMNS)
+        .outerjoin(_patient, _patient.id == Appointment.patient_id)
+        .outerjoin(_doctor, _doctor.id == Appointment.doctor_id)
+    )
+    if status is not None:
+        stmt = stmt.where(Appointment.status == status)
+    if start_date is not None:
+        stmt = stmt.where(Appointment.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(Appointment.date <= end_date)
+    if doctor_id is not None:
+        stmt = stmt.where(Appointment.doctor_id == doctor_id)
+    if patient_id is not None:
+        stmt = stmt.where(Appointment.patient_id == patient_id)
+    return stmt
+
+
+def _overlapping(doctor_id: int, appt_date: date, start_time: time, end_time: Optional[time]) -> tuple:
+    """
+    Filter for active appointments of a doctor whose interval overlaps [start_time, end_time).
+    An end_time of 00:00 is the end of the day (the last slot before midnight), on
+    either side, matching IntervalIndex and the PostgreSQL exclusion constraint.
+    """
+    if end_time is None:
+        starts_before = Appointment.start_time <= start_time
+    else:
+        starts_before = db.or_(Appointment.start_time < end_time, end_time == _MIDNIGHT)
+    return (
+        Appointment.doctor_id == doctor_id,
+        Appointment.date == appt_date,
+        starts_before,
+        db.or_(Appointment.end_time > start_time, Appointment.end_time == _MIDNIGHT),
+        Appointment.status != AppointmentStatus.CANCELLED,
+    )
+
+
+_MIDNIGHT = db.literal(time(0), Appointment.end_time.type)
+
+
+# Hot statements are built once with named bound parameters: a call only binds
+# values, so there is no per-call construction or cache-key work, and the
+# compiled form is always found in the engine's cache.
+_CONFLICTING = db.select(Appointment).where(*_overlapping(
+    db.bindparam('doctor_id'), db.bindparam('date'), db.bindparam('start_time'),
+    db.bindparam('end_time', type_=Appointment.end_time.type),
+))
+_CONFLICTING_AT = db.select(Appointment).where(*_overlapping(
+    db.bindparam('doctor_id'), db.bindparam('date'), db.bindparam('start_time'), None
+))
+
+
+@lru_cache(maxsize=None)
+def _insert_if_free(insert, open_ended: bool):
+    """
+    create_if_free's INSERT ... SELECT, built once per dialect with bound
+    parameters named after the columns. A booking only binds its values, so
+    the statement is neither rebuilt nor recompiled per request.
+    """
+    columns = Appointment.__table__.c
+    params = {name: db.bindparam(name, type_=columns[name].type) for name in _BOOKING_COLUMNS}
+    taken = db.select(Appointment.id).where(*_overlapping(
+        params['doctor_id'], params['date'], params['start_time'], None if open_ended else params['end_time']
+    ))
+    source = db.select(*params.values()).where(~taken.exists())
+
+    stmt = insert(Appointment).from_select(list(params), source)
+    if hasattr(stmt, 'on_conflict_do_nothing'):
+        stmt = stmt.on_conflict_do_nothing()
+    # Wrapped so the values bind this one statement instead of being taken as rows for an ORM bulk insert
+    return db.select(Appointment).from_statement(stmt.returning(Appointment))
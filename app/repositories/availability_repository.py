@@ -1,27 +1,63 @@
 from typing import List, Optional
 from app.models.base import db
-from app.models.doctor import DoctorAvailability
+from app.models.doctor import DoctorAvailability, DoctorDepartment
+from app.models.user import User
+from app.db.session import read_only
+from app.db.unit_of_work import commit
+from app.repositories.read_models import AvailabilityRecord, to_records
 
 class AvailabilityRepository:
     @staticmethod
     def create(availability: DoctorAvailability) -> DoctorAvailability:
         db.session.add(availability)
-        db.session.commit()
+        commit()
         return availability
 
     @staticmethod
     def find_by_doctor_id(doctor_id: int) -> List[DoctorAvailability]:
-        return db.session.execute(
-            db.select(DoctorAvailability).filter_by(doctor_id=doctor_id)
-        ).scalars().all()
+        return db.session.execute(_BY_DOCTOR, {'doctor_id': doctor_id}).scalars().all()
+
+    @staticmethod
+    @read_only
+    def find_records_by_doctor_id(doctor_id: int) -> List[AvailabilityRecord]:
+        """The doctor's availability rows as plain records, for listing."""
+        return to_records(AvailabilityRecord, db.session.execute(_RECORDS_BY_DOCTOR, {'doctor_id': doctor_id}))
 
     @staticmethod
     def find_by_doctor_and_day(doctor_id: int, day_of_week: int) -> Optional[DoctorAvailability]:
         return db.session.execute(
-            db.select(DoctorAvailability).filter_by(doctor_id=doctor_id, day_of_week=day_of_week)
+            _BY_DOCTOR_AND_DAY, {'doctor_id': doctor_id, 'day_of_week': day_of_week}
         ).scalars().first()
 
+    @staticmethod
+    @read_only
+    def find_by_department(department_id: int) -> List[DoctorAvailability]:
+        """Fetch the availability templates of every active doctor assigned to a department."""
+        return db.session.execute(
+            db.select(DoctorAvailability)
+            .join(DoctorDepartment, DoctorDepartment.doctor_id == DoctorAvailability.doctor_id)
+            .join(User, User.id == DoctorAvailability.doctor_id)
+            .filter(DoctorDepartment.department_id == department_id, User.is_active.is_(True))
+            .order_by(DoctorAvailability.doctor_id, DoctorAvailability.id)
+        ).scalars().all()
+
     @staticmethod
     def delete(availability: DoctorAvailability) -> None:
         db.session.delete(availability)
-        db.session.commit()
+        commit()
+
+
+_RECORD_COLUMNS = (
+    DoctorAvailability.id,
+    DoctorAvailability.doctor_id,
+    DoctorAvailability.day_of_week,
+    DoctorAvailability.start_time,
+    DoctorAvailability.end_time,
+    DoctorAvailability.slot_duration_minutes,
+    DoctorAvailability.is_active,
+)
+
+# Built once; calls only bind parameters (see the appointment repository)
+_BY_DOCTOR = db.select(DoctorAvailability).where(DoctorAvailability.doctor_id == db.bindparam('doctor_id'))
+_BY_DOCTOR_AND_DAY = _BY_DOCTOR.where(DoctorAvailability.day_of_week == db.bindparam('day_of_week'))
+_RECORDS_BY_DOCTOR = db.select(*_RECORD_COLUMNS).where(DoctorAvailability.doctor_id == db.bindparam('doctor_id'))
@@ -1,16 +1,24 @@
-from typing import List, Optional, Type, TypeVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type, TypeVar
+from sqlalchemy.dialects import postgresql, sqlite
 from app.models.base import db
+from app.db.session import read_only
+from app.db.unit_of_work import commit
 
 T = TypeVar("T", bound=db.Model)
 
 class BaseRepository:
-    def __init__(self, model: Type[T]):
+    def __init__(self, model: Type[T], version: Optional[str] = None):
         self.model = model
+        # DataVersion counter of a cached table. The bulk helpers bump it in their
+        # transaction; single-row writes leave that to the service's unit_of_work.
+        self.version = version
 
+    @read_only
     def get_all(self) -> List[T]:
         """Fetch all records."""
         return db.session.execute(db.select(self.model)).scalars().all()
 
+    @read_only
     def get_by_id(self, id: int) -> Optional[T]:
         """Fetch a record by ID."""
         return db.session.get(self.model, id)
@@ -19,17 +27,98 @@ class BaseRepository:
         """Create a new record."""
         instance = self.model(**kwargs)
         db.session.add(instance)
-        db.session.commit()
+        commit()
         return instance
 
     def update(self, instance: T, **kwargs) -> T:
         """Update an existing record."""
         for key, value in kwargs.items():
             setattr(instance, key, value)
-        db.session.commit()
+        commit()
         return instance
 
     def delete(self, instance: T) -> None:
         """Delete a record."""
         db.session.delete(instance)
-        db.session.commit()
+        commit()
+
+    def bulk_create(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Insert many records from column dicts with multi-row INSERT statements.
+        Column defaults still apply; no ORM objects are created. Returns the row count.
+        Like bulk_update and bulk_upsert, bumps the repository's version counter, if any.
+        """
+        if not rows:
+            return 0
+        db.session.execute(db.insert(self.model), list(rows))
+        self._bump_version()
+        commit()
+        return len(rows)
+
+    def bulk_update(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Update many records by primary key; each dict holds the key plus the columns to change.
+        Runs as one executemany UPDATE, so onupdate defaults such as updated_at still apply.
+        """
+        if not rows:
+            return 0
+        db.session.execute(db.update(self.model), list(rows))
+        self._bump_version()
+        commit()
+        return len(rows)
+
+    def bulk_upsert(
+        self,
+        rows: Sequence[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Optional[Iterable[str]] = None,
+    ) -> int:
+        """
+        Insert many records, updating the ones that collide on `conflict_columns`
+        (a unique key) with INSERT ... ON CONFLICT DO UPDATE (PostgreSQL, SQLite).
+
+        `update_columns` defaults to every given column except the conflict
+        columns; updated_at is refreshed and created_at kept on update.
+        """
+        if not rows:
+            return 0
+        insert = insert_for_dialect()
+        if insert is db.insert:
+            raise NotImplementedError(f"bulk_upsert needs ON CONFLICT support ({_dialect_name()})")
+
+        columns = self.model.__table__.c
+        if update_columns is None:
+            update_columns = [name for name in rows[0] if name not in conflict_columns and name != 'created_at']
+        update_columns = list(update_columns)
+        if 'updated_at' in columns and 'updated_at' not in update_columns:
+            update_columns.append('updated_at')
+
+        stmt = insert(self.model.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[columns[name] for name in conflict_columns],
+            set_={name: stmt.excluded[name] for name in update_columns},
+        )
+        db.session.execute(stmt, list(rows))
+        self._bump_version()
+        commit()
+        return len(rows)
+
+    def _bump_version(self) -> None:
+        if self.version is not None:
+            # Imported here: the version repository builds on insert_for_dialect below
+            from app.repositories.data_version_repository import DataVersionRepository
+            DataVersionRepository.bump(self.version)
+
+
+def insert_for_dialect():
+    """Dialect-specific insert() so writes can use ON CONFLICT where available."""
+    name = _dialect_name()
+    if name == 'postgresql':
+        return postgresql.insert
+    if name == 'sqlite':
+        return sqlite.insert
+    return db.insert
+
+
+def _dialect_name() -> str:
+    return db.session.get_bind().dialect.name
@@ -0,0 +1,37 @@
+from app.models.base import db
+from app.models.data_version import DataVersion
+from app.repositories.base_repository import insert_for_dialect
+
+class DataVersionRepository:
+    @staticmethod
+    def get(name: str) -> int:
+        version = db.session.execute(_VERSION, {'name': name}).scalar_one_or_none()
+        return version or 0
+
+    @staticmethod
+    def bump(name: str) -> None:
+        """
+        Increment a version counter inside the current transaction.
+        The caller's commit publishes the new version together with its change.
+        One INSERT ... ON CONFLICT DO UPDATE, so concurrent first writers of a
+        counter cannot both try to create it.
+        """
+        insert = insert_for_dialect()
+        if insert is db.insert:
+            # No ON CONFLICT here; the migrations seed the known counters
+            result = db.session.execute(
+                db.update(DataVersion)
+                .where(DataVersion.name == name)
+                .values(version=DataVersion.version + 1)
+            )
+            if result.rowcount == 0:
+                db.session.add(DataVersion(name=name, version=1))
+            return
+        stmt = insert(DataVersion.__table__).values(name=name, version=1)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[DataVersion.name],
+            set_={'version': DataVersion.__table__.c.version + 1},
+        ))
+
+
+_VERSION = db.select(DataVersion.version).where(DataVersion.name == db.bindparam('name'))
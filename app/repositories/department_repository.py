@@ -1,14 +1,32 @@
-from typing import Optional
+from typing import List, Optional
 from app.models.department import Department
 from app.repositories.base_repository import BaseRepository
+from app.repositories.read_models import DepartmentRecord, to_records
 from app.models.base import db
+from app.db.session import read_only
+
+# DataVersion counter bumped by every department write (drives the list's ETag).
+DEPARTMENTS_VERSION = "departments"
 
 class DepartmentRepository(BaseRepository):
     def __init__(self):
-        super().__init__(Department)
+        super().__init__(Department, version=DEPARTMENTS_VERSION)
 
     def get_by_name(self, name: str) -> Optional[Department]:
         """Fetch a department by name."""
-        return db.session.execute(
-            db.select(Department).where(Department.name == name)
-        ).scalar_one_or_none()
+        return db.session.execute(_BY_NAME, {'name': name}).scalar_one_or_none()
+
+    @read_only
+    def list_records(self) -> List[DepartmentRecord]:
+        """All departments as plain records, for listing."""
+        return to_records(DepartmentRecord, db.session.execute(db.select(
+            Department.id,
+            Department.name,
+            Department.description,
+            Department.is_active,
+            Department.created_at,
+            Department.updated_at,
+        )))
+
+
+_BY_NAME = db.select(Department).where(Department.name == db.bindparam('name'))
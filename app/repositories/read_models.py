@@ -0,0 +1,56 @@
+"""
+Read models: plain named tuples for list endpoints.
+
+Listing queries select exactly the columns a response needs and return one of
+these records per row. Records are ordinary tuples, so they are never added
+to the session's identity map, carry no instance state or lazy loaders, and
+take a fraction of an ORM object's memory. Field names match the model
+attributes (and properties) the schemas read, so the same schemas dump both.
+"""
+from datetime import date, datetime, time
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Type, TypeVar
+
+from app.models.appointment import AppointmentStatus
+
+R = TypeVar("R", bound=tuple)
+
+
+class AppointmentRecord(NamedTuple):
+    id: int
+    patient_id: int
+    doctor_id: int
+    date: date
+    start_time: time
+    end_time: time
+    status: AppointmentStatus
+    reason: Optional[str]
+    patient_name: str
+    doctor_name: str
+
+
+class DepartmentRecord(NamedTuple):
+    id: int
+    name: str
+    description: Optional[str]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class AvailabilityRecord(NamedTuple):
+    id: int
+    doctor_id: int
+    day_of_week: int
+    start_time: str
+    end_time: str
+    slot_duration_minutes: int
+    is_active: bool
+
+
+def to_records(record: Type[R], rows: Iterable) -> List[R]:
+    make = record._make
+    return [make(row) for row in rows]
+
+
+def iter_records(record: Type[R], rows: Iterable) -> Iterator[R]:
+    return map(record._make, rows)
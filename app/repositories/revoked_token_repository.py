@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import List, Tuple
+from sqlalchemy.exc import IntegrityError
+from app.models.base import db
+from app.models.token import RevokedToken
+
+class RevokedTokenRepository:
+    @staticmethod
+    def add(jti: str, expires_at: datetime) -> bool:
+        """
+        Revoke a jti (or session family).
+        Returns False when it was already revoked, e.g. by a concurrent request.
+        """
+        db.session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+        return True
+
+    @staticmethod
+    def is_revoked(jti: str) -> bool:
+        return db.session.execute(_BY_JTI, {'jti': jti}).first() is not None
+
+    @staticmethod
+    def find_created_since(since: datetime) -> List[Tuple[str, datetime, datetime]]:
+        """(jti, expires_at, created_at) of entries revoked at or after `since` that are still relevant."""
+        return db.session.execute(
+            db.select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.created_at).where(
+                RevokedToken.created_at >= since,
+                RevokedToken.expires_at > datetime.utcnow()
+            )
+        ).all()
+
+    @staticmethod
+    def delete_expired(now: datetime) -> int:
+        result = db.session.execute(
+            db.delete(RevokedToken).where(RevokedToken.expires_at <= now)
+        )
+        db.session.commit()
+        return result.rowcount
+
+
+_BY_JTI = db.select(RevokedToken.id).where(RevokedToken.jti == db.bindparam('jti'))
@@ -9,6 +9,7 @@ class UserRepository(BaseRepository):
 
     def get_by_email(self, email: str) -> Optional[User]:
         """Fetch a user by email."""
-        return db.session.execute(
-            db.select(User).where(User.email == email)
-        ).scalar_one_or_none()
+        return db.session.execute(_BY_EMAIL, {'email': email}).scalar_one_or_none()
+
+
+_BY_EMAIL = db.select(User).where(User.email == db.bindparam('email'))
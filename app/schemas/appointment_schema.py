@@ -1,4 +1,8 @@
-from marshmallow import Schema, fields, validate
+import base64
+import json
+from datetime import date, time
+from marshmallow import Schema, ValidationError, fields, validate
+from app.models.appointment import AppointmentStatus
 
 class AppointmentSchema(Schema):
     id = fields.Int(dump_only=True)
@@ -12,3 +16,31 @@ class AppointmentSchema(Schema):
     
     patient_name = fields.Str(dump_only=True)
     doctor_name = fields.Str(dump_only=True)
+
+
+class CursorField(fields.Field):
+    """Opaque keyset cursor wrapping the (date, start_time, id) of the last row of a page."""
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is None:
+            return None
+        raw = json.dumps([value[0].isoformat(), value[1].isoformat(), value[2]])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            day, start, appt_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return date.fromisoformat(day), time.fromisoformat(start), int(appt_id)
+        except (ValueError, TypeError, AttributeError):
+            raise ValidationError("Invalid cursor.")
+
+class AppointmentQuerySchema(Schema):
+    limit = fields.Int(validate=validate.Range(min=1, max=500))
+    cursor = CursorField()
+    status = fields.Enum(AppointmentStatus, by_value=True)
+    start_date = fields.Date(data_key="from")
+    end_date = fields.Date(data_key="to")
+    doctor_id = fields.Int()
+    patient_id = fields.Int()
+    format = fields.Str(validate=validate.OneOf(["json", "ndjson"]))
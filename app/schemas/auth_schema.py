@@ -10,3 +10,6 @@ class RegisterSchema(Schema):
     name = fields.String(required=True)
     # Role is optional during registration (defaults to MEMBER), unless admin sets it
     role = fields.String(validate=validate.OneOf(["admin", "doctor", "member"]))
+
+class RefreshSchema(Schema):
+    refresh_token = fields.String(required=True)
@@ -1,15 +1,42 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, ValidationError, fields, validate, validates_schema
+
+# HH 00-23, MM 00-59; an end time may also be 24:00, the end of the day
+HHMM = r'^([01]\d|2[0-3]):[0-5]\d$'
+HHMM_OR_END_OF_DAY = r'^(([01]\d|2[0-3]):[0-5]\d|24:00)$'
 
 class DoctorAvailabilitySchema(Schema):
     id = fields.Int(dump_only=True)
     doctor_id = fields.Int(dump_only=True)
     day_of_week = fields.Int(required=True, validate=validate.Range(min=0, max=6))
-    start_time = fields.Str(required=True, validate=validate.Regexp(r'^\d{2}:\d{2}$'))
-    end_time = fields.Str(required=True, validate=validate.Regexp(r'^\d{2}:\d{2}$'))
+    start_time = fields.Str(required=True, validate=validate.Regexp(HHMM, error="Expected HH:MM between 00:00 and 23:59."))
+    end_time = fields.Str(required=True, validate=validate.Regexp(
+        HHMM_OR_END_OF_DAY, error="Expected HH:MM between 00:00 and 24:00."
+    ))
     slot_duration_minutes = fields.Int(load_default=30, validate=validate.Range(min=15, max=60))
     is_active = fields.Bool(load_default=True)
     day_name = fields.Method("get_day_name", dump_only=True)
 
+    @validates_schema
+    def validate_window(self, data, **kwargs):
+        # Fixed-width HH:MM strings order like the times they encode
+        if 'start_time' in data and 'end_time' in data and data['end_time'] <= data['start_time']:
+            raise ValidationError("end_time must be after start_time.", field_name='end_time')
+
     def get_day_name(self, obj):
         days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
         return days[obj.day_of_week]
+
+class SlotQuerySchema(Schema):
+    # 'from' is a keyword, so the fields are renamed on load
+    start_date = fields.Date(data_key="from")
+    end_date = fields.Date(data_key="to")
+
+class EarliestSlotQuerySchema(Schema):
+    start_date = fields.Date(data_key="from")
+    limit = fields.Int(load_default=10, validate=validate.Range(min=1, max=100))
+
+class SlotSchema(Schema):
+    doctor_id = fields.Int(dump_only=True)
+    date = fields.Date(dump_only=True)
+    start_time = fields.Time(dump_only=True)
+    end_time = fields.Time(dump_only=True)
@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import request, jsonify, g
 from app.security.jwt import decode_token
+from app.security.jwt_handler import is_revoked
 
 def token_required(f):
     @wraps(f)
@@ -18,12 +19,13 @@ def token_required(f):
             return jsonify({'message': 'Token is missing!'}), 401
 
         payload = decode_token(token)
-        if not payload:
+        if not payload or payload.get('type', 'access') != 'access' or is_revoked(payload):
             return jsonify({'message': 'Token is invalid or expired!'}), 401
 
         # Store user info in flask global 'g' object for access in controllers
         g.user_id = payload.get('sub')
         g.role = payload.get('role')
+        g.token_claims = payload
 
         return f(*args, **kwargs)
 
@@ -1,50 +1,177 @@
 import jwt
 import datetime
+import hashlib
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from flask import current_app
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-def generate_token(user_id: int, role: str) -> str:
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECRET_KEY = 'default_secret_key_change_me'
+ALGORITHM = 'HS256'
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of already verified tokens -> claims.
+
+    Entries are keyed by a keyed BLAKE2 digest of the token, using a fingerprint
+    of the signing secret as the key: raw bearer tokens are never retained, and
+    rotating the secret makes every existing entry unreachable. Entries are only
+    served until the token's own `exp`.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return entry[1]
+
+    def put(self, digest: bytes, payload: Dict[str, Any]) -> None:
+        if self.maxsize <= 0 or 'exp' not in payload:
+            return
+        with self._lock:
+            self._entries[digest] = (float(payload['exp']), payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class JWTState:
+    """Signing key and verified-token cache, resolved once per app in init_app."""
+
+    def __init__(self, secret_key: str, cache: VerifiedTokenCache):
+        self.secret_key = secret_key
+        self.fingerprint = hashlib.sha256(secret_key.encode()).digest()
+        self.cache = cache
+
+    def digest(self, token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), key=self.fingerprint, digest_size=16).digest()
+
+
+class _RateLimitedLog:
+    """Debug-log token failures at most once per interval, reporting how many were suppressed."""
+
+    def __init__(self, interval: float = 10.0):
+        self.interval = interval
+        self._last = 0.0
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, message: str, error: Exception) -> None:
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last < self.interval:
+                self._suppressed += 1
+                return
+            suppressed, self._suppressed, self._last = self._suppressed, 0, now
+        logger.debug("%s: %s (%d similar failures suppressed)", message, error, suppressed)
+
+
+_log_failure = _RateLimitedLog()
+_shared_cache = VerifiedTokenCache()
+
+
+def init_app(app) -> None:
+    """Resolve the signing key and size the verified-token cache once at startup."""
+    _shared_cache.maxsize = app.config.get('JWT_CACHE_SIZE', _shared_cache.maxsize)
+    app.extensions['jwt'] = JWTState(
+        app.config.get('SECRET_KEY') or DEFAULT_SECRET_KEY,
+        _shared_cache
+    )
+
+
+def _state() -> JWTState:
+    state = current_app.extensions.get('jwt')
+    if state is None:
+        init_app(current_app)
+        state = current_app.extensions['jwt']
+    return state
+
+
+def generate_token(
+    user_id: int,
+    role: str,
+    token_type: str = 'access',
+    lifetime: Optional[datetime.timedelta] = None,
+    family: Optional[str] = None
+) -> str:
     """
     Generates the Auth Token
+    Every token carries a unique `jti` and the `fam` (login session) it belongs to,
+    which is what the revocation list matches on.
     :return: string
     """
     try:
+        if lifetime is None:
+            lifetime = datetime.timedelta(minutes=current_app.config.get('JWT_ACCESS_TOKEN_MINUTES', 15))
+        now = datetime.datetime.utcnow()
+        jti = uuid.uuid4().hex
         payload = {
-            'exp': datetime.datetime.utcnow() + datetime.timedelta(days=1, minutes=0),
-            'iat': datetime.datetime.utcnow(),
+            'exp': now + lifetime,
+            'iat': now,
             'sub': str(user_id),
-            'role': role
+            'role': role,
+            'type': token_type,
+            'jti': jti,
+            'fam': family or jti
         }
         return jwt.encode(
             payload,
-            current_app.config.get('SECRET_KEY', 'default_secret_key_change_me'),
-            algorithm='HS256'
+            _state().secret_key,
+            algorithm=ALGORITHM
         )
     except Exception as e:
         import traceback
-        import logging
         logging.error(f"JWT Generation Error: {str(e)}")
         logging.error(traceback.format_exc())
         return f"Error generating token: {str(e)}"
 
 def decode_token(auth_token: str) -> Optional[Dict[str, Any]]:
     """
-    Decodes the auth token
+    Decodes the auth token, serving repeat tokens from the verified-token cache.
+    The returned claims may be shared between requests and must not be mutated.
     :param auth_token:
-    :return: integer|string
+    :return: claims dict, or None when invalid or expired
     """
+    state = _state()
+    digest = state.digest(auth_token)
+    payload = state.cache.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             auth_token,
-            current_app.config.get('SECRET_KEY', 'default_secret_key_change_me'),
-            algorithms=['HS256']
+            state.secret_key,
+            algorithms=[ALGORITHM]
         )
-        return payload
     except jwt.ExpiredSignatureError as e:
-        import logging
-        logging.error(f"Token Expired: {e}")
+        _log_failure("Token Expired", e)
         return None
     except jwt.InvalidTokenError as e:
-        import logging
-        logging.error(f"Token Invalid: {e}")
+        _log_failure("Token Invalid", e)
         return None
+
+    state.cache.put(digest, payload)
+    return payload
@@ -1 +1,74 @@
 # JWT encoding/decoding/refresh
+
+import datetime
+import uuid
+from typing import Any, Dict, Optional
+
+from flask import current_app
+
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.security.jwt import decode_token, generate_token
+from app.security.revocation import revocation_list
+
+
+def _refresh_lifetime() -> datetime.timedelta:
+    return datetime.timedelta(days=current_app.config.get('JWT_REFRESH_TOKEN_DAYS', 7))
+
+
+def issue_token_pair(user_id: int, role: str, family: Optional[str] = None) -> Dict[str, str]:
+    """
+    Issue a short-lived access token and a refresh token for the same login session.
+    Both share the session id (`fam`), so the whole session can be revoked at once.
+    """
+    family = family or uuid.uuid4().hex
+    return {
+        'token': generate_token(user_id, role, family=family),
+        'refresh_token': generate_token(
+            user_id, role, token_type='refresh', lifetime=_refresh_lifetime(), family=family
+        ),
+    }
+
+
+def decode_refresh_token(refresh_token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify a refresh token's signature, expiry and type. It is not checked
+    against the denylist here: rotate_refresh_token does that in the database,
+    not in the revocation_list cache, so a refresh sees revocations made by
+    every worker at once.
+    """
+    claims = decode_token(refresh_token)
+    if not claims or claims.get('type') != 'refresh' or 'jti' not in claims:
+        return None
+    return claims
+
+
+def rotate_refresh_token(claims: Dict[str, Any], role: str) -> Optional[Dict[str, str]]:
+    """
+    Spend a refresh token and issue the next pair in the same session.
+    Presenting an already spent refresh token means it was copied: the whole
+    session is revoked and None is returned.
+    """
+    if RevokedTokenRepository.is_revoked(claims['fam']):
+        return None
+    expires_at = datetime.datetime.utcfromtimestamp(claims['exp'])
+    if not revoke(claims['jti'], expires_at):
+        revoke_session(claims)
+        return None
+    return issue_token_pair(claims['sub'], role, family=claims['fam'])
+
+
+def revoke_session(claims: Dict[str, Any]) -> None:
+    """Revoke every access and refresh token of the login session the claims belong to."""
+    family = claims.get('fam') or claims.get('jti')
+    if family:
+        revoke(family, datetime.datetime.utcnow() + _refresh_lifetime())
+
+
+def revoke(jti: str, expires_at: datetime.datetime) -> bool:
+    revocation_list.add(jti, expires_at)
+    return RevokedTokenRepository.add(jti, expires_at)
+
+
+def is_revoked(claims: Dict[str, Any]) -> bool:
+    """Hot-path check used by token_required; never touches the database directly."""
+    return revocation_list.is_revoked(claims)
@@ -0,0 +1,133 @@
+import logging
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Optional
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HASH_METHOD = 'scrypt'
+# werkzeug's scrypt n, r and p when the method names none
+SCRYPT_DEFAULTS = (2 ** 15, 8, 1)
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing pool queue is full; callers answer 503 instead of piling up."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing is saturated, retry later")
+        self.retry_after = retry_after
+
+
+def normalize_method(method: str) -> str:
+    """
+    Expand a werkzeug hash method to the full parameter string it stores,
+    e.g. 'scrypt' -> 'scrypt:32768:8:1', so stored hashes can be compared against it.
+    Missing trailing parameters take werkzeug's defaults ('scrypt:16384' -> 'scrypt:16384:8:1').
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        if len(args) > 3:
+            raise ValueError("'scrypt' takes 3 arguments.")
+        n, r, p = (*args, *SCRYPT_DEFAULTS[len(args):])
+        return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+    if name == 'pbkdf2':
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+
+class PasswordHasher:
+    """
+    Runs the password KDF on a small process pool so a burst of logins cannot
+    occupy every request thread (or hold the GIL) of a worker.
+
+    At most `workers + queue_depth` hashes are in flight per process; beyond
+    that `HashingBusy` is raised immediately. `workers = 0` hashes inline,
+    which is what tests and single-threaded tooling want. The pool is created
+    lazily and re-created after a fork, so it is never shared across workers.
+    """
+
+    def __init__(self, method: str = DEFAULT_HASH_METHOD, workers: int = 0, queue_depth: int = 16, timeout: float = 10.0):
+        self.configure(method, workers, queue_depth, timeout)
+        self._pool = None
+        self._pool_pid: Optional[int] = None
+        self._pool_lock = threading.Lock()
+
+    def configure(self, method: str, workers: int, queue_depth: int, timeout: float) -> None:
+        self.method = normalize_method(method)
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, workers + queue_depth))
+
+    def init_app(self, app) -> None:
+        self.shutdown()
+        self.configure(
+            app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD),
+            app.config.get('PASSWORD_HASH_WORKERS', min(4, os.cpu_count() or 1)),
+            app.config.get('PASSWORD_HASH_QUEUE_DEPTH', 16),
+            app.config.get('PASSWORD_HASH_TIMEOUT', 10.0),
+        )
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when a stored hash was made with other parameters than the configured ones."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool_pid = None
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # Freed when the hash is done, not when the caller gives up: a timed-out
+        # hash keeps its pool process busy until it finishes
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise HashingBusy()
+
+    def _executor(self):
+        pid = os.getpid()
+        if self._pool is not None and self._pool_pid == pid:
+            return self._pool
+        with self._pool_lock:
+            if self._pool is None or self._pool_pid != pid:
+                # Imported here: processes that hash inline never load multiprocessing
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # forkserver/spawn: never fork a process that already runs request threads
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(method)
+                )
+                self._pool_pid = pid
+                logger.info(f"Started password hashing pool with {self.workers} processes ({method})")
+            return self._pool
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,315 @@
+import logging
+import math
+import threading
+import time
+import zlib
+from functools import wraps
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from flask import g, jsonify, make_response, request
+
+from app.metrics.registry import registry
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Limit name -> [(key, "N/period"), ...]; every listed bucket must have a token.
+# Override per deployment with the RATE_LIMITS config (same shape, merged per name).
+DEFAULT_LIMITS: Dict[str, List[Tuple[str, str]]] = {
+    'login': [('ip', '30/minute'), ('email', '5/minute')],
+    'register': [('ip', '10/minute')],
+    'refresh': [('ip', '30/minute')],
+    'booking': [('user', '20/minute')],
+}
+
+RATE_LIMITED = registry.counter(
+    "rate_limit_rejections_total", "Requests rejected with 429, by limit and key type.", ("limit", "key")
+)
+
+
+class Rate(NamedTuple):
+    capacity: int
+    period: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "Rate":
+        """'5/minute', '100/hour', '10/30 seconds' style specs."""
+        count, _, per = spec.partition('/')
+        words = per.strip().split()
+        if len(words) == 2:
+            amount, unit = int(words[0]), words[1]
+        else:
+            amount, unit = 1, words[0]
+        return cls(int(count), amount * PERIODS[unit.rstrip('s')])
+
+    @property
+    def per_second(self) -> float:
+        return self.capacity / self.period
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+def _decide(allowed: bool, tokens: float, rate: Rate) -> Decision:
+    per_second = rate.per_second
+    return Decision(
+        allowed,
+        int(tokens),
+        0.0 if allowed else (1 - tokens) / per_second,
+        (rate.capacity - tokens) / per_second,
+    )
+
+
+class MemoryBackend:
+    """
+    Token buckets kept in this process, striped over `shards` locks so unrelated
+    keys do not contend. Counts are per worker process: with N workers a client
+    effectively gets N times the budget, which is why multi-worker deployments
+    should point RATE_LIMIT_STORAGE at Redis. The clock is injectable, which
+    makes this backend the deterministic stand-in for tests.
+    """
+
+    def __init__(self, shards: int = 32, clock: Callable[[], float] = time.monotonic, sweep_every: int = 1024):
+        self._clock = clock
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+        self._sweep_every = sweep_every
+        self._ops = [0] * shards
+
+    def hit(self, key: str, rate: Rate) -> Decision:
+        return self.hit_all([(key, rate)])[0]
+
+    def hit_all(self, buckets: Sequence[Tuple[str, Rate]]) -> List[Decision]:
+        """
+        Take a token from every bucket if each has one, otherwise from none.
+        The shard locks involved are held together (in index order) so the
+        check and the take are one step.
+        """
+        indexes = [zlib.crc32(key.encode()) % len(self._shards) for key, _ in buckets]
+        locks = [self._shards[index][1] for index in sorted(set(indexes))]
+        now = self._clock()
+        for lock in locks:
+            lock.acquire()
+        try:
+            levels = []
+            for (key, rate), index in zip(buckets, indexes):
+                tokens, updated = self._shards[index][0].get(key, (rate.capacity, now))
+                levels.append(min(rate.capacity, tokens + (now - updated) * rate.per_second))
+            allowed = all(tokens >= 1 for tokens in levels)
+            decisions = []
+            for (key, rate), index, tokens in zip(buckets, indexes, levels):
+                if allowed:
+                    tokens -= 1
+                shard = self._shards[index][0]
+                shard[key] = (tokens, now)
+                decisions.append(_decide(tokens >= 1 or allowed, tokens, rate))
+
+                self._ops[index] += 1
+                if self._ops[index] >= self._sweep_every:
+                    self._ops[index] = 0
+                    self._sweep(shard, now)
+            return decisions
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @staticmethod
+    def _sweep(buckets: dict, now: float) -> None:
+        # A bucket untouched for a whole day has long refilled; dropping it changes nothing
+        stale = [key for key, (_, updated) in buckets.items() if now - updated > PERIODS['day']]
+        for key in stale:
+            del buckets[key]
+
+    def reset(self) -> None:
+        for buckets, lock in self._shards:
+            with lock:
+                buckets.clear()
+
+
+class RedisBackend:
+    """
+    Token buckets shared by all workers, updated atomically by a Lua script using the server clock.
+    The buckets of one check are updated by one script call, so on Redis Cluster they
+    have to share a slot (give the prefix a hash tag, e.g. 'ratelimit:{api}:').
+    """
+
+    SCRIPT = """
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    local levels = {}
+    local allowed = 1
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[2 * i - 1])
+        local per_second = tonumber(ARGV[2 * i])
+        local state = redis.call('HMGET', key, 'tokens', 'ts')
+        local tokens = tonumber(state[1]) or capacity
+        local ts = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - ts) * per_second)
+        if tokens < 1 then
+            allowed = 0
+        end
+        levels[i] = tokens
+    end
+    local result = {allowed}
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[2 * i - 1])
+        local per_second = tonumber(ARGV[2 * i])
+        local tokens = levels[i] - allowed
+        redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', tostring(now))
+        redis.call('PEXPIRE', key, math.ceil(capacity / per_second * 1000))
+        result[i + 1] = tostring(tokens)
+    end
+    return result
+    """
+
+    def __init__(self, client, prefix: str = 'ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_STORAGE points at Redis but the 'redis' package is not installed")
+        return cls(redis.Redis.from_url(url))
+
+    def hit(self, key: str, rate: Rate) -> Decision:
+        return self.hit_all([(key, rate)])[0]
+
+    def hit_all(self, buckets: Sequence[Tuple[str, Rate]]) -> List[Decision]:
+        """Take a token from every bucket if each has one, otherwise from none."""
+        args = [value for _, rate in buckets for value in (rate.capacity, rate.per_second)]
+        allowed, *levels = self._script(keys=[self.prefix + key for key, _ in buckets], args=args)
+        return [
+            _decide(bool(allowed) or float(tokens) >= 1, float(tokens), rate)
+            for (_, rate), tokens in zip(buckets, levels)
+        ]
+
+    def reset(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+
+def backend_from_url(url: str):
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisBackend.from_url(url)
+    if url.startswith('memory://'):
+        return MemoryBackend()
+    raise ValueError(f"Unsupported RATE_LIMIT_STORAGE '{url}'")
+
+
+def _client_ip() -> str:
+    return request.remote_addr or 'unknown'
+
+
+def _user_id() -> Optional[str]:
+    return getattr(g, 'user_id', None)
+
+
+def _email() -> Optional[str]:
+    data = request.get_json(silent=True)
+    email = data.get('email') if isinstance(data, dict) else None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+KEY_FUNCTIONS: Dict[str, Callable[[], Optional[str]]] = {
+    'ip': _client_ip,
+    'user': _user_id,
+    'email': _email,
+}
+
+
+class RateLimiter:
+    """Resolves the configured limits once per app and applies them in `rate_limited` views."""
+
+    def __init__(self):
+        self.enabled = True
+        self.backend = MemoryBackend()
+        self.limits: Dict[str, List[Tuple[str, Rate]]] = {}
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.backend = backend_from_url(app.config.get('RATE_LIMIT_STORAGE', 'memory://'))
+        configured = {**DEFAULT_LIMITS, **app.config.get('RATE_LIMITS', {})}
+        self.limits = {
+            name: [(key, Rate.parse(spec)) for key, spec in specs]
+            for name, specs in configured.items()
+        }
+        for name, specs in self.limits.items():
+            for key, _ in specs:
+                if key not in KEY_FUNCTIONS:
+                    raise ValueError(f"Unknown rate limit key '{key}' for '{name}'")
+
+    def check(self, name: str) -> Optional[Tuple[Rate, Decision, str]]:
+        """
+        Take a token from every bucket of the limit, or from none of them when
+        any bucket is empty, so a rejected request costs the client nothing.
+        Returns the most restrictive outcome.
+        """
+        buckets = []
+        for key_type, rate in self.limits.get(name, ()):
+            value = KEY_FUNCTIONS[key_type]()
+            if value is not None:
+                buckets.append((key_type, rate, f"{name}:{key_type}:{value}"))
+        if not buckets:
+            return None
+        try:
+            decisions = self.backend.hit_all([(key, rate) for _, rate, key in buckets])
+        except Exception as e:
+            # Fail open: an unreachable shared store must not take the API down
+            logger.warning(f"Rate limit backend error: {str(e)}")
+            return None
+        tightest = None
+        for (key_type, rate, _), decision in zip(buckets, decisions):
+            if tightest is None or _tighter(decision, tightest[1]):
+                tightest = (rate, decision, key_type)
+        return tightest
+
+
+def _tighter(a: Decision, b: Decision) -> bool:
+    if a.allowed != b.allowed:
+        return not a.allowed
+    return a.retry_after > b.retry_after if not a.allowed else a.remaining < b.remaining
+
+
+def _set_headers(response, rate: Rate, decision: Decision) -> None:
+    response.headers['X-RateLimit-Limit'] = str(rate.capacity)
+    response.headers['X-RateLimit-Remaining'] = str(decision.remaining)
+    response.headers['X-RateLimit-Reset'] = str(math.ceil(decision.reset_after))
+    if not decision.allowed:
+        response.headers['Retry-After'] = str(max(1, math.ceil(decision.retry_after)))
+
+
+def rate_limited(name: str):
+    """
+    Decorator applying the limit `name` (see DEFAULT_LIMITS / RATE_LIMITS).
+    Limits keyed by 'user' need the decorator to sit below @token_required.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if not rate_limiter.enabled:
+                return f(*args, **kwargs)
+
+            outcome = rate_limiter.check(name)
+            if outcome is None:
+                return f(*args, **kwargs)
+            rate, decision, key_type = outcome
+            if not decision.allowed:
+                RATE_LIMITED.inc((name, key_type))
+                response = make_response(jsonify({'message': 'Too many requests, retry later'}), 429)
+            else:
+                response = make_response(f(*args, **kwargs))
+            _set_headers(response, rate, decision)
+            return response
+        return decorated
+    return decorator
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,89 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from app.models.base import db
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    In-memory copy of the revoked_tokens denylist.
+
+    Checks are a dict lookup, so per-request auth cost does not grow with the
+    list. At most once every `sync_interval` seconds one request pulls the rows
+    revoked since the last sync (re-reading a short `lookback` window to cover
+    transactions that committed late); revocations made by this worker are
+    applied locally right away. Entries are dropped once the tokens they cover
+    have expired.
+    """
+
+    def __init__(self, sync_interval: float = 2.0, lookback: float = 30.0, prune_interval: float = 60.0):
+        self.sync_interval = sync_interval
+        self.lookback = timedelta(seconds=lookback)
+        self.prune_interval = prune_interval
+        self._expires: Dict[str, float] = {}
+        self._synced_until: Optional[datetime] = None
+        self._next_sync = 0.0
+        self._next_prune = 0.0
+        self._sync_lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.sync_interval = app.config.get('REVOCATION_SYNC_INTERVAL', self.sync_interval)
+        self._expires = {}
+        self._synced_until = None
+        self._next_sync = 0.0
+
+    def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        if time.monotonic() >= self._next_sync:
+            self._sync()
+        expires = self._expires
+        return claims.get('jti') in expires or claims.get('fam') in expires
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        self._expires[jti] = _epoch(expires_at)
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def _sync(self) -> None:
+        # Only one thread refreshes; the others keep using the current copy.
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            since = self._synced_until - self.lookback if self._synced_until else datetime.min
+            rows = RevokedTokenRepository.find_created_since(since)
+            for jti, expires_at, created_at in rows:
+                self._expires[jti] = _epoch(expires_at)
+                if self._synced_until is None or created_at > self._synced_until:
+                    self._synced_until = created_at
+            if self._synced_until is None:
+                self._synced_until = datetime.utcnow()
+            self._prune()
+        except Exception as e:
+            # Runs inside the request's session: leave it usable for the request itself
+            db.session.rollback()
+            logger.warning(f"Revocation list sync failed: {str(e)}")
+        finally:
+            self._next_sync = time.monotonic() + self.sync_interval
+            self._sync_lock.release()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.prune_interval
+        cutoff = time.time()
+        self._expires = {jti: exp for jti, exp in self._expires.items() if exp > cutoff}
+
+
+def _epoch(value: datetime) -> float:
+    # Naive datetimes in this app are UTC
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+
+revocation_list = RevocationList()
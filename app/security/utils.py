@@ -1,9 +1,13 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.security.password_hasher import password_hasher
 
 def hash_password(password: str) -> str:
-    """Hash a password for storing."""
-    return generate_password_hash(password)
+    """Hash a password for storing (on the hashing pool, see PasswordHasher)."""
+    return password_hasher.hash(password)
 
 def verify_password(password_hash: str, password: str) -> bool:
     """Verify a stored password against one provided by user."""
-    return check_password_hash(password_hash, password)
+    return password_hasher.verify(password_hash, password)
+
+def password_needs_rehash(password_hash: str) -> bool:
+    """Whether a stored hash uses outdated parameters and should be replaced after login."""
+    return password_hasher.needs_rehash(password_hash)
@@ -0,0 +1,4 @@
+from app.serialization.encoders import CompiledSchema, compile_schema
+from app.serialization.json_provider import FastJSONProvider
+
+__all__ = ["CompiledSchema", "FastJSONProvider", "compile_schema"]
@@ -0,0 +1,119 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from marshmallow import Schema, fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+# Field classes whose _serialize is reproduced inline; subclasses may override it, so only exact types qualify.
+_TEMPORAL = (fields.Date, fields.Time, fields.DateTime)
+
+
+def _text(value) -> str:
+    # marshmallow.utils.ensure_text_type
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+@lru_cache(maxsize=256)
+def _reads_attributes(cls: type) -> bool:
+    """
+    True when marshmallow would read values of `cls` instances with getattr:
+    objects without __getitem__, and tuples (whose str lookup fails over to getattr).
+    """
+    return issubclass(cls, tuple) or not (hasattr(cls, "__getitem__") or issubclass(cls, Mapping))
+
+
+def _inline(field: fields.Field, value: str) -> Optional[str]:
+    """Expression serializing `value` exactly like field._serialize, or None if it has to be called."""
+    cls = type(field)
+    if cls is fields.Integer and not field.as_string:
+        return f"None if {value} is None else int({value})"
+    if cls is fields.String:
+        return f"{value} if {value}.__class__ is str else None if {value} is None else text({value})"
+    if cls is fields.Boolean:
+        return value
+    return None
+
+
+def _compile(schema: Schema) -> Optional[Callable[[Any], dict]]:
+    if schema._hooks[PRE_DUMP] or schema._hooks[POST_DUMP] or schema.dict_class is not dict:
+        return None
+    if type(schema).get_attribute is not Schema.get_attribute:
+        return None
+
+    namespace = {"missing": missing, "text": _text, "plain": _reads_attributes, "slow": schema.dump}
+    lines = [
+        "def dump_one(obj):",
+        "    if not plain(obj.__class__):",
+        "        return slow(obj, many=False)",
+        "    ret = {}",
+    ]
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        key = repr(field.data_key if field.data_key is not None else name)
+        attribute = field.attribute if field.attribute is not None else name
+        expression = _inline(field, "v")
+        if expression is None and type(field) in _TEMPORAL:
+            format_func = field.SERIALIZATION_FUNCS.get(field.format or field.DEFAULT_FORMAT)
+            if format_func is not None:
+                namespace[f"fmt{index}"] = format_func
+                expression = f"None if v is None else fmt{index}(v)"
+
+        if expression is None or field.dump_default is not missing or "." in attribute or not field._CHECK_ATTRIBUTE:
+            # Anything else goes through the field itself, which still skips the schema machinery
+            namespace[f"f{index}"] = field
+            lines += [
+                f"    v = f{index}.serialize({name!r}, obj, accessor)",
+                "    if v is not missing:",
+                f"        ret[{key}] = v",
+            ]
+        else:
+            lines += [
+                f"    v = getattr(obj, {attribute!r}, missing)",
+                "    if v is not missing:",
+                f"        ret[{key}] = {expression}",
+            ]
+    lines.append("    return ret")
+    namespace["accessor"] = schema.get_attribute
+
+    exec(compile("\n".join(lines), f"<compiled {type(schema).__name__}>", "exec"), namespace)
+    return namespace["dump_one"]
+
+
+class CompiledSchema:
+    """
+    Dump-only stand-in for a marshmallow schema on hot list endpoints.
+
+    The schema's dump fields are turned into one generated function per schema,
+    built once at import: Int, Str, Bool, Date, Time and DateTime values are
+    converted inline the way their fields would, every other field is called
+    directly. `dump()` returns exactly what `schema.dump()` returns. Schemas
+    with dump hooks or a custom get_attribute are not compiled and simply
+    delegate, as do mapping inputs.
+
+    The compiler reads marshmallow internals (_hooks, dump_fields, the field
+    classes' SERIALIZATION_FUNCS), so tests/integration/test_compiled_schemas.py
+    compares every controller's compiled schema with schema.dump on real rows;
+    run it when upgrading marshmallow.
+    """
+
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.many = schema.many
+        self._dump_one = _compile(schema)
+
+    @property
+    def compiled(self) -> bool:
+        return self._dump_one is not None
+
+    def dump(self, obj: Any, *, many: Optional[bool] = None):
+        many = self.many if many is None else bool(many)
+        if self._dump_one is None or obj is None:
+            return self.schema.dump(obj, many=many)
+        if many:
+            dump_one = self._dump_one
+            return [dump_one(item) for item in obj]
+        return self._dump_one(obj)
+
+
+def compile_schema(schema: Schema) -> CompiledSchema:
+    return CompiledSchema(schema)
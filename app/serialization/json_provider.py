@@ -0,0 +1,81 @@
+import codecs
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional: without it responses are encoded by the stdlib as before
+    orjson = None
+
+# orjson and json.dumps disagree on finite floats in exponent notation (1e16
+# vs 1e+16) and on small magnitudes (0.00001 vs 1e-05). Output containing a
+# digit followed by "e", or "0.0000", goes to the stdlib encoder; a match
+# inside a string only costs speed. Translating and searching bytes is several
+# times faster than a regex over a multi-megabyte list.
+_DIGITS_AND_E = bytes.maketrans(b"123456789E", b"000000000e")
+
+
+def _escape_non_ascii(error: UnicodeEncodeError):
+    # json.dumps(ensure_ascii=True): lowercase \uXXXX, astral characters as surrogate pairs
+    escaped = []
+    for char in error.object[error.start:error.end]:
+        code = ord(char)
+        if code > 0xFFFF:
+            code -= 0x10000
+            escaped.append(f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}")
+        else:
+            escaped.append(f"\\u{code:04x}")
+    return "".join(escaped), error.end
+
+
+codecs.register_error("json_ascii_escape", _escape_non_ascii)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider encoding compact responses with orjson, producing the
+    same bytes `jsonify` produced with the stdlib encoder: sorted keys, "," and
+    ":" separators, non-ASCII (and DEL) escaped as \\uXXXX, dates through
+    Flask's `default`.
+
+    Whatever orjson would write differently falls back to the stdlib per call:
+    pretty-printed debug output, non-default `dumps` arguments, floats in
+    exponent form, integers beyond 64 bits and non-string keys. Non-finite floats
+    come out as null instead of the stdlib's invalid NaN/Infinity.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs.keys() <= {"separators"} and kwargs.get("separators") == (",", ":"):
+            encoded = self._encode(obj)
+            if encoded is not None:
+                return encoded.decode("ascii")
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any):
+        # Flask's own argument handling (private; covered by test_compiled_schemas on upgrades)
+        obj = self._prepare_response_obj(args, kwargs)
+        if not ((self.compact is None and self._app.debug) or self.compact is False):
+            encoded = self._encode(obj)
+            if encoded is not None:
+                return self._app.response_class(encoded + b"\n", mimetype=self.mimetype)
+        return super().response(obj)
+
+    def _encode(self, obj: Any):
+        """orjson bytes identical to the stdlib's compact output, or None to use the stdlib."""
+        if orjson is None or not (self.sort_keys and self.ensure_ascii):
+            return None
+        try:
+            encoded = orjson.dumps(
+                obj,
+                default=self.default,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            # Includes orjson.JSONEncodeError: big integers, non-string keys, unsupported types
+            return None
+        if b"0.0000" in encoded or b"0e" in encoded.translate(_DIGITS_AND_E):
+            return None
+        if not encoded.isascii() or b"\x7f" in encoded:
+            encoded = encoded.decode("utf-8").replace("\x7f", "\\u007f").encode("ascii", "json_ascii_escape")
+        return encoded
@@ -1,26 +1,33 @@
 from typing import List, Tuple, Optional
-from app.repositories.department_repository import DepartmentRepository
+from app.repositories.department_repository import DEPARTMENTS_VERSION, DepartmentRepository
 from app.repositories.user_repository import UserRepository
 from app.models.department import Department
 from app.models.user import User, UserRole
 from app.models.doctor import DoctorDepartment
 from app.models.base import db
+from app.db.unit_of_work import unit_of_work
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.read_models import DepartmentRecord
 from app.security.utils import hash_password
 
 class AdminService:
     def __init__(self):
         self.department_repository = DepartmentRepository()
         self.user_repository = UserRepository()
+        self.version_repo = DataVersionRepository()
 
     def create_department(self, data: dict) -> Tuple[bool, str, Optional[Department]]:
         if self.department_repository.get_by_name(data['name']):
             return False, "Department already exists", None
-        
-        department = self.department_repository.create(**data)
+
+        # Committed together with the new department
+        with unit_of_work():
+            self.version_repo.bump(DEPARTMENTS_VERSION)
+            department = self.department_repository.create(**data)
         return True, "Department created", department
 
-    def list_departments(self) -> List[Department]:
-        return self.department_repository.get_all()
+    def list_departments(self) -> List[DepartmentRecord]:
+        return self.department_repository.list_records()
 
     def onboard_doctor(self, data: dict) -> Tuple[bool, str, Optional[User]]:
         existing_user = self.user_repository.get_by_email(data['email'])
@@ -1,50 +1,45 @@
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
 from app.models.appointment import Appointment, AppointmentStatus
 from app.repositories.appointment_repository import AppointmentRepository
-from app.repositories.availability_repository import AvailabilityRepository
+from app.repositories.read_models import AppointmentRecord
+from app.services.availability_cache import availability_cache
+from app.services.interval_index import time_to_minutes
+from app.services.slot_engine import format_hhmm
 
 class AppointmentService:
     def __init__(self):
         self.appt_repo = AppointmentRepository()
-        self.avail_repo = AvailabilityRepository()
 
     def book_appointment(self, patient_id: int, data: Dict[str, Any]) -> Appointment:
         doctor_id = data['doctor_id']
         appt_date = data['date'] # datetime.date object from marshmallow
         start_time = data['start_time'] # datetime.time object
         
-        # 1. Check Doctor Availability
+        # 1. Check Doctor Availability (parsed templates are cached per doctor)
         day_of_week = appt_date.weekday()
-        availability = self.avail_repo.find_by_doctor_and_day(doctor_id, day_of_week)
+        template = availability_cache.get_day(doctor_id, day_of_week)
         
-        if not availability or not availability.is_active:
+        if template is None:
              raise ValueError("Doctor is not available on this day.")
 
         # Check time window
-        avail_start = datetime.strptime(availability.start_time, "%H:%M").time()
-        avail_end = datetime.strptime(availability.end_time, "%H:%M").time()
-        
-        if start_time < avail_start:
-            raise ValueError(f"Doctor starts at {availability.start_time}")
+        start_minutes = time_to_minutes(start_time)
+        if start_minutes < template.start:
+            raise ValueError(f"Doctor starts at {format_hhmm(template.start)}")
             
         # Calculate End Time
-        slot_minutes = availability.slot_duration_minutes
+        slot_minutes = template.step
         # Combine date and time to perform arithmetic
         start_dt = datetime.combine(appt_date, start_time)
         end_dt = start_dt + timedelta(minutes=slot_minutes)
         end_time = end_dt.time()
         
-        if end_time > avail_end:
-             raise ValueError(f"Appointment exceeds doctor's working hours (ends at {availability.end_time})")
-
-        # 2. Check for Double Booking (Database Level Pre-check)
-        conflict = self.appt_repo.find_conflicting_appointment(doctor_id, appt_date, start_time)
-        if conflict:
-            raise ValueError("Doctor is already booked for this slot.")
+        if start_minutes + slot_minutes > template.end:
+             raise ValueError(f"Appointment exceeds doctor's working hours (ends at {format_hhmm(template.end)})")
 
-        # 3. Create Appointment
+        # 2. Create Appointment; the insert itself detects a taken slot
         appointment = Appointment(
             patient_id=patient_id,
             doctor_id=doctor_id,
@@ -55,12 +50,39 @@ class AppointmentService:
             reason=data.get('reason')
         )
         
-        return self.appt_repo.create(appointment)
+        created = self.appt_repo.create_if_free(appointment)
+        if created is None:
+            raise ValueError("Doctor is already booked for this slot.")
+        return created
 
-    def get_appointments_for_user(self, user_id: int, role: str) -> List[Appointment]:
+    def get_appointments_for_user(self, user_id: int, role: str) -> List[AppointmentRecord]:
         if role == 'admin':
             return self.appt_repo.find_all()
         elif role == 'doctor':
              return self.appt_repo.find_by_doctor(user_id)
         else: # Member/Patient
              return self.appt_repo.find_by_patient(user_id)
+
+    def list_appointments(
+        self, user_id: int, role: str, filters: Dict[str, Any], limit: int,
+        after: Optional[Tuple[Any, Any, int]] = None
+    ) -> Tuple[List[AppointmentRecord], bool]:
+        """
+        One keyset page of the appointments visible to the user.
+        Returns the page and whether more rows follow it.
+        """
+        rows = self.appt_repo.find_page(limit + 1, after, **self._scoped(user_id, role, filters))
+        return rows[:limit], len(rows) > limit
+
+    def stream_appointments(self, user_id: int, role: str, filters: Dict[str, Any]) -> Iterator[AppointmentRecord]:
+        return self.appt_repo.iter_filtered(**self._scoped(user_id, role, filters))
+
+    @staticmethod
+    def _scoped(user_id: int, role: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Admins may filter freely; doctors and members only ever see their own appointments."""
+        scoped = dict(filters)
+        if role == 'doctor':
+            scoped['doctor_id'] = int(user_id)
+        elif role != 'admin':
+            scoped['patient_id'] = int(user_id)
+        return scoped
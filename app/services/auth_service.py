@@ -1,7 +1,8 @@
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from app.repositories.user_repository import UserRepository
-from app.security.utils import hash_password, verify_password
-from app.security.jwt import generate_token
+from app.security.password_hasher import HashingBusy
+from app.security.utils import hash_password, password_needs_rehash, verify_password
+from app.security.jwt_handler import decode_refresh_token, issue_token_pair, revoke_session, rotate_refresh_token
 from app.models.user import User, UserRole
 
 class AuthService:
@@ -35,10 +36,10 @@ class AuthService:
         new_user = self.user_repository.create(**data)
         return True, "User created successfully", new_user
 
-    def login_user(self, data: dict) -> Tuple[bool, str, Optional[str]]:
+    def login_user(self, data: dict) -> Tuple[bool, str, Optional[Dict[str, str]]]:
         """
         Authenticates a user.
-        Returns: (success, message, token)
+        Returns: (success, message, {'token': access_token, 'refresh_token': refresh_token})
         """
         user = self.user_repository.get_by_email(data['email'])
         
@@ -47,6 +48,40 @@ class AuthService:
             
         if not verify_password(user.password_hash, data['password']):
             return False, "Invalid credentials", None
+
+        if password_needs_rehash(user.password_hash):
+            self._upgrade_password_hash(user, data['password'])
             
-        token = generate_token(user.id, user.role.value)
-        return True, "Login successful", token
+        tokens = issue_token_pair(user.id, user.role.value)
+        return True, "Login successful", tokens
+
+    def _upgrade_password_hash(self, user: User, password: str) -> None:
+        """Re-hash with the configured parameters; skipped (retried next login) when the pool is busy."""
+        try:
+            self.user_repository.update(user, password_hash=hash_password(password))
+        except HashingBusy:
+            pass
+
+    def refresh_tokens(self, refresh_token: str) -> Tuple[bool, str, Optional[Dict[str, str]]]:
+        """
+        Exchanges a refresh token for a new token pair (the old refresh token is spent).
+        Returns: (success, message, tokens)
+        """
+        claims = decode_refresh_token(refresh_token)
+        if not claims:
+            return False, "Invalid refresh token", None
+
+        # Reload the user so deactivation and role changes apply at the next refresh
+        user = self.user_repository.get_by_id(int(claims['sub']))
+        if not user or not user.is_active:
+            revoke_session(claims)
+            return False, "Invalid refresh token", None
+
+        tokens = rotate_refresh_token(claims, user.role.value)
+        if not tokens:
+            return False, "Refresh token already used or revoked", None
+        return True, "Token refreshed", tokens
+
+    def logout(self, claims: Dict[str, Any]) -> None:
+        """Revokes the access and refresh tokens of the caller's login session."""
+        revoke_session(claims)
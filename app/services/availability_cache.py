@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.repositories.availability_repository import AvailabilityRepository
+from app.repositories.data_version_repository import DataVersionRepository
+from app.services.slot_engine import DayTemplate, WeekTemplates, build_week_templates
+
+# DataVersion counter bumped by every availability write.
+AVAILABILITY_VERSION = "doctor_availabilities"
+
+
+class AvailabilityCache:
+    """
+    In-process LRU + TTL cache of parsed weekly availability templates per doctor.
+
+    Entries hold all seven days, so a per-day lookup and a slot search share one load.
+    Consistency across worker processes relies on the `doctor_availabilities`
+    DataVersion counter: at most once every `version_check_interval` seconds the
+    cache reads it and drops everything when another worker has written since.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        version_check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, Tuple[float, WeekTemplates]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._version_checked_at = float("-inf")
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def init_app(self, app) -> None:
+        self.maxsize = app.config.get('AVAILABILITY_CACHE_SIZE', self.maxsize)
+        self.ttl = app.config.get('AVAILABILITY_CACHE_TTL', self.ttl)
+        self.version_check_interval = app.config.get(
+            'AVAILABILITY_CACHE_VERSION_CHECK_INTERVAL', self.version_check_interval
+        )
+        self.clear()
+
+    def get_week(self, doctor_id: int) -> WeekTemplates:
+        now = self._clock()
+        self._sync_version(now)
+
+        with self._lock:
+            entry = self._entries.get(doctor_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(doctor_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        week = build_week_templates(AvailabilityRepository.find_by_doctor_id(doctor_id))
+
+        with self._lock:
+            self._entries[doctor_id] = (now + self.ttl, week)
+            self._entries.move_to_end(doctor_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return week
+
+    def get_day(self, doctor_id: int, day_of_week: int) -> Optional[DayTemplate]:
+        """Parsed template for one weekday, None when the doctor is not available that day."""
+        return self.get_week(doctor_id)[day_of_week]
+
+    def invalidate(self, doctor_id: int) -> None:
+        """Drop a doctor's entry in this process. Call after the write has committed."""
+        # Token subjects are strings, while lookups use the integer doctor id
+        doctor_id = int(doctor_id)
+        with self._lock:
+            self._entries.pop(doctor_id, None)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            self._version_checked_at = float("-inf")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+    def _sync_version(self, now: float) -> None:
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        version = DataVersionRepository.get(AVAILABILITY_VERSION)
+        with self._lock:
+            self._version_checked_at = now
+            if version != self._version:
+                if self._version is not None:
+                    self._entries.clear()
+                    self.invalidations += 1
+                self._version = version
+
+
+availability_cache = AvailabilityCache()
@@ -1,10 +1,34 @@
+import heapq
+from datetime import date, timedelta
+from itertools import islice
 from typing import List
 from app.models.doctor import DoctorAvailability
+from app.db.unit_of_work import unit_of_work
 from app.repositories.availability_repository import AvailabilityRepository
+from app.repositories.appointment_repository import AppointmentRepository
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.read_models import AvailabilityRecord
+from app.services.availability_cache import AVAILABILITY_VERSION, availability_cache
+from app.services.interval_index import IntervalIndex
+from app.services.slot_engine import (
+    BookedWindowLoader,
+    Slot,
+    build_week_templates,
+    iter_free_slots,
+    slot_order,
+)
+
+# Upper bound on a single free-slot search window, in days.
+MAX_SLOT_SEARCH_DAYS = 90
+
+# Days of appointments fetched per query when merging a department's slot streams.
+DEPARTMENT_SEARCH_WINDOW_DAYS = 7
 
 class AvailabilityService:
     def __init__(self):
         self.repository = AvailabilityRepository()
+        self.appt_repo = AppointmentRepository()
+        self.version_repo = DataVersionRepository()
 
     def create_availability(self, doctor_id: int, data: dict) -> DoctorAvailability:
         # Check if slot already exists for this day (simple logic: one slot per day per doctor for now, as per simple requirement interpretation or we can allow multiple if logic permits)
@@ -12,25 +36,81 @@ class AvailabilityService:
         # Let's check for existing availability on that day to prevent duplicates or update it.
         # For simplicity in this assignment, let's assume one availability block per day.
         
-        existing = self.repository.find_by_doctor_and_day(doctor_id, data['day_of_week'])
-        if existing:
-            # Update existing
-            existing.start_time = data['start_time']
-            existing.end_time = data['end_time']
-            existing.slot_duration_minutes = data.get('slot_duration_minutes', 30)
-            existing.is_active = data.get('is_active', True)
-            self.repository.create(existing) # save (add/commit)
-            return existing
-
-        availability = DoctorAvailability(
-            doctor_id=doctor_id,
-            day_of_week=data['day_of_week'],
-            start_time=data['start_time'],
-            end_time=data['end_time'],
-            slot_duration_minutes=data.get('slot_duration_minutes', 30),
-            is_active=data.get('is_active', True)
+        with unit_of_work():
+            # Bumped in the same transaction so other workers drop their cached templates
+            self.version_repo.bump(AVAILABILITY_VERSION)
+
+            availability = self.repository.find_by_doctor_and_day(doctor_id, data['day_of_week'])
+            if availability:
+                # Update existing
+                availability.start_time = data['start_time']
+                availability.end_time = data['end_time']
+                availability.slot_duration_minutes = data.get('slot_duration_minutes', 30)
+                availability.is_active = data.get('is_active', True)
+                self.repository.create(availability) # save (add/flush)
+            else:
+                availability = DoctorAvailability(
+                    doctor_id=doctor_id,
+                    day_of_week=data['day_of_week'],
+                    start_time=data['start_time'],
+                    end_time=data['end_time'],
+                    slot_duration_minutes=data.get('slot_duration_minutes', 30),
+                    is_active=data.get('is_active', True)
+                )
+                self.repository.create(availability)
+        # After the commit, so this worker cannot re-cache the old rows
+        availability_cache.invalidate(doctor_id)
+        return availability
+
+    def get_doctor_availability(self, doctor_id: int) -> List[AvailabilityRecord]:
+        return self.repository.find_records_by_doctor_id(doctor_id)
+
+    def find_free_slots(self, doctor_id: int, start_date: date, end_date: date) -> List[Slot]:
+        """
+        Expand the doctor's weekly templates into concrete slots between two dates
+        (inclusive) and drop the ones overlapping an active appointment.
+        Templates come from the availability cache; booked intervals take one query.
+        """
+        if end_date < start_date:
+            raise ValueError("'to' must not be before 'from'.")
+        if (end_date - start_date).days >= MAX_SLOT_SEARCH_DAYS:
+            raise ValueError(f"Search window cannot exceed {MAX_SLOT_SEARCH_DAYS} days.")
+
+        week = availability_cache.get_week(doctor_id)
+        if not any(week):
+            return []
+
+        booked = IntervalIndex.from_rows(
+            self.appt_repo.find_booked_intervals([doctor_id], start_date, end_date)
         )
-        return self.repository.create(availability)
+        return list(iter_free_slots(
+            doctor_id, week, lambda day: booked.day(doctor_id, day), start_date, end_date
+        ))
+
+    def find_earliest_in_department(self, department_id: int, start_date: date, limit: int) -> List[Slot]:
+        """
+        Return the `limit` earliest free slots across every doctor in a department.
+
+        Each doctor's slots are produced lazily and merged through a heap, so only
+        as many days are expanded as needed to fill the result. Booked intervals
+        are loaded for all doctors together, one window of days per query.
+        """
+        availabilities = self.repository.find_by_department(department_id)
+        by_doctor = {}
+        for availability in availabilities:
+            by_doctor.setdefault(availability.doctor_id, []).append(availability)
 
-    def get_doctor_availability(self, doctor_id: int) -> List[DoctorAvailability]:
-        return self.repository.find_by_doctor_id(doctor_id)
+        weeks = {doctor_id: build_week_templates(rows) for doctor_id, rows in by_doctor.items()}
+        weeks = {doctor_id: week for doctor_id, week in weeks.items() if any(week)}
+        if not weeks:
+            return []
+
+        end_date = start_date + timedelta(days=MAX_SLOT_SEARCH_DAYS - 1)
+        loader = BookedWindowLoader(
+            self.appt_repo.find_booked_intervals, list(weeks), DEPARTMENT_SEARCH_WINDOW_DAYS
+        )
+        streams = [
+            iter_free_slots(doctor_id, week, loader.for_doctor(doctor_id), start_date, end_date)
+            for doctor_id, week in weeks.items()
+        ]
+        return list(islice(heapq.merge(*streams, key=slot_order), limit))
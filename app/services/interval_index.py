@@ -0,0 +1,105 @@
+"""
+In-memory index of booked intervals. Slot search (SlotEngine and
+AvailabilityService.find_free_slots) checks candidate slots against
+it; bookings themselves are checked by the database (create_if_free).
+"""
+from bisect import bisect_left, insort
+from datetime import date, time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# (start, end) in minutes since midnight, end exclusive.
+Interval = Tuple[int, int]
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def time_to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def end_to_minutes(value: time) -> int:
+    """Like time_to_minutes for the end of an interval: 00:00 ends the day, minute 1440."""
+    return time_to_minutes(value) or MINUTES_PER_DAY
+
+
+class DayIntervals:
+    """
+    Booked intervals of one doctor on one day, sorted by start.
+
+    Alongside the starts it keeps a running maximum of the ends, so an overlap
+    check is a single bisect: [start, end) overlaps something iff among the
+    intervals starting before `end` the largest end is after `start`. This stays
+    correct even if legacy data already contains overlapping appointments.
+    """
+    __slots__ = ('_intervals', '_starts', '_max_ends')
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        self._intervals: List[Interval] = sorted(intervals)
+        self._reindex()
+
+    def _reindex(self) -> None:
+        self._starts = [start for start, _ in self._intervals]
+        self._max_ends = []
+        running = -1
+        for _, end in self._intervals:
+            running = max(running, end)
+            self._max_ends.append(running)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """O(log n) check whether [start, end) intersects any booked interval."""
+        index = bisect_left(self._starts, end)
+        return index > 0 and self._max_ends[index - 1] > start
+
+    def add(self, start: int, end: int) -> None:
+        insort(self._intervals, (start, end))
+        self._reindex()
+
+    def __iter__(self) -> Iterator[Interval]:
+        return iter(self._intervals)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+
+EMPTY_DAY = DayIntervals()
+
+
+class IntervalIndex:
+    """Booked intervals per (doctor_id, date), shared by slot search and conflict checks."""
+
+    def __init__(self):
+        self._days: Dict[Tuple[int, date], DayIntervals] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, date, time, time]]) -> "IntervalIndex":
+        index = cls()
+        index.load(rows)
+        return index
+
+    def load(self, rows: Iterable[Tuple[int, date, time, time]]) -> None:
+        """Add (doctor_id, date, start_time, end_time) rows."""
+        grouped: Dict[Tuple[int, date], List[Interval]] = {}
+        for doctor_id, day, start_time, end_time in rows:
+            grouped.setdefault((doctor_id, day), []).append(
+                (time_to_minutes(start_time), end_to_minutes(end_time))
+            )
+        for key, intervals in grouped.items():
+            existing = self._days.get(key)
+            if existing is not None:
+                intervals.extend(existing)
+            self._days[key] = DayIntervals(intervals)
+
+    def day(self, doctor_id: int, day: date) -> DayIntervals:
+        return self._days.get((doctor_id, day), EMPTY_DAY)
+
+    def overlaps(self, doctor_id: int, day: date, start_time: time, end_time: time) -> bool:
+        return self.day(doctor_id, day).overlaps(time_to_minutes(start_time), end_to_minutes(end_time))
+
+    def add(self, doctor_id: int, day: date, start_time: time, end_time: time) -> None:
+        key = (doctor_id, day)
+        if key not in self._days:
+            self._days[key] = DayIntervals()
+        self._days[key].add(time_to_minutes(start_time), end_to_minutes(end_time))
+
+    def items(self) -> Iterator[Tuple[Tuple[int, date], DayIntervals]]:
+        return iter(self._days.items())
@@ -0,0 +1,166 @@
+from datetime import date, time, timedelta
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.models.doctor import DoctorAvailability
+from app.services.interval_index import Interval, IntervalIndex, time_to_minutes
+
+
+class Slot(NamedTuple):
+    """A concrete, bookable slot for a doctor."""
+    doctor_id: int
+    date: date
+    start_time: time
+    end_time: time
+
+
+class DayTemplate(NamedTuple):
+    """
+    Parsed availability for one weekday.
+    Times are minutes since midnight so slot arithmetic stays integer-only.
+    """
+    start: int
+    end: int
+    step: int
+    slot_count: int
+
+
+# One entry per weekday (0=Monday), None when the doctor does not work that day.
+WeekTemplates = Tuple[Optional[DayTemplate], ...]
+
+def parse_hhmm(value: str) -> int:
+    """
+    Convert an "HH:MM" availability string to minutes since midnight.
+    "24:00" is the end of the day (1440); anything else out of range raises ValueError.
+    """
+    hours, minutes = (int(part) for part in value.split(":"))
+    if not (0 <= hours <= 23 and 0 <= minutes <= 59) and (hours, minutes) != (24, 0):
+        raise ValueError(f"Invalid time '{value}', expected HH:MM between 00:00 and 24:00")
+    return hours * 60 + minutes
+
+
+def minutes_to_time(value: int) -> time:
+    """Minutes since midnight as a time; 1440, the end of the day, is 00:00 like a stored end_time."""
+    return time(value // 60 % 24, value % 60)
+
+
+def format_hhmm(value: int) -> str:
+    """Inverse of parse_hhmm."""
+    return f"{value // 60:02d}:{value % 60:02d}"
+
+
+def build_day_template(availability: DoctorAvailability) -> Optional[DayTemplate]:
+    if not availability.is_active:
+        return None
+    start = parse_hhmm(availability.start_time)
+    end = parse_hhmm(availability.end_time)
+    step = availability.slot_duration_minutes
+    slot_count = max(0, (end - start) // step)
+    if not slot_count:
+        return None
+    return DayTemplate(start, end, step, slot_count)
+
+
+def build_week_templates(availabilities: Iterable[DoctorAvailability]) -> WeekTemplates:
+    """
+    Index a doctor's availability rows by weekday.
+    Only the first row per day is used, matching AvailabilityRepository.find_by_doctor_and_day.
+    """
+    week: List[Optional[DayTemplate]] = [None] * 7
+    seen = set()
+    for availability in availabilities:
+        if availability.day_of_week in seen:
+            continue
+        seen.add(availability.day_of_week)
+        week[availability.day_of_week] = build_day_template(availability)
+    return tuple(week)
+
+
+def free_mask(template: DayTemplate, booked: Iterable[Interval]) -> int:
+    """
+    Bitset of free slot indices for one day: bit i is set when slot i is free.
+    Every booked interval clears the bits of the slots it overlaps, so an
+    appointment that is not aligned to the slot grid blocks both neighbours.
+    """
+    mask = (1 << template.slot_count) - 1
+    for booked_start, booked_end in booked:
+        first = max(0, (booked_start - template.start) // template.step)
+        last = min(template.slot_count, -(-(booked_end - template.start) // template.step)) - 1
+        if first <= last:
+            mask &= ~(((1 << (last - first + 1)) - 1) << first)
+    return mask
+
+
+def iter_day_slots(doctor_id: int, day: date, template: DayTemplate, mask: int) -> Iterator[Slot]:
+    """Yield the slots of a free mask in chronological order."""
+    while mask:
+        lowest = mask & -mask
+        index = lowest.bit_length() - 1
+        start = template.start + index * template.step
+        yield Slot(doctor_id, day, minutes_to_time(start), minutes_to_time(start + template.step))
+        mask ^= lowest
+
+
+def iter_free_slots(
+    doctor_id: int,
+    week: WeekTemplates,
+    booked_for: Callable[[date], Iterable[Interval]],
+    start_date: date,
+    end_date: date,
+) -> Iterator[Slot]:
+    """
+    Lazily expand weekly templates into free slots between two dates (inclusive).
+    `booked_for(day)` returns the doctor's active appointment intervals on that day.
+    """
+    day = start_date
+    one_day = timedelta(days=1)
+    while day <= end_date:
+        template = week[day.weekday()]
+        if template is not None:
+            mask = free_mask(template, booked_for(day))
+            if mask:
+                yield from iter_day_slots(doctor_id, day, template, mask)
+        day += one_day
+
+
+class BookedWindowLoader:
+    """
+    Loads booked intervals for a fixed set of doctors one window of days at a time.
+    All doctors share each window query, so lazily merged slot streams cost
+    one query per window instead of one per doctor.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Sequence[int], date, date], Iterable[Tuple[int, date, time, time]]],
+        doctor_ids: Sequence[int],
+        window_days: int = 7,
+    ):
+        self._fetch = fetch
+        self._doctor_ids = doctor_ids
+        self._window = timedelta(days=window_days)
+        self._loaded_from: Optional[date] = None
+        self._loaded_until: Optional[date] = None
+        self._booked = IntervalIndex()
+
+    def booked(self, doctor_id: int, day: date) -> Iterable[Interval]:
+        if self._loaded_from is None:
+            self._load(day)
+        while day > self._loaded_until:
+            self._load(self._loaded_until + timedelta(days=1))
+        return self._booked.day(doctor_id, day)
+
+    def for_doctor(self, doctor_id: int) -> Callable[[date], Iterable[Interval]]:
+        return lambda day: self.booked(doctor_id, day)
+
+    def _load(self, start: date) -> None:
+        end = start + self._window - timedelta(days=1)
+        self._booked.load(self._fetch(self._doctor_ids, start, end))
+        if self._loaded_from is None:
+            self._loaded_from = start
+        self._loaded_until = end
+
+
+def slot_order(slot: Slot) -> Tuple[date, time, int]:
+    """Chronological ordering key used when merging several doctors' slot streams."""
+    return slot.date, slot.start_time, slot.doctor_id
+
@@ -0,0 +1,60 @@
+import logging
+import time
+
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.models.base import db
+
+logger = logging.getLogger(__name__)
+
+
+def prepare_app(app: Flask) -> None:
+    """
+    One-time work done in the master before forking, so workers share it
+    copy-on-write: configure all mappers. The schemas the controllers dump
+    through are already built (and compiled) when create_app imports them.
+    """
+    with app.app_context():
+        configure_mappers()
+
+
+def warm_up_worker(app: Flask, connections: int) -> None:
+    """
+    Run in each worker after fork, before it accepts requests: drop pooled
+    connections inherited from the master and open `connections` fresh ones per
+    engine, so the first requests do not pay for connect + authentication.
+    A database that is down is logged, not fatal; the pool retries on demand.
+    """
+    started = time.perf_counter()
+    with app.app_context():
+        for engine in db.engines.values():
+            # Connections opened before fork must never be used by two processes
+            engine.dispose(close=False)
+        for name, engine in db.engines.items():
+            pool_size = engine.pool.size() if hasattr(engine.pool, 'size') else 1
+            opened = []
+            try:
+                for _ in range(min(connections, pool_size)):
+                    connection = engine.connect()
+                    connection.execute(text("SELECT 1"))
+                    opened.append(connection)
+            except Exception as e:
+                logger.warning(f"Warm-up could not connect to '{name or 'primary'}': {str(e)}")
+            finally:
+                # Returned to the pool, where they stay open for the first requests
+                for connection in opened:
+                    connection.close()
+    logger.info(f"Worker warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+
+def shutdown_worker(app: Flask) -> None:
+    """Release process-level resources once the worker has drained its requests."""
+    from app.security.password_hasher import password_hasher
+
+    password_hasher.shutdown()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+
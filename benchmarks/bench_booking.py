@@ -0,0 +1,140 @@
+"""
+Booking throughput: legacy three-round-trip path vs the single-statement insert.
+
+    python -m benchmarks.bench_booking --workers 16 --slots 2000 --contention 3
+
+Every slot is requested `contention` times by concurrent clients, so both paths
+see the same mix of successful bookings and conflicts. Each mode runs on its
+own fresh database.
+"""
+import argparse
+import itertools
+import random
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from benchmarks.common import make_app, percentiles, print_table, run_concurrently
+
+
+def seed(db, doctors: int, patients: int):
+    from app.models.doctor import DoctorAvailability
+    from app.models.user import User, UserRole
+
+    suffix = random.getrandbits(32)
+    doctor_rows = [
+        User(email=f'bench-doc-{suffix}-{i}@example.com', password_hash='x', name=f'Doctor {i}', role=UserRole.DOCTOR)
+        for i in range(doctors)
+    ]
+    patient_rows = [
+        User(email=f'bench-pat-{suffix}-{i}@example.com', password_hash='x', name=f'Patient {i}', role=UserRole.MEMBER)
+        for i in range(patients)
+    ]
+    db.session.add_all(doctor_rows + patient_rows)
+    db.session.flush()
+    for doctor in doctor_rows:
+        for day in range(7):
+            db.session.add(DoctorAvailability(
+                doctor_id=doctor.id, day_of_week=day, start_time='08:00', end_time='18:00', slot_duration_minutes=30
+            ))
+    db.session.commit()
+    return [d.id for d in doctor_rows], [p.id for p in patient_rows]
+
+
+def build_requests(doctor_ids, patient_ids, slots: int, contention: int):
+    start_day = date.today() + timedelta(days=1)
+    grid = itertools.product(range(365), doctor_ids, range(20))
+    unique_slots = []
+    for day_offset, doctor_id, index in itertools.islice(grid, slots):
+        start = datetime.combine(date.min, time(8)) + timedelta(minutes=30 * index)
+        unique_slots.append((doctor_id, start_day + timedelta(days=day_offset), start.time()))
+    requests = [
+        {'patient_id': random.choice(patient_ids), 'doctor_id': d, 'date': day, 'start_time': t}
+        for d, day, t in unique_slots
+        for _ in range(contention)
+    ]
+    random.shuffle(requests)
+    return requests
+
+
+def legacy_book(data):
+    """The booking path before the single-statement insert, kept for comparison."""
+    from app.models.appointment import Appointment, AppointmentStatus
+    from app.models.base import db
+    from app.repositories.appointment_repository import AppointmentRepository
+    from app.repositories.availability_repository import AvailabilityRepository
+
+    availability = AvailabilityRepository.find_by_doctor_and_day(data['doctor_id'], data['date'].weekday())
+    if not availability or not availability.is_active:
+        return 'unavailable'
+    avail_start = datetime.strptime(availability.start_time, "%H:%M").time()
+    avail_end = datetime.strptime(availability.end_time, "%H:%M").time()
+    end_time = (datetime.combine(data['date'], data['start_time'])
+                + timedelta(minutes=availability.slot_duration_minutes)).time()
+    if data['start_time'] < avail_start or end_time > avail_end:
+        return 'unavailable'
+    if AppointmentRepository.find_conflicting_appointment(data['doctor_id'], data['date'], data['start_time']):
+        return 'conflict'
+    try:
+        AppointmentRepository.create(Appointment(
+            patient_id=data['patient_id'], doctor_id=data['doctor_id'], date=data['date'],
+            start_time=data['start_time'], end_time=end_time, status=AppointmentStatus.SCHEDULED
+        ))
+    except IntegrityError:
+        db.session.rollback()
+        return 'conflict'
+    return 'booked'
+
+
+def atomic_book(data):
+    from app.services.appointment_service import AppointmentService
+
+    try:
+        AppointmentService().book_appointment(data['patient_id'], dict(data))
+    except ValueError as e:
+        return 'conflict' if 'already booked' in str(e) else 'unavailable'
+    return 'booked'
+
+
+def run_mode(name, book, args):
+    from app.models.base import db
+
+    app = make_app()
+    with app.app_context():
+        doctor_ids, patient_ids = seed(db, args.doctors, args.patients)
+    requests = build_requests(doctor_ids, patient_ids, args.slots, args.contention)
+
+    def call(data):
+        with app.app_context():
+            try:
+                return book(data)
+            finally:
+                db.session.remove()
+
+    wall, results = run_concurrently(call, requests, args.workers)
+    outcomes = [r for _, r in results]
+    return {
+        'mode': name,
+        'requests': len(requests),
+        'booked': outcomes.count('booked'),
+        'conflicts': outcomes.count('conflict'),
+        'bookings/sec': round(len(requests) / wall, 1),
+        **percentiles([latency for latency, _ in results]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--slots', type=int, default=1000, help='distinct slots requested')
+    parser.add_argument('--contention', type=int, default=3, help='concurrent requests per slot')
+    parser.add_argument('--doctors', type=int, default=10)
+    parser.add_argument('--patients', type=int, default=50)
+    args = parser.parse_args()
+
+    random.seed(1234)
+    print_table([run_mode('legacy', legacy_book, args), run_mode('atomic', atomic_book, args)])
+
+
+if __name__ == '__main__':
+    main()
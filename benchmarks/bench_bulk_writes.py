@@ -0,0 +1,75 @@
+"""
+Write throughput: per-row commits vs one unit of work vs bulk statements.
+
+    python -m benchmarks.bench_bulk_writes --rows 10000
+
+Inserts departments through BaseRepository.create with a commit per row, the
+same calls inside one unit_of_work, bulk_create and bulk_upsert, then updates
+them row by row and with bulk_update. The table is emptied between modes.
+"""
+import argparse
+import time
+
+from benchmarks.common import make_app, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    from app.db.unit_of_work import unit_of_work
+    from app.models.base import db
+    from app.models.department import Department
+    from app.repositories.department_repository import DepartmentRepository
+
+    app = make_app()
+    repository = DepartmentRepository()
+    rows = [{'name': f'Bench department {i}', 'description': 'Outpatient clinic'} for i in range(args.rows)]
+
+    def per_row():
+        for row in rows:
+            repository.create(**row)
+
+    def one_unit():
+        with unit_of_work():
+            for row in rows:
+                repository.create(**row)
+
+    def update_per_row():
+        # As a service would: load, change, commit. Holding all instances instead
+        # makes every commit expire all of them and the loop quadratic.
+        for id in db.session.execute(db.select(Department.id)).scalars().all():
+            repository.update(repository.get_by_id(id), description='Updated')
+
+    def update_bulk():
+        ids = db.session.execute(db.select(Department.id)).scalars().all()
+        repository.bulk_update([{'id': id, 'description': 'Updated'} for id in ids])
+
+    results = []
+    with app.app_context():
+        for label, operation, fresh in (
+            ('create, commit per row', per_row, True),
+            ('create in unit_of_work', one_unit, True),
+            ('bulk_create', lambda: repository.bulk_create(rows), True),
+            ('bulk_upsert (all new)', lambda: repository.bulk_upsert(rows, ['name']), True),
+            ('bulk_upsert (all existing)', lambda: repository.bulk_upsert(rows, ['name']), False),
+            ('update, commit per row', update_per_row, False),
+            ('bulk_update', update_bulk, False),
+        ):
+            if fresh:
+                db.session.execute(db.delete(Department))
+                db.session.commit()
+            db.session.expunge_all()
+            started = time.perf_counter()
+            operation()
+            elapsed = time.perf_counter() - started
+            results.append({'mode': label, 'rows': args.rows, 'seconds': round(elapsed, 3),
+                            'rows/sec': round(args.rows / elapsed)})
+        db.session.execute(db.delete(Department))
+        db.session.commit()
+    print_table(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Login throughput and latency of other endpoints during a login storm.
+
+    python -m benchmarks.bench_password_hashing --logins 200 --workers 16 --hash-workers 2
+
+Runs the same storm of POST /auth/login calls with hashing inline in the
+request threads and on the hashing process pool, while one client keeps
+probing a cheap authenticated endpoint. Logins rejected with 503 (pool
+saturated) are counted separately.
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.common import make_app, percentiles, print_table, run_concurrently
+
+PASSWORD = 'benchmark-password'
+
+
+def run_mode(name, args, hash_workers):
+    from app.security.password_hasher import password_hasher
+
+    app = make_app()
+    app.config.update(
+        PASSWORD_HASH_METHOD=args.method,
+        PASSWORD_HASH_WORKERS=hash_workers,
+        PASSWORD_HASH_QUEUE_DEPTH=args.queue_depth,
+    )
+    password_hasher.init_app(app)
+    client = app.test_client()
+    client.post('/auth/register', json={'email': 'storm@example.com', 'password': PASSWORD, 'name': 'Storm'})
+    token = client.post('/auth/login', json={'email': 'storm@example.com', 'password': PASSWORD}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    probes = []
+    done = threading.Event()
+
+    def probe():
+        probe_client = app.test_client()
+        while not done.is_set():
+            started = time.perf_counter()
+            probe_client.get('/api/appointments', headers=headers)
+            probes.append(time.perf_counter() - started)
+            time.sleep(0.005)
+
+    def login(_):
+        return app.test_client().post(
+            '/auth/login', json={'email': 'storm@example.com', 'password': PASSWORD}
+        ).status_code
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    try:
+        wall, results = run_concurrently(login, range(args.logins), args.workers)
+    finally:
+        done.set()
+        prober.join()
+        password_hasher.shutdown()
+
+    ok = [latency for latency, status in results if status == 200]
+    rejected = sum(1 for _, status in results if status == 503)
+    login_p = percentiles(ok)
+    probe_p = percentiles(probes)
+    return {
+        'mode': name,
+        'logins/sec': round(len(ok) / wall, 1),
+        'rejected': rejected,
+        'login p50': login_p['p50'],
+        'login p99': login_p['p99'],
+        'probe p50': probe_p['p50'],
+        'probe p99': probe_p['p99'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--hash-workers', type=int, default=2, help='hashing pool processes')
+    parser.add_argument('--queue-depth', type=int, default=16)
+    parser.add_argument('--method', default='scrypt')
+    args = parser.parse_args()
+
+    print_table([
+        run_mode('inline', args, 0),
+        run_mode(f'pool({args.hash_workers})', args, args.hash_workers),
+    ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Appointment listing: ORM entities vs AppointmentRecord read models.
+
+    python -m benchmarks.bench_read_models --rows 100000 --repeat 3
+
+Loads every appointment (with patient and doctor names) both ways and reports
+query + hydration latency, latency including the list dump, and the memory
+held by the loaded rows, measured with tracemalloc and scaled to 100k rows.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import date, datetime, time as dt_time, timedelta
+
+from benchmarks.common import make_app, print_table
+
+
+def seed(rows: int) -> None:
+    from app.models.appointment import Appointment, AppointmentStatus
+    from app.models.base import db
+    from app.models.user import User, UserRole
+
+    if db.session.execute(db.select(db.func.count(Appointment.id))).scalar() >= rows:
+        return
+    now = datetime.utcnow()
+    db.session.execute(db.insert(User), [
+        {'id': i, 'email': f'user{i}@bench.local', 'password_hash': '-', 'name': f'User {i}',
+         'role': UserRole.DOCTOR if i <= 100 else UserRole.MEMBER, 'is_active': True,
+         'created_at': now, 'updated_at': now}
+        for i in range(1, 1101)
+    ])
+    statuses = list(AppointmentStatus)
+    db.session.execute(db.insert(Appointment), [
+        {'patient_id': 101 + i % 1000, 'doctor_id': 1 + i % 100,
+         'date': date(2024, 1, 1) + timedelta(days=i // 1600), 'start_time': dt_time(8 + i // 100 % 16),
+         'end_time': dt_time(8 + i // 100 % 16, 30), 'status': statuses[i % 3], 'reason': None,
+         'created_at': now, 'updated_at': now}
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def load_entities():
+    """The listing query before read models: full entities plus joined-loaded users."""
+    from sqlalchemy.orm import joinedload
+
+    from app.models.appointment import Appointment
+    from app.models.base import db
+    from app.models.user import User
+
+    return db.session.execute(db.select(Appointment).options(
+        joinedload(Appointment.patient).load_only(User.name),
+        joinedload(Appointment.doctor).load_only(User.name),
+    )).scalars().all()
+
+
+def load_records():
+    from app.repositories.appointment_repository import AppointmentRepository
+
+    return AppointmentRepository.find_all()
+
+
+def measure(load, dump, repeat: int):
+    from app.models.base import db
+
+    latencies, with_dump = [], []
+    for _ in range(repeat):
+        db.session.remove()
+        gc.collect()
+        started = time.perf_counter()
+        rows = load()
+        latencies.append(time.perf_counter() - started)
+        dump(rows)
+        with_dump.append(time.perf_counter() - started)
+        del rows
+
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    rows = load()
+    held = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, 'filename'))
+    tracemalloc.stop()
+    return len(rows), min(latencies), min(with_dump), held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    from app.controllers.appointment_controller import appointments_schema
+
+    app = make_app()
+    results = []
+    with app.app_context():
+        seed(args.rows)
+        for label, load in (('orm entities', load_entities), ('read models', load_records)):
+            count, latency, total, held = measure(load, appointments_schema.dump, args.repeat)
+            results.append({
+                'path': label, 'rows': count,
+                'load ms': round(latency * 1000, 1), 'load + dump ms': round(total * 1000, 1),
+                'MiB per 100k rows': round(held / count * 100000 / 2 ** 20, 1),
+                'bytes/row': round(held / count),
+            })
+    print_table(results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+List-endpoint serialization: marshmallow + stdlib jsonify vs compiled schemas + orjson.
+
+    python -m benchmarks.bench_serialization --rows 10000 --repeat 5
+
+Serializes in-memory appointments and departments (no database involved), so
+the numbers are schema dump plus JSON encoding only. Both paths must produce
+the same response bytes; the script fails if they do not.
+"""
+import argparse
+import gc
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from benchmarks.common import make_app, print_table
+
+
+def build_rows(count: int):
+    from app.models.appointment import Appointment, AppointmentStatus
+    from app.models.department import Department
+    from app.models.user import User, UserRole
+
+    doctors = [User(id=i, name=f"Dr. Müller {i}", email=f"d{i}@x.com", role=UserRole.DOCTOR) for i in range(50)]
+    patients = [User(id=1000 + i, name=f"Patient {i}", email=f"p{i}@x.com", role=UserRole.MEMBER) for i in range(500)]
+    statuses = list(AppointmentStatus)
+    start = date(2025, 1, 6)
+    appointments = []
+    for i in range(count):
+        begins = dt_time(9 + i % 8, 30 * (i % 2))
+        appointments.append(Appointment(
+            id=i + 1,
+            patient_id=patients[i % 500].id, patient=patients[i % 500],
+            doctor_id=doctors[i % 50].id, doctor=doctors[i % 50],
+            date=start + timedelta(days=i // 400), start_time=begins,
+            end_time=dt_time(begins.hour, begins.minute + 29),
+            status=statuses[i % 3], reason=None if i % 4 else f"Follow-up #{i}",
+        ))
+    created = datetime(2025, 1, 1, 8, 0, 0, 123456)
+    departments = [
+        Department(id=i + 1, name=f"Department {i}", description="Outpatient clinic", is_active=True,
+                   created_at=created, updated_at=created)
+        for i in range(count)
+    ]
+    return appointments, departments
+
+
+def best_of(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    from flask.json.provider import DefaultJSONProvider
+
+    from app.schemas.appointment_schema import AppointmentSchema
+    from app.schemas.department_schema import DepartmentSchema
+    from app.serialization import compile_schema
+
+    app = make_app()
+    app.debug = False
+    stdlib = DefaultJSONProvider(app)
+    rows = []
+    with app.app_context():
+        appointments, departments = build_rows(args.rows)
+        for label, schema_class, objects in (
+            ('appointments', AppointmentSchema, appointments),
+            ('departments', DepartmentSchema, departments),
+        ):
+            schema = schema_class(many=True)
+            compiled = compile_schema(schema_class(many=True))
+
+            def baseline():
+                return stdlib.response(schema.dump(objects)).get_data()
+
+            def fast():
+                return app.json.response(compiled.dump(objects)).get_data()
+
+            if baseline() != fast():
+                raise SystemExit(f"{label}: compiled output differs from marshmallow + jsonify")
+
+            dump_old = best_of(lambda: schema.dump(objects), args.repeat)
+            dump_new = best_of(lambda: compiled.dump(objects), args.repeat)
+            total_old = best_of(baseline, args.repeat)
+            total_new = best_of(fast, args.repeat)
+            rows.append({
+                'payload': label, 'rows': len(objects), 'bytes': len(fast()),
+                'dump ms (mm)': round(dump_old * 1000, 1), 'dump ms (compiled)': round(dump_new * 1000, 1),
+                'total ms (mm + json)': round(total_old * 1000, 1),
+                'total ms (compiled + orjson)': round(total_new * 1000, 1),
+                'speedup': f"{total_old / total_new:.1f}x",
+            })
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Cold-start cost of the application: import time, create_app() time and per-module import cost.
+
+    python -m benchmarks.bench_startup --runs 10 --top 15
+
+Every run is a fresh interpreter, so numbers include all imports. Per-module
+costs come from `python -X importtime` and are summed per package (self time),
+plus the app's own modules individually. With --budget-ms the script exits
+non-zero when the median cold start exceeds the budget, so it can gate CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from benchmarks.common import ROOT, print_table
+
+STARTUP_SNIPPET = """
+import time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app({profile!r})
+created = time.perf_counter()
+print(imported - started, created - imported)
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    env['PYTHONDONTWRITEBYTECODE'] = ''
+    return env
+
+
+def cold_starts(runs: int, profile: str):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SNIPPET.format(profile=profile)],
+            cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+        ).stdout.split()
+        samples.append((float(output[-2]), float(output[-1])))
+    return samples
+
+
+def import_costs(profile: str):
+    """Self import time in microseconds per module, from one -X importtime run."""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'from app import create_app; create_app({profile!r})'],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    ).stderr
+    costs = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        costs[name.strip()] = (int(self_us), int(cumulative_us))
+    return costs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--profile', default='development', help='APP_ENV profile passed to create_app')
+    parser.add_argument('--budget-ms', type=float, help='fail when the median cold start exceeds this')
+    args = parser.parse_args()
+
+    samples = cold_starts(args.runs, args.profile)
+    imports = [i * 1000 for i, _ in samples]
+    creates = [c * 1000 for _, c in samples]
+    totals = [i + c for i, c in zip(imports, creates)]
+    print_table([
+        {'phase': name, 'median ms': round(statistics.median(values), 1), 'min ms': round(min(values), 1),
+         'max ms': round(max(values), 1)}
+        for name, values in (('import app', imports), ('create_app()', creates), ('total', totals))
+    ])
+    print()
+
+    costs = import_costs(args.profile)
+    by_package = defaultdict(int)
+    for name, (self_us, _) in costs.items():
+        by_package[name.split('.')[0]] += self_us
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:args.top]
+    print_table([{'package': name, 'self ms': round(us / 1000, 1)} for name, us in packages])
+    print()
+
+    own = sorted(
+        ((name, cost) for name, cost in costs.items() if name == 'app' or name.startswith('app.')),
+        key=lambda item: item[1][0], reverse=True,
+    )[:args.top]
+    print_table([
+        {'module': name, 'self ms': round(self_us / 1000, 1), 'cumulative ms': round(cumulative_us / 1000, 1)}
+        for name, (self_us, cumulative_us) in own
+    ])
+
+    median = statistics.median(totals)
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"\nCold start {median:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Python-side cost of hot repository queries: statements rebuilt per call vs prebuilt.
+
+    python -m benchmarks.bench_statement_cache --iterations 5000
+
+For each hot finder the "rebuilt" path executes the db.select(...) construct
+the repository used to build on every call; "prebuilt" calls the repository
+method, which now binds parameters into a module-level statement. Per call it reports the total time, the time spent
+inside the DBAPI driver, the Python-side rest (statement construction, cache
+key, compiled-cache lookup, result processing) and how many executions missed
+SQLAlchemy's compiled cache.
+"""
+import argparse
+import time
+from datetime import date, datetime, time as dt_time
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
+
+from benchmarks.common import make_app, print_table
+
+
+def seed():
+    from app.models.base import db
+    from app.models.doctor import DoctorAvailability
+    from app.models.user import User, UserRole
+    from app.repositories.data_version_repository import DataVersionRepository
+
+    now = datetime.utcnow()
+    db.session.execute(db.insert(User), [
+        {'id': i, 'email': f'user{i}@bench.local', 'password_hash': '-', 'name': f'User {i}',
+         'role': UserRole.DOCTOR if i <= 50 else UserRole.MEMBER, 'is_active': True,
+         'created_at': now, 'updated_at': now}
+        for i in range(1, 1001)
+    ])
+    db.session.execute(db.insert(DoctorAvailability), [
+        {'doctor_id': doctor, 'day_of_week': day, 'start_time': '09:00', 'end_time': '17:00',
+         'slot_duration_minutes': 30, 'is_active': True, 'created_at': now, 'updated_at': now}
+        for doctor in range(1, 51) for day in range(5)
+    ])
+    # The migrations create the counter; writes bump it like AvailabilityService does
+    DataVersionRepository.bump('doctor_availabilities')
+    db.session.commit()
+
+
+def rebuilt_statements():
+    """The constructs as the repositories built them before statement caching."""
+    from app.models.appointment import Appointment, AppointmentStatus
+    from app.models.base import db
+    from app.models.data_version import DataVersion
+    from app.models.doctor import DoctorAvailability
+    from app.models.user import User
+
+    def get_by_email(email):
+        return db.select(User).where(User.email == email)
+
+    def find_by_doctor_and_day(doctor_id, day_of_week):
+        return db.select(DoctorAvailability).filter_by(doctor_id=doctor_id, day_of_week=day_of_week)
+
+    def find_conflicting_appointment(doctor_id, appt_date, start_time, end_time):
+        return db.select(Appointment).filter(
+            Appointment.doctor_id == doctor_id,
+            Appointment.date == appt_date,
+            Appointment.start_time < end_time,
+            Appointment.end_time > start_time,
+            Appointment.status != AppointmentStatus.CANCELLED,
+        )
+
+    def data_version(name):
+        return db.select(DataVersion.version).where(DataVersion.name == name)
+
+    return get_by_email, find_by_doctor_and_day, find_conflicting_appointment, data_version
+
+
+def cases():
+    """(name, arguments per iteration, rebuilt statement factory, prebuilt repository call)."""
+    from app.repositories.appointment_repository import AppointmentRepository
+    from app.repositories.availability_repository import AvailabilityRepository
+    from app.repositories.data_version_repository import DataVersionRepository
+    from app.repositories.user_repository import UserRepository
+
+    get_by_email, by_doctor_and_day, conflicting, data_version = rebuilt_statements()
+    users = UserRepository()
+    return [
+        ('get_by_email', lambda i: (f'user{i % 1000 + 1}@bench.local',), get_by_email, users.get_by_email),
+        ('find_by_doctor_and_day', lambda i: (i % 50 + 1, i % 5), by_doctor_and_day,
+         AvailabilityRepository.find_by_doctor_and_day),
+        ('find_conflicting_appointment', lambda i: (i % 50 + 1, date(2025, 1, 6), dt_time(9), dt_time(9, 30)),
+         conflicting, AppointmentRepository.find_conflicting_appointment),
+        ('data_version.get', lambda i: ('doctor_availabilities',), data_version, DataVersionRepository.get),
+    ]
+
+
+class StatementStats:
+    """Counts compiled-cache misses and the time spent inside the DBAPI driver."""
+
+    def __init__(self, engine):
+        self.misses = 0
+        self.driver_seconds = 0.0
+        self._started = 0.0
+        event.listen(engine, 'before_cursor_execute', self._before)
+        event.listen(engine, 'after_cursor_execute', self._after)
+
+    def reset(self):
+        self.misses = 0
+        self.driver_seconds = 0.0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self.driver_seconds += time.perf_counter() - self._started
+        if context.cache_hit is not CACHE_HIT:
+            self.misses += 1
+
+
+def measure(stats: StatementStats, call, iterations: int):
+    """Per-call microseconds: total, spent in the driver, and the Python-side rest."""
+    stats.reset()
+    started = time.perf_counter()
+    for i in range(iterations):
+        call(i)
+    total = (time.perf_counter() - started) / iterations * 1e6
+    driver = stats.driver_seconds / iterations * 1e6
+    return total, driver, total - driver, stats.misses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=5000)
+    args = parser.parse_args()
+
+    from app.models.base import db
+
+    app = make_app()
+    rows = []
+    with app.app_context():
+        seed()
+        stats = StatementStats(db.engine)
+        for name, arguments, rebuilt, prebuilt in cases():
+            before = measure(stats, lambda i: db.session.execute(rebuilt(*arguments(i))).scalars().first(), args.iterations)
+            after = measure(stats, lambda i: prebuilt(*arguments(i)), args.iterations)
+            for label, (total, driver, python, misses) in (('rebuilt', before), ('prebuilt', after)):
+                rows.append({
+                    'query': name, 'statement': label, 'us/call': round(total, 1), 'driver us': round(driver, 1),
+                    'python us': round(python, 1), 'compiled cache misses': misses,
+                })
+        db.session.rollback()
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Per-request overhead of @token_required, with and without the verified-token cache.
+
+    python -m benchmarks.bench_token_required --iterations 20000
+
+Calls a trivial decorated view inside one request context, so the numbers are
+the decorator's own cost: header parsing, token verification and `g` updates.
+"""
+import argparse
+import time
+
+from benchmarks.common import make_app, print_table
+
+
+def measure(app, token: str, iterations: int) -> float:
+    from app.security.decorators import token_required
+
+    @token_required
+    def view():
+        return None
+
+    with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+        view()  # warm up (fills the cache when enabled)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            view()
+        return (time.perf_counter() - started) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    from app.security import jwt as jwt_security
+
+    app = make_app()
+    app.config['SECRET_KEY'] = 'benchmark-secret-key-with-enough-entropy-1234'
+    rows = []
+    for label, cache_size in (('uncached', 0), ('cached', 10000)):
+        app.config['JWT_CACHE_SIZE'] = cache_size
+        jwt_security.init_app(app)
+        jwt_security._shared_cache.clear()
+        with app.app_context():
+            token = jwt_security.generate_token(1, 'member')
+        per_call = measure(app, token, args.iterations)
+        rows.append({'mode': label, 'us/request': round(per_call * 1e6, 2), 'requests/sec': round(1 / per_call)})
+    print_table(rows)
+
+
+if __name__ == '__main__':
+    main()
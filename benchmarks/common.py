@@ -0,0 +1,78 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite file by default. Point
+BENCH_DATABASE_URL at a scratch Postgres database to measure the real thing;
+it is migrated to head but never dropped.
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def database_url() -> str:
+    url = os.getenv('BENCH_DATABASE_URL')
+    if url:
+        return url
+    fd, path = tempfile.mkstemp(prefix='medical-bench-', suffix='.db')
+    os.close(fd)
+    return f'sqlite:///{path}'
+
+
+def make_app(url: str = None):
+    """
+    Build the application against a benchmark database migrated to head. It is
+    the test suite's setup (tests.helpers.create_test_app) with the APP_ENV
+    profile (development when unset, as production refuses SQLite), so
+    benchmarks measure the schema and configuration that ship;
+    rate limiting and admission control are off, since benchmarks hammer the
+    API from one address on purpose.
+    """
+    from tests.helpers import create_test_app
+
+    return create_test_app(url or database_url(), profile=os.getenv('APP_ENV', 'development'))
+
+
+def percentiles(samples: Sequence[float], points: Iterable[int] = (50, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles, in milliseconds, of samples given in seconds."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f'p{p}': 0.0 for p in points}
+    result = {}
+    for p in points:
+        index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered))) - 1))
+        result[f'p{p}'] = round(ordered[index] * 1000, 3)
+    return result
+
+
+def run_concurrently(fn: Callable, items: Sequence, workers: int) -> Tuple[float, List[Tuple[float, object]]]:
+    """
+    Call fn(item) for every item from a thread pool.
+    Returns the wall time and a (latency, result) pair per call.
+    """
+    def timed(item):
+        started = time.perf_counter()
+        result = fn(item)
+        return time.perf_counter() - started, result
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(timed, items))
+    return time.perf_counter() - started, results
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    if not rows:
+        return
+    headers = list(rows[0])
+    widths = [max(len(str(h)), *(len(str(r[h])) for r in rows)) for h in headers]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print('  '.join(str(row[h]).ljust(w) for h, w in zip(headers, widths)))
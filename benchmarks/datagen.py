@@ -0,0 +1,204 @@
+"""
+Deterministic data generator for the benchmark suite.
+
+    python -m benchmarks.datagen --scale medium
+
+The same scale and seed always produce the same rows, ids included: an admin,
+doctors with Monday-Friday 08:00-18:00 availability in 30-minute slots, one or
+two departments per doctor, patients, and appointments filling the slot grid
+week after week from FIRST_DAY. Rows go in with multi-row INSERTs in chunks,
+so millions of appointments take minutes, not hours.
+
+A fingerprint of (scale, seed) is stored in data_versions. A database that
+already holds the same dataset is reused as is, and one holding a different
+dataset is refused, so BENCH_DATABASE_URL can point at a long-lived scratch
+database.
+"""
+import argparse
+import random
+import time
+import zlib
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Dict, Iterator, List, NamedTuple
+
+from benchmarks.common import make_app
+
+PASSWORD = 'benchmark-password'
+FIRST_DAY = date(2030, 1, 7)  # a Monday
+CREATED_AT = datetime(2030, 1, 1)
+SLOTS_PER_DAY = 20  # 08:00-18:00 in 30-minute slots
+CHUNK = 10000
+FINGERPRINT = 'benchmark_dataset'
+
+
+class Scale(NamedTuple):
+    doctors: int
+    departments: int
+    patients: int
+    appointments: int
+
+
+SCALES: Dict[str, Scale] = {
+    'tiny': Scale(doctors=10, departments=3, patients=200, appointments=5000),
+    'small': Scale(doctors=50, departments=10, patients=2000, appointments=100000),
+    'medium': Scale(doctors=200, departments=20, patients=20000, appointments=1000000),
+    'large': Scale(doctors=500, departments=40, patients=100000, appointments=5000000),
+}
+
+
+class Dataset(NamedTuple):
+    """Ids of the generated rows; ids are assigned in this order starting at 1."""
+    scale: Scale
+    seed: int
+    admin_id: int
+    doctor_ids: range
+    patient_ids: range
+    department_ids: range
+    first_free_day: date  # first Monday after the seeded appointments
+
+    @staticmethod
+    def of(scale: Scale, seed: int) -> 'Dataset':
+        doctors = range(2, 2 + scale.doctors)
+        patients = range(doctors.stop, doctors.stop + scale.patients)
+        filled_days = -(-scale.appointments // (scale.doctors * SLOTS_PER_DAY))
+        weeks = filled_days // 5 + 1
+        return Dataset(
+            scale, seed, 1, doctors, patients, range(1, scale.departments + 1), FIRST_DAY + timedelta(weeks=weeks)
+        )
+
+
+def slot_time(index: int) -> dt_time:
+    minutes = 8 * 60 + 30 * index
+    return dt_time(minutes // 60, minutes % 60)
+
+
+def weekday(n: int) -> date:
+    """The n-th working day from FIRST_DAY."""
+    return FIRST_DAY + timedelta(weeks=n // 5, days=n % 5)
+
+
+def _appointments(dataset: Dataset, rng: random.Random) -> Iterator[dict]:
+    from app.models.appointment import AppointmentStatus
+
+    statuses = [AppointmentStatus.SCHEDULED] * 7 + [AppointmentStatus.COMPLETED] * 2 + [AppointmentStatus.CANCELLED]
+    stamps = {'created_at': CREATED_AT, 'updated_at': CREATED_AT}
+    times = [slot_time(index) for index in range(SLOTS_PER_DAY + 1)]
+    produced, n = 0, 0
+    # Every slot of every doctor, day by day, so no two appointments overlap
+    while True:
+        day = weekday(n)
+        for doctor_id in dataset.doctor_ids:
+            for index in range(SLOTS_PER_DAY):
+                if produced == dataset.scale.appointments:
+                    return
+                yield {
+                    'patient_id': rng.choice(dataset.patient_ids), 'doctor_id': doctor_id, 'date': day,
+                    'start_time': times[index], 'end_time': times[index + 1], 'status': rng.choice(statuses),
+                    'reason': None, **stamps,
+                }
+                produced += 1
+        n += 1
+
+
+def _chunks(rows: Iterator[dict]) -> Iterator[List[dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def fingerprint(scale: Scale, seed: int) -> int:
+    return zlib.crc32(repr((tuple(scale), seed)).encode()) & 0x7FFFFFFF
+
+
+def generate(scale: Scale, seed: int = 42, log=print) -> Dataset:
+    """Fill an empty database with the dataset for (scale, seed), or reuse it if already there."""
+    from app.models.appointment import Appointment
+    from app.models.base import db
+    from app.models.data_version import DataVersion
+    from app.models.department import Department
+    from app.models.doctor import DoctorAvailability, DoctorDepartment
+    from app.models.user import User, UserRole
+    from app.security.utils import hash_password
+
+    dataset = Dataset.of(scale, seed)
+    existing = db.session.get(DataVersion, FINGERPRINT)
+    populated = db.session.execute(db.select(User.id).limit(1)).first() is not None
+    if existing is not None and populated:
+        if existing.version != fingerprint(scale, seed):
+            raise SystemExit('The benchmark database holds a different dataset; point BENCH_DATABASE_URL elsewhere')
+        return dataset
+    if populated:
+        raise SystemExit('The benchmark database is not empty; point BENCH_DATABASE_URL at a fresh database')
+    if existing is not None:
+        # The rows were deleted (tests.helpers.reset_database) but the fingerprint survived
+        db.session.delete(existing)
+        db.session.flush()
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    # One hash for everyone: hashing millions of passwords would dominate the run
+    password_hash = hash_password(PASSWORD)
+    stamps = {'created_at': CREATED_AT, 'updated_at': CREATED_AT}
+
+    users = [{'id': dataset.admin_id, 'email': 'admin@bench.local', 'name': 'Admin', 'role': UserRole.ADMIN}]
+    users += [{'id': id, 'email': f'doctor{id}@bench.local', 'name': f'Doctor {id}', 'role': UserRole.DOCTOR}
+              for id in dataset.doctor_ids]
+    users += [{'id': id, 'email': f'patient{id}@bench.local', 'name': f'Patient {id}', 'role': UserRole.MEMBER}
+              for id in dataset.patient_ids]
+    for chunk in _chunks(iter(users)):
+        db.session.execute(db.insert(User), [
+            {**user, 'password_hash': password_hash, 'is_active': True, **stamps} for user in chunk
+        ])
+
+    db.session.execute(db.insert(Department), [
+        {'id': id, 'name': f'Department {id}', 'description': 'Outpatient clinic', 'is_active': True, **stamps}
+        for id in dataset.department_ids
+    ])
+    db.session.execute(db.insert(DoctorDepartment), [
+        {'doctor_id': doctor_id, 'department_id': department_id, **stamps}
+        for doctor_id in dataset.doctor_ids
+        for department_id in rng.sample(dataset.department_ids, min(len(dataset.department_ids), rng.randint(1, 2)))
+    ])
+    db.session.execute(db.insert(DoctorAvailability), [
+        {'doctor_id': doctor_id, 'day_of_week': day, 'start_time': slot_time(0).strftime('%H:%M'),
+         'end_time': slot_time(SLOTS_PER_DAY).strftime('%H:%M'),
+         'slot_duration_minutes': 30, 'is_active': True, **stamps}
+        for doctor_id in dataset.doctor_ids for day in range(5)
+    ])
+    if db.session.get_bind().dialect.name == 'postgresql':
+        # Ids were given explicitly; move the sequences past them for later inserts
+        for table in ('users', 'departments'):
+            db.session.execute(db.text(f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), max(id)) FROM {table}"))
+    db.session.commit()
+
+    for count, chunk in enumerate(_chunks(_appointments(dataset, rng)), 1):
+        db.session.execute(db.insert(Appointment), chunk)
+        db.session.commit()
+        if count % 50 == 0:
+            log(f'  {count * CHUNK} appointments')
+
+    db.session.add(DataVersion(name=FINGERPRINT, version=fingerprint(scale, seed)))
+    db.session.commit()
+    log(f'Generated {len(users)} users and {scale.appointments} appointments '
+        f'in {time.perf_counter() - started:.1f} s')
+    return dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        generate(SCALES[args.scale], args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Query-plan audit: EXPLAIN every repository query and fail on sequential scans.
+
+    python -m benchmarks.plan_audit --appointments 50000
+
+Generates the benchmark dataset (benchmarks.datagen) with many doctors, runs
+each repository query once while recording the SQL it sends, then EXPLAINs
+that SQL with the same parameters (EXPLAIN QUERY PLAN on SQLite, EXPLAIN
+(FORMAT JSON) on PostgreSQL). A full scan of a table holding at least
+--large-rows rows fails the audit unless the case expects it (listing every
+appointment). Exits with status 1 on a failure, so it can run in CI against
+BENCH_DATABASE_URL. tests/integration/test_query_plans.py runs the same cases
+under pytest on SQLite.
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, time as dt_time, timedelta
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Sequence, Set, Tuple
+
+from sqlalchemy import event
+
+from benchmarks.common import make_app, print_table
+from benchmarks.datagen import FIRST_DAY, Dataset, Scale, generate
+
+DOCTORS = 1000
+DEPARTMENTS = 20
+LARGE_ROWS = 1000
+REVOKED_TOKENS = 2000
+
+
+class Case(NamedTuple):
+    name: str
+    call: Callable[[Dataset], object]
+    # Tables the query may scan in full
+    allowed: FrozenSet[str] = frozenset()
+
+
+def seed_revoked_tokens(count: int) -> None:
+    """Denylist rows around now: the first hundred expired, the rest still live."""
+    from app.models.base import db
+    from app.models.token import RevokedToken
+
+    if db.session.execute(db.select(db.func.count()).select_from(RevokedToken)).scalar() >= count:
+        return
+    now = datetime.utcnow()
+    db.session.execute(db.insert(RevokedToken), [
+        {'jti': f'jti-{i}', 'expires_at': now + timedelta(minutes=i - 100), 'created_at': now - timedelta(minutes=i)}
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def _cases() -> List[Case]:
+    from app.models.appointment import AppointmentStatus
+    from app.repositories.appointment_repository import AppointmentRepository as appointments
+    from app.repositories.availability_repository import AvailabilityRepository as availability
+    from app.repositories.data_version_repository import DataVersionRepository
+    from app.repositories.department_repository import DepartmentRepository
+    from app.repositories.revoked_token_repository import RevokedTokenRepository as revoked
+    from app.repositories.user_repository import UserRepository
+
+    day = FIRST_DAY + timedelta(days=1)
+
+    def doctor(d: Dataset) -> int:
+        return d.doctor_ids[6]
+
+    def patient(d: Dataset) -> int:
+        return d.patient_ids[10]
+
+    return [
+        Case('users.get_by_email', lambda d: UserRepository().get_by_email(f'patient{patient(d)}@bench.local')),
+        Case('users.get_by_id', lambda d: UserRepository().get_by_id(patient(d))),
+        Case('departments.get_by_name', lambda d: DepartmentRepository().get_by_name('Department 3')),
+        Case('data_versions.get', lambda d: DataVersionRepository.get('departments')),
+        Case('availability.find_by_doctor_id', lambda d: availability.find_by_doctor_id(doctor(d))),
+        Case('availability.find_records_by_doctor_id', lambda d: availability.find_records_by_doctor_id(doctor(d))),
+        Case('availability.find_by_doctor_and_day', lambda d: availability.find_by_doctor_and_day(doctor(d), 2)),
+        Case('availability.find_by_department', lambda d: availability.find_by_department(3)),
+        Case('appointments.find_conflicting', lambda d: appointments.find_conflicting_appointment(
+            doctor(d), day, dt_time(9), dt_time(9, 30))),
+        Case('appointments.find_conflicting (at)', lambda d: appointments.find_conflicting_appointment(
+            doctor(d), day, dt_time(9))),
+        Case('appointments.find_by_patient', lambda d: appointments.find_by_patient(patient(d))),
+        Case('appointments.find_by_doctor', lambda d: appointments.find_by_doctor(doctor(d))),
+        Case('appointments.find_all', lambda d: appointments.find_all(), frozenset({'appointments'})),
+        Case('appointments.find_page', lambda d: appointments.find_page(50)),
+        Case('appointments.find_page (after)', lambda d: appointments.find_page(50, after=(day, dt_time(9), 1000))),
+        Case('appointments.find_page (status)', lambda d: appointments.find_page(
+            50, status=AppointmentStatus.CANCELLED)),
+        Case('appointments.find_page (dates)', lambda d: appointments.find_page(
+            50, start_date=day, end_date=day + timedelta(days=1))),
+        Case('appointments.find_page (patient)', lambda d: appointments.find_page(50, patient_id=patient(d))),
+        Case('appointments.iter_filtered (doctor)', lambda d: list(appointments.iter_filtered(doctor_id=doctor(d)))),
+        Case('appointments.find_booked_intervals', lambda d: appointments.find_booked_intervals(
+            [doctor(d), doctor(d) + 1], day, day + timedelta(days=6))),
+        Case('revoked_tokens.is_revoked', lambda d: revoked.is_revoked('jti-5')),
+        Case('revoked_tokens.find_created_since', lambda d: revoked.find_created_since(
+            datetime.utcnow() - timedelta(minutes=5))),
+        # Last: it deletes the expired seed rows
+        Case('revoked_tokens.delete_expired', lambda d: revoked.delete_expired(datetime.utcnow())),
+    ]
+
+
+CASES = _cases()
+
+
+def capture(engine, call: Callable) -> List[Tuple[str, object]]:
+    """Run call() and return the (statement, parameters) pairs it executed."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return executed
+
+
+_ALIAS = re.compile(r'\b(\w+) AS (\w+)\b', re.IGNORECASE)
+_SQLITE_SCAN = re.compile(r'^SCAN (\w+)(?: AS (\w+))?$')
+
+
+def full_scans(connection, statement: str, parameters) -> Tuple[Set[str], str]:
+    """Tables read by a sequential scan in the statement's plan, and the plan as text."""
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).all()
+        aliases = {alias: table for table, alias in _ALIAS.findall(statement)}
+        scanned = set()
+        for row in rows:
+            # "SCAN t" reads every row; "SCAN t USING [COVERING] INDEX" walks an index in order
+            match = _SQLITE_SCAN.match(row.detail)
+            if match:
+                name = match.group(1)
+                scanned.add(aliases.get(name, name))
+        return scanned, '; '.join(row.detail for row in rows)
+
+    (plan,), = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).all()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    scanned, nodes, stack = set(), [], [plan[0]['Plan']]
+    while stack:
+        node = stack.pop()
+        nodes.append(node['Node Type'] + (f" on {node['Relation Name']}" if 'Relation Name' in node else ''))
+        if node['Node Type'] == 'Seq Scan':
+            scanned.add(node['Relation Name'])
+        stack.extend(node.get('Plans', ()))
+    return scanned, '; '.join(nodes)
+
+
+def table_sizes(connection, tables: Sequence[str]) -> Dict[str, int]:
+    return {table: connection.exec_driver_sql(f'SELECT count(*) FROM {table}').scalar() for table in tables}
+
+
+def prepare(scale: Scale, large_rows: int = LARGE_ROWS) -> Tuple[Dataset, Set[str]]:
+    """Generate the dataset, seed the denylist and ANALYZE; returns the dataset and the large tables."""
+    from app.models.base import db
+
+    dataset = generate(scale, log=lambda *args: None)
+    seed_revoked_tokens(REVOKED_TOKENS)
+    db.session.execute(db.text('ANALYZE'))
+    db.session.commit()
+    sizes = table_sizes(db.session.connection(), db.metadata.tables)
+    return dataset, {table for table, count in sizes.items() if count >= large_rows}
+
+
+def audit(case: Case, dataset: Dataset, large: Set[str]) -> List[Tuple[List[str], Set[str], str]]:
+    """Per statement the case executed: the large tables it scans without leave, every scan, and the plan."""
+    from app.models.base import db
+
+    executed = capture(db.engine, lambda: case.call(dataset))
+    db.session.commit()
+    with db.engine.connect() as connection:
+        results = []
+        for statement, parameters in executed:
+            scanned, plan = full_scans(connection, statement, parameters)
+            results.append((sorted((scanned & large) - case.allowed), scanned, plan))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--appointments', type=int, default=50000)
+    parser.add_argument('--patients', type=int, default=10000)
+    parser.add_argument('--large-rows', type=int, default=LARGE_ROWS,
+                        help='tables with at least this many rows must not be scanned in full')
+    parser.add_argument('--verbose', action='store_true', help='print every plan')
+    args = parser.parse_args()
+
+    app = make_app()
+    rows, failures = [], 0
+    with app.app_context():
+        dataset, large = prepare(Scale(DOCTORS, DEPARTMENTS, args.patients, args.appointments), args.large_rows)
+        for case in CASES:
+            for offending, scanned, plan in audit(case, dataset, large):
+                failures += bool(offending)
+                rows.append({
+                    'query': case.name,
+                    'result': 'FAIL' if offending else 'ok',
+                    'full scans': ', '.join(sorted(scanned)) or '-',
+                    'plan': plan if args.verbose or offending else '',
+                })
+    print_table(rows)
+    print(f'\n{len(rows)} statements, {failures} with a sequential scan on a large table '
+          f'({", ".join(sorted(large))})')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
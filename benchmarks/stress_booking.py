@@ -0,0 +1,217 @@
+"""
+Booking stress gate: concurrent POST /api/appointments with a double-booking oracle.
+
+    python -m benchmarks.stress_booking --requests 5000 --workers 32 [--pool process]
+
+Fires the requests from a thread pool (or a process pool, one app per
+process) at a few doctors. Start times lie on a 15-minute grid while slots
+last 30 minutes, so requests collide both on the same start and on partial
+overlaps. Afterwards an oracle checks the committed appointments:
+
+- no two active appointments of a doctor overlap
+- every 201 returned an appointment that was committed as requested
+- every 409 names a conflict, and an active appointment overlapping its
+  interval exists
+- nothing else failed; 503s from admission control (--admission-control) are
+  counted as shed, not as failures
+
+Reports bookings/sec, the conflict rate and latency percentiles, and exits
+with status 1 on any violation, so it can gate changes to the booking path.
+"""
+import argparse
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+from benchmarks.common import database_url, make_app, percentiles, print_table, run_concurrently
+
+FIRST_DAY = date(2031, 3, 3)
+SLOT_MINUTES = 30
+GRID_MINUTES = 15
+CONFLICT_MESSAGES = ('Doctor is already booked for this slot.', 'Appointment slot already taken.')
+
+
+class Booking(NamedTuple):
+    doctor_id: int
+    date: date
+    start_time: dt_time
+    token: str
+
+    @property
+    def end_time(self) -> dt_time:
+        return (datetime.combine(self.date, self.start_time) + timedelta(minutes=SLOT_MINUTES)).time()
+
+
+class Outcome(NamedTuple):
+    latency: float
+    status: int
+    body: Optional[dict]
+
+
+def seed(doctors: int, patients: int) -> Tuple[List[int], List[int]]:
+    """Fresh doctors (08:00-18:00 every day, 30-minute slots) and patients."""
+    from app.models.base import db
+    from app.models.doctor import DoctorAvailability
+    from app.models.user import User, UserRole
+
+    suffix = uuid.uuid4().hex[:8]
+    doctor_rows = [User(email=f'stress-doc-{suffix}-{i}@example.com', password_hash='-', name=f'Doctor {i}',
+                        role=UserRole.DOCTOR) for i in range(doctors)]
+    patient_rows = [User(email=f'stress-pat-{suffix}-{i}@example.com', password_hash='-', name=f'Patient {i}',
+                         role=UserRole.MEMBER) for i in range(patients)]
+    db.session.add_all(doctor_rows + patient_rows)
+    db.session.flush()
+    db.session.add_all(
+        DoctorAvailability(doctor_id=doctor.id, day_of_week=day, start_time='08:00', end_time='18:00',
+                           slot_duration_minutes=SLOT_MINUTES)
+        for doctor in doctor_rows for day in range(7)
+    )
+    db.session.commit()
+    return [d.id for d in doctor_rows], [p.id for p in patient_rows]
+
+
+def build_bookings(doctor_ids: List[int], patient_ids: List[int], days: int, count: int,
+                   rng: random.Random) -> List[Booking]:
+    from app.security.jwt_handler import issue_token_pair
+
+    tokens = {id: issue_token_pair(id, 'member')['token'] for id in patient_ids}
+    starts = [dt_time(8 + m // 60, m % 60) for m in range(0, 10 * 60 - SLOT_MINUTES + 1, GRID_MINUTES)]
+    return [
+        Booking(rng.choice(doctor_ids), FIRST_DAY + timedelta(days=rng.randrange(days)), rng.choice(starts),
+                tokens[rng.choice(patient_ids)])
+        for _ in range(count)
+    ]
+
+
+_app = None
+
+
+def _init_worker(url: str, admission_control: bool) -> None:
+    global _app
+    _app = make_app(url)
+    _set_admission_control(admission_control)
+
+
+def _set_admission_control(enabled: bool) -> None:
+    from app.admission import admission_control
+
+    admission_control.enabled = enabled
+
+
+def post(booking: Booking, app=None) -> Outcome:
+    client = (app or _app).test_client()
+    started = time.perf_counter()
+    response = client.post('/api/appointments', headers={'Authorization': f'Bearer {booking.token}'}, json={
+        'doctor_id': booking.doctor_id, 'date': booking.date.isoformat(),
+        'start_time': booking.start_time.isoformat(timespec='minutes'),
+    })
+    latency = time.perf_counter() - started
+    return Outcome(latency, response.status_code, response.get_json(silent=True))
+
+
+def check(bookings: List[Booking], outcomes: List[Outcome], doctor_ids: List[int]) -> List[str]:
+    """The oracle: violations found in the committed appointments and the responses."""
+    from app.models.appointment import Appointment, AppointmentStatus
+    from app.models.base import db
+    from app.services.interval_index import IntervalIndex
+
+    rows = db.session.execute(
+        db.select(Appointment.id, Appointment.doctor_id, Appointment.date, Appointment.start_time,
+                  Appointment.end_time)
+        .where(Appointment.doctor_id.in_(doctor_ids), Appointment.status != AppointmentStatus.CANCELLED)
+    ).all()
+    committed = {row.id: row for row in rows}
+    index = IntervalIndex.from_rows((r.doctor_id, r.date, r.start_time, r.end_time) for r in rows)
+
+    violations = []
+    for (doctor_id, day), intervals in index.items():
+        latest_end = -1
+        for start, end in intervals:
+            if start < latest_end:
+                violations.append(f'double booking: doctor {doctor_id} on {day}, interval starting at minute {start}')
+            latest_end = max(latest_end, end)
+
+    for booking, outcome in zip(bookings, outcomes):
+        if outcome.status == 201:
+            row = committed.get((outcome.body or {}).get('id'))
+            if row is None or (row.doctor_id, row.date, row.start_time) != booking[:3]:
+                violations.append(f'201 without a matching committed appointment: {booking[:3]} -> {outcome.body}')
+        elif outcome.status == 409:
+            message = (outcome.body or {}).get('message')
+            if message not in CONFLICT_MESSAGES:
+                violations.append(f'409 that is not a conflict: {booking[:3]} -> {message}')
+            elif not index.overlaps(booking.doctor_id, booking.date, booking.start_time, booking.end_time):
+                violations.append(f'409 without an overlapping appointment: {booking[:3]}')
+        elif outcome.status != 503:
+            violations.append(f'unexpected {outcome.status}: {booking[:3]} -> {outcome.body}')
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--pool', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--doctors', type=int, default=5)
+    parser.add_argument('--days', type=int, default=5, help='distinct dates requested per doctor')
+    parser.add_argument('--patients', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--admission-control', action='store_true',
+                        help='keep admission control on; its 503s count as shed requests')
+    args = parser.parse_args()
+
+    from app.models.base import db
+
+    url = database_url()
+    app = make_app(url)
+    _set_admission_control(args.admission_control)
+    with app.app_context():
+        doctor_ids, patient_ids = seed(args.doctors, args.patients)
+        bookings = build_bookings(doctor_ids, patient_ids, args.days, args.requests, random.Random(args.seed))
+
+    if args.pool == 'thread':
+        def call(booking):
+            try:
+                return post(booking, app)
+            finally:
+                with app.app_context():
+                    db.session.remove()
+
+        wall, results = run_concurrently(call, bookings, args.workers)
+        outcomes = [outcome for _, outcome in results]
+    else:
+        started = time.perf_counter()
+        with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(url, args.admission_control)) as pool:
+            outcomes = list(pool.map(post, bookings, chunksize=16))
+        wall = time.perf_counter() - started
+
+    with app.app_context():
+        violations = check(bookings, outcomes, doctor_ids)
+
+    statuses = [outcome.status for outcome in outcomes]
+    booked, conflicts, shed = statuses.count(201), statuses.count(409), statuses.count(503)
+    print_table([{
+        'pool': f'{args.pool} x {args.workers}',
+        'requests': len(outcomes),
+        'booked': booked,
+        'conflicts': conflicts,
+        'shed (503)': shed,
+        'conflict rate': f'{conflicts / len(outcomes):.1%}',
+        'bookings/sec': round(booked / wall, 1),
+        'requests/sec': round(len(outcomes) / wall, 1),
+        **percentiles([outcome.latency for outcome in outcomes]),
+    }])
+    if violations:
+        print(f'\nFAILED: {len(violations)} violations', file=sys.stderr)
+        for violation in violations[:20]:
+            print(f'  {violation}', file=sys.stderr)
+        sys.exit(1)
+    print('\nOK: no double bookings; every 201 was committed and every 409 was a real conflict')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Service-layer benchmark suite on a generated dataset, with JSON results.
+
+    python -m benchmarks.suite --scale small --requests 500 --output results.json [--compare before.json]
+
+Generates (or reuses) a deterministic dataset (see benchmarks.datagen), then
+drives the API through the Flask test client from a thread pool: login
+(AuthService.login_user), booking (AppointmentService.book_appointment),
+appointment lists per role (get_appointments_for_user and the admin keyset
+page) and the admin department list, fresh and as a conditional GET. Every
+scenario reports throughput and p50/p95/p99 latency. --output writes them with
+the commit, database and parameters, and --compare prints the change against
+an earlier results file. Bookings made by the run are deleted afterwards.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional
+
+from benchmarks.common import ROOT, make_app, percentiles, print_table, run_concurrently
+from benchmarks.datagen import PASSWORD, SCALES, SLOTS_PER_DAY, Dataset, generate, slot_time, weekday
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    headers: Dict[str, str]
+    json: Optional[dict] = None
+
+
+class Scenario(NamedTuple):
+    name: str
+    expected_status: int
+    requests: List[Request]
+
+
+def scenarios(app, dataset: Dataset, count: int, rng: random.Random) -> List[Scenario]:
+    from app.security.jwt_handler import issue_token_pair
+
+    def bearer(user_id: int, role: str) -> Dict[str, str]:
+        return {'Authorization': f"Bearer {issue_token_pair(user_id, role)['token']}"}
+
+    patients = [rng.choice(dataset.patient_ids) for _ in range(count)]
+    doctors = [rng.choice(dataset.doctor_ids) for _ in range(count)]
+    admin = bearer(dataset.admin_id, 'admin')
+    member_tokens = {id: bearer(id, 'member') for id in set(patients)}
+    doctor_tokens = {id: bearer(id, 'doctor') for id in set(doctors)}
+
+    # Distinct free slots after the seeded weeks, so every booking should succeed
+    first_free = (dataset.first_free_day - weekday(0)).days // 7 * 5
+    slots = [
+        (weekday(first_free + n // (len(dataset.doctor_ids) * SLOTS_PER_DAY)),
+         dataset.doctor_ids[n // SLOTS_PER_DAY % len(dataset.doctor_ids)], n % SLOTS_PER_DAY)
+        for n in range(count)
+    ]
+    rng.shuffle(slots)
+
+    etag = app.test_client().get('/admin/departments', headers=admin).headers.get('ETag', '')
+    page_from = weekday(0) + timedelta(days=rng.randrange(28))
+
+    return [
+        Scenario('login', 200, [
+            Request('POST', '/auth/login', {}, {'email': f'patient{id}@bench.local', 'password': PASSWORD})
+            for id in patients
+        ]),
+        Scenario('book appointment', 201, [
+            Request('POST', '/api/appointments', member_tokens[id], {
+                'doctor_id': doctor_id, 'date': day.isoformat(), 'start_time': slot_time(index).isoformat(),
+            })
+            for id, (day, doctor_id, index) in zip(patients, slots)
+        ]),
+        Scenario('appointments (member)', 200, [
+            Request('GET', '/api/appointments', member_tokens[id]) for id in patients
+        ]),
+        Scenario('appointments (doctor)', 200, [
+            Request('GET', '/api/appointments', doctor_tokens[id]) for id in doctors
+        ]),
+        Scenario('appointments (admin page)', 200, [
+            Request('GET', f'/api/appointments?limit=50&from={page_from.isoformat()}', admin)
+        ] * count),
+        Scenario('admin departments', 200, [
+            Request('GET', '/admin/departments', admin)
+        ] * count),
+        Scenario('admin departments (304)', 304, [
+            Request('GET', '/admin/departments', {**admin, 'If-None-Match': etag})
+        ] * count),
+    ]
+
+
+def run_scenario(app, scenario: Scenario, workers: int, warmup: int) -> dict:
+    def send(request: Request) -> int:
+        client = app.test_client()
+        return client.open(request.path, method=request.method, headers=request.headers, json=request.json).status_code
+
+    for request in scenario.requests[:warmup]:
+        if scenario.name != 'book appointment':
+            send(request)
+    wall, results = run_concurrently(send, scenario.requests, workers)
+    ok = [latency for latency, status in results if status == scenario.expected_status]
+    return {
+        'scenario': scenario.name,
+        'requests': len(results),
+        'errors': len(results) - len(ok),
+        'req/s': round(len(results) / wall, 1),
+        **percentiles([latency for latency, _ in results]),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(before: dict, after: dict) -> List[dict]:
+    """Per scenario: throughput and latency before and after, with the relative change."""
+    def change(old, new):
+        return f'{(new - old) / old * 100:+.1f}%' if old else '-'
+
+    previous = {row['scenario']: row for row in before['results']}
+    rows = []
+    for row in after['results']:
+        old = previous.get(row['scenario'])
+        if old is None:
+            continue
+        rows.append({
+            'scenario': row['scenario'],
+            'req/s': f"{old['req/s']} -> {row['req/s']}", 'req/s change': change(old['req/s'], row['req/s']),
+            'p95 ms': f"{old['p95']} -> {row['p95']}", 'p95 change': change(old['p95'], row['p95']),
+            'p99 change': change(old['p99'], row['p99']),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=20, help='unmeasured requests per scenario')
+    parser.add_argument('--only', action='append', help='run only the named scenario (repeatable)')
+    parser.add_argument('--admission-control', action='store_true',
+                        help='keep admission control on; its 503s then count as errors')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='results JSON of an earlier run to compare against')
+    args = parser.parse_args()
+
+    from app.admission import admission_control
+    from app.models.appointment import Appointment
+    from app.models.base import db
+
+    app = make_app()
+    # Measures the service layer, not load shedding
+    admission_control.enabled = args.admission_control
+    rows = []
+    with app.app_context():
+        dataset = generate(SCALES[args.scale], args.seed)
+        dialect = db.engine.dialect.name
+        try:
+            for scenario in scenarios(app, dataset, args.requests, random.Random(args.seed)):
+                if args.only and scenario.name not in args.only:
+                    continue
+                rows.append(run_scenario(app, scenario, args.workers, args.warmup))
+        finally:
+            db.session.remove()
+            db.session.execute(db.delete(Appointment).where(Appointment.date >= dataset.first_free_day))
+            db.session.commit()
+
+    print_table(rows)
+    result = {
+        'revision': git_revision(),
+        'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'database': dialect,
+        'python': platform.python_version(),
+        'parameters': {
+            'scale': args.scale, **SCALES[args.scale]._asdict(), 'seed': args.seed,
+            'requests': args.requests, 'workers': args.workers, 'warmup': args.warmup,
+            'admission_control': args.admission_control,
+        },
+        'results': rows,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)
+        if before.get('parameters') != result['parameters']:
+            print('\nNote: the runs used different parameters', file=sys.stderr)
+        print(f"\n{before.get('revision')} -> {result['revision']}")
+        print_table(compare(before, result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Gunicorn settings for the production image (see wsgi.py).
+
+Sizing is environment driven:
+    WEB_CONCURRENCY   worker processes (default: 2 x CPUs + 1, capped at 8)
+    GUNICORN_THREADS  threads per worker (default 4); keep DB_POOL_SIZE + DB_MAX_OVERFLOW >= threads.
+                      The app reads it too and sizes its admission pools from it.
+    PORT              listen port (default 5000)
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', min(2 * multiprocessing.cpu_count() + 1, 8)))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+# Build the app once in the master; workers fork from it
+preload_app = True
+
+# Seconds a worker may spend on one request before it is killed and replaced
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+# On SIGTERM workers stop accepting and get this long to finish in-flight requests
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = 5
+
+# Recycle workers periodically so slow leaks cannot accumulate; jitter avoids restarting all at once
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+forwarded_allow_ips = os.getenv('FORWARDED_ALLOW_IPS', '127.0.0.1')
+
+
+def post_fork(server, worker):
+    from app.serving import warm_up_worker
+    from wsgi import app
+
+    warm_up_worker(app, connections=threads)
+
+
+def worker_exit(server, worker):
+    from app.serving import shutdown_worker
+    from wsgi import app
+
+    shutdown_worker(app)
+
+
+def when_ready(server):
+    server.log.info(f"Serving with {workers} workers x {threads} threads")
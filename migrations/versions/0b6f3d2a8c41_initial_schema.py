@@ -0,0 +1,96 @@
+"""initial schema: users, departments, doctor assignments and availability, appointments
+
+Revision ID: 0b6f3d2a8c41
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b6f3d2a8c41'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.Enum('ADMIN', 'DOCTOR', 'MEMBER', name='userrole'), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_table(
+        'departments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_table(
+        'doctor_departments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('doctor_id', sa.Integer(), nullable=False),
+        sa.Column('department_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['department_id'], ['departments.id']),
+        sa.ForeignKeyConstraint(['doctor_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'doctor_availabilities',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('doctor_id', sa.Integer(), nullable=False),
+        sa.Column('day_of_week', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.String(length=5), nullable=False),
+        sa.Column('end_time', sa.String(length=5), nullable=False),
+        sa.Column('slot_duration_minutes', sa.Integer(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['doctor_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'appointments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('doctor_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('start_time', sa.Time(), nullable=False),
+        sa.Column('end_time', sa.Time(), nullable=False),
+        sa.Column('status', sa.Enum('SCHEDULED', 'COMPLETED', 'CANCELLED', name='appointmentstatus'), nullable=False),
+        sa.Column('reason', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['doctor_id'], ['users.id']),
+        sa.ForeignKeyConstraint(['patient_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('doctor_id', 'date', 'start_time', name='uniq_doctor_date_start')
+    )
+
+
+def downgrade():
+    op.drop_table('appointments')
+    op.drop_table('doctor_availabilities')
+    op.drop_table('doctor_departments')
+    op.drop_table('departments')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='appointmentstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""add data_versions counters for cache invalidation
+
+Revision ID: 3f9a1c2b7d10
+Revises: 0b6f3d2a8c41
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7d10'
+down_revision = '0b6f3d2a8c41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    data_versions = op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    # Every counter the app bumps, so the first writers never race to create a row
+    op.bulk_insert(data_versions, [
+        {'name': 'doctor_availabilities', 'version': 0},
+        {'name': 'departments', 'version': 0},
+    ])
+
+
+def downgrade():
+    op.drop_table('data_versions')
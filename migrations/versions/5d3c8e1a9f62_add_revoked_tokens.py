@@ -0,0 +1,34 @@
+"""revoked_tokens denylist for refresh token rotation and logout
+
+Revision ID: 5d3c8e1a9f62
+Revises: b81d0e6f42a7
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d3c8e1a9f62'
+down_revision = 'b81d0e6f42a7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'revoked_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('jti')
+    )
+    op.create_index(op.f('ix_revoked_tokens_created_at'), 'revoked_tokens', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_revoked_tokens_created_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,35 @@
+"""replace uniq_doctor_date_start with a partial unique index ignoring cancelled rows
+
+Revision ID: 7c2e4a9b1f35
+Revises: 3f9a1c2b7d10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e4a9b1f35'
+down_revision = '3f9a1c2b7d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_constraint('uniq_doctor_date_start', type_='unique')
+        batch_op.create_index(
+            'uniq_doctor_date_start',
+            ['doctor_id', 'date', 'start_time'],
+            unique=True,
+            postgresql_where=sa.text("status <> 'CANCELLED'"),
+            sqlite_where=sa.text("status <> 'CANCELLED'"),
+        )
+
+
+def downgrade():
+    # Fails if a cancelled appointment and an active one share a slot.
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_index('uniq_doctor_date_start')
+        batch_op.create_unique_constraint('uniq_doctor_date_start', ['doctor_id', 'date', 'start_time'])
@@ -0,0 +1,41 @@
+"""indexes for appointment listings, availability and department lookups
+
+Revision ID: 9e4b2d7c6a18
+Revises: 5d3c8e1a9f62
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b2d7c6a18'
+down_revision = '5d3c8e1a9f62'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = (
+    ('ix_appointments_patient_date', 'appointments', ['patient_id', 'date', 'start_time']),
+    ('ix_appointments_doctor_date', 'appointments', ['doctor_id', 'date', 'start_time']),
+    ('ix_appointments_status_date', 'appointments', ['status', 'date', 'start_time', 'id']),
+    ('ix_appointments_date_start', 'appointments', ['date', 'start_time', 'id']),
+    ('ix_doctor_availabilities_doctor_day', 'doctor_availabilities', ['doctor_id', 'day_of_week']),
+    ('ix_doctor_departments_department_doctor', 'doctor_departments', ['department_id', 'doctor_id']),
+    ('ix_doctor_departments_doctor', 'doctor_departments', ['doctor_id']),
+    ('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at']),
+)
+
+
+def upgrade():
+    # CONCURRENTLY on PostgreSQL so appointments stays writable while the
+    # indexes build; it cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
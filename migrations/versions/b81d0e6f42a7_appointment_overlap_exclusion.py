@@ -0,0 +1,88 @@
+"""exclusion constraint rejecting overlapping active appointments per doctor
+
+Revision ID: b81d0e6f42a7
+Revises: 7c2e4a9b1f35
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b81d0e6f42a7'
+down_revision = '7c2e4a9b1f35'
+branch_labels = None
+depends_on = None
+
+
+# An end_time of 00:00 means midnight at the end of the day; without the extra
+# day the range would end before it starts and the constraint would fail.
+RANGE = (
+    "tsrange({t}date + {t}start_time, {t}date + {t}end_time"
+    " + CASE WHEN {t}end_time < {t}start_time THEN interval '1 day' ELSE interval '0' END)"
+)
+
+
+def upgrade():
+    # Range types and GiST exclusion constraints are PostgreSQL-only; other
+    # databases rely on the overlap check inside the booking insert.
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    # Exclusion constraints cannot be added NOT VALID, so overlapping active
+    # rows already in the table have to be resolved first.
+    overlaps = bind.execute(sa.text(
+        "SELECT a.id, b.id FROM appointments a JOIN appointments b "
+        "ON a.doctor_id = b.doctor_id AND a.id < b.id "
+        "AND a.status <> 'CANCELLED' AND b.status <> 'CANCELLED' "
+        f"AND {RANGE.format(t='a.')} && {RANGE.format(t='b.')} "
+        "ORDER BY a.id, b.id"
+    )).all()
+    if overlaps:
+        if context.get_x_argument(as_dictionary=True).get('cancel_overlaps') != 'true':
+            pairs = ', '.join(f'{a}/{b}' for a, b in overlaps[:20])
+            raise RuntimeError(
+                f"{len(overlaps)} pairs of active appointments overlap (ids: {pairs}). Resolve them, or rerun "
+                "with `flask db upgrade -x cancel_overlaps=true` to keep the earliest booking of each and "
+                "cancel the rest."
+            )
+        cancelled = _later_bookings(bind, {id for pair in overlaps for id in pair})
+        bind.execute(
+            sa.text("UPDATE appointments SET status = 'CANCELLED' WHERE id IN :ids")
+            .bindparams(sa.bindparam('ids', expanding=True)),
+            {'ids': sorted(cancelled)},
+        )
+        print(f"Cancelled {len(cancelled)} overlapping appointments: {sorted(cancelled)}")
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE appointments ADD CONSTRAINT excl_doctor_overlap "
+        f"EXCLUDE USING gist (doctor_id WITH =, {RANGE.format(t='')} WITH &&) "
+        "WHERE (status <> 'CANCELLED')"
+    )
+
+
+def _later_bookings(bind, ids):
+    """Ids to cancel: in booking (id) order, every row overlapping one that is kept."""
+    rows = bind.execute(
+        sa.text(
+            "SELECT id, doctor_id, date + start_time AS starts, date + end_time"
+            " + CASE WHEN end_time < start_time THEN interval '1 day' ELSE interval '0' END AS ends"
+            " FROM appointments WHERE id IN :ids ORDER BY id"
+        ).bindparams(sa.bindparam('ids', expanding=True)),
+        {'ids': sorted(ids)},
+    ).all()
+    kept, cancelled = {}, set()
+    for row in rows:
+        if any(row.starts < ends and starts < row.ends for starts, ends in kept.get(row.doctor_id, ())):
+            cancelled.add(row.id)
+        else:
+            kept.setdefault(row.doctor_id, []).append((row.starts, row.ends))
+    return cancelled
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_constraint('excl_doctor_overlap', 'appointments', type_='exclude')
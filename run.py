@@ -1,6 +1,10 @@
+import os
+
 from app import create_app
 
-app = create_app()
+# The dev server defaults to the development profile; create_app() alone defaults to production
+app = create_app(os.getenv('APP_ENV', 'development'))
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # Development server only; production runs gunicorn with wsgi.py
+    app.run(host="0.0.0.0", port=5000, debug=app.config["DEBUG"])
@@ -1 +1,69 @@
 # Pytest fixtures (app, db, client)
+import pytest
+
+from tests.helpers import create_test_app, reset_database
+
+PASSWORD = 'correct-horse-battery'
+
+
+@pytest.fixture(scope='session')
+def app():
+    """One application for the session on a fresh SQLite file migrated to head."""
+    return create_test_app()
+
+
+@pytest.fixture
+def db(app):
+    """The database inside an app context; every row a test writes is deleted afterwards."""
+    from app.models.base import db as database
+
+    with app.app_context():
+        yield database
+        reset_database()
+
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(db):
+    """Create a user with PASSWORD and return it, e.g. make_user('doc@example.com', role='doctor')."""
+    from app.models.user import User, UserRole
+    from app.security.utils import hash_password
+
+    def make(email: str, role: str = 'member', name: str = 'Test User') -> User:
+        user = User(email=email, password_hash=hash_password(PASSWORD), name=name, role=UserRole(role))
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def auth_headers(app):
+    """Bearer headers for a user id and role, without going through /auth/login."""
+    from app.security.jwt_handler import issue_token_pair
+
+    def headers(user_id: int, role: str) -> dict:
+        with app.app_context():
+            return {'Authorization': f"Bearer {issue_token_pair(user_id, role)['token']}"}
+
+    return headers
+
+
+@pytest.fixture(scope='module')
+def dataset(app, request):
+    """
+    A generated dataset (benchmarks.datagen) shared by the tests of one module.
+    Modules pick the size with a module-level DATASET_SCALE; the default is 'tiny'.
+    Tests using it must not request `db`, which empties the tables after each test.
+    """
+    from benchmarks.datagen import SCALES, generate
+
+    scale = getattr(request.module, 'DATASET_SCALE', SCALES['tiny'])
+    with app.app_context():
+        yield generate(scale, log=lambda *args: None)
+        reset_database()
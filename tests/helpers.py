@@ -0,0 +1,97 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+
+from app.models.base import db
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIGRATIONS = os.path.join(ROOT, 'migrations')
+
+
+def temporary_database_url() -> str:
+    fd, path = tempfile.mkstemp(prefix='medical-test-', suffix='.db')
+    os.close(fd)
+    return f'sqlite:///{path}'
+
+
+def create_test_app(database_url: Optional[str] = None, profile: Optional[str] = 'testing'):
+    """
+    Build the application against `database_url` (a fresh SQLite file by default)
+    and bring its schema to head with the migrations, as a deployment would.
+    Rate limiting and admission control are off. The test suite and the
+    benchmark scripts both start from here.
+    """
+    os.environ['DATABASE_URL'] = database_url or temporary_database_url()
+    from flask_migrate import Migrate, upgrade
+
+    from app import create_app
+    from app.admission import admission_control
+    from app.security.rate_limit import rate_limiter
+
+    app = create_app(profile)
+    app.config['TESTING'] = True
+    rate_limiter.enabled = False
+    admission_control.enabled = False
+    if 'migrate' not in app.extensions:
+        Migrate(app, db, directory=MIGRATIONS)
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+    return app
+
+
+def reset_database() -> None:
+    """
+    Delete every row the tests wrote. Version counters are kept and bumped
+    instead, so in-process caches keyed on them never serve deleted rows.
+    """
+    db.session.remove()
+    with db.engine.begin() as connection:
+        for table in reversed(db.metadata.sorted_tables):
+            if table.name != 'data_versions':
+                connection.execute(table.delete())
+        connection.execute(db.text('UPDATE data_versions SET version = version + 1'))
+
+
+class QueryLog:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine=None) -> Iterator[QueryLog]:
+    """Record every SQL statement executed on the engine inside the block."""
+    engine = engine or db.engine
+    log = QueryLog()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield log
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(limit: int, engine=None) -> Iterator[QueryLog]:
+    """
+    Fail when the block issues more than `limit` SQL statements, e.g.
+
+        with assert_max_queries(2):
+            client.get('/api/appointments', headers=auth)
+
+    Listing endpoints should not grow with the number of rows returned.
+    """
+    with count_queries(engine) as log:
+        yield log
+    if log.count > limit:
+        listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(log.statements))
+        raise AssertionError(f"Expected at most {limit} queries, got {log.count}:\n{listing}")
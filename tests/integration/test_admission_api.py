@@ -0,0 +1,97 @@
+# Integration tests for admission control pools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.admission import admission_control
+from app.admission.pools import SLOW_POOLS, AdmissionPool, capacity_warnings, default_pools
+from tests.conftest import PASSWORD
+
+THREADS = 4
+BOOKING = {'doctor_id': 1, 'date': '2031-05-06', 'start_time': '09:00'}
+
+
+@pytest.fixture
+def admission(app, monkeypatch):
+    """Admission control switched on with the default pools of a THREADS-thread worker."""
+    pools = {name: AdmissionPool(name, **settings) for name, settings in default_pools(THREADS).items()}
+    monkeypatch.setattr(admission_control, 'pools', pools)
+    monkeypatch.setattr(admission_control, '_by_endpoint', {
+        target: pool for pool in pools.values() for target in pool.match if '.' in target
+    })
+    monkeypatch.setattr(admission_control, '_by_blueprint', {
+        target: pool for pool in pools.values() for target in pool.match if '.' not in target
+    })
+    monkeypatch.setattr(admission_control, 'enabled', True)
+    return admission_control
+
+
+@pytest.fixture
+def blocked_bookings(monkeypatch):
+    """Make every booking wait on the returned event, as a slow write would."""
+    from app.controllers import appointment_controller
+
+    release = threading.Event()
+
+    def book_appointment(patient_id, data):
+        release.wait(5)
+        raise ValueError('Slot no longer available')
+
+    monkeypatch.setattr(appointment_controller.appointment_service, 'book_appointment', book_appointment)
+    yield release
+    release.set()
+
+
+@pytest.mark.parametrize('threads', [4, 8, 16, 32])
+def test_default_pools_leave_logins_a_thread(threads):
+    pools = {name: AdmissionPool(name, **settings) for name, settings in default_pools(threads).items()}
+
+    assert capacity_warnings(pools, threads) == []
+    assert sum(pools[name].limit + pools[name].queue for name in SLOW_POOLS) < threads
+
+
+def test_pools_that_can_take_every_thread_are_reported():
+    pools = {name: AdmissionPool(name, **settings) for name, settings in default_pools(THREADS).items()}
+    pools['booking'] = AdmissionPool('booking', limit=2, queue=2)
+
+    warnings = capacity_warnings(pools, THREADS)
+
+    assert any("'booking'" in warning for warning in warnings)
+    assert any('together' in warning for warning in warnings)
+
+
+def test_full_booking_pool_still_lets_logins_through(app, db, make_user, auth_headers, admission, blocked_bookings):
+    member = make_user('member@example.com')
+    headers = auth_headers(member.id, 'member')
+    booking_limit = admission.pools['booking'].limit
+
+    def book():
+        return app.test_client().post('/api/appointments', json=BOOKING, headers=headers).status_code
+
+    # A gthread worker: the first bookings take their pool's slots and hold their threads
+    with ThreadPoolExecutor(max_workers=THREADS) as workers:
+        held = [workers.submit(book) for _ in range(booking_limit)]
+        pool = admission.pools['booking']
+        for _ in range(500):
+            if pool.in_flight == booking_limit:
+                break
+            time.sleep(0.01)
+        assert pool.in_flight == booking_limit
+
+        extra = workers.submit(book).result(timeout=5)
+        logins = [
+            workers.submit(lambda: app.test_client().post(
+                '/auth/login', json={'email': 'member@example.com', 'password': PASSWORD}).status_code)
+            for _ in range(THREADS - booking_limit)
+        ]
+        login_statuses = [login.result(timeout=5) for login in logins]
+
+        blocked_bookings.set()
+        held_statuses = [booking.result(timeout=5) for booking in held]
+
+    assert extra == 503
+    assert login_statuses == [200] * len(logins)
+    assert held_statuses == [409] * booking_limit
+    assert pool.in_flight == 0
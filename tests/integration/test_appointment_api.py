@@ -0,0 +1,123 @@
+# Integration tests for the appointment listing: keyset pages, filters and NDJSON output
+import json
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.models.appointment import Appointment, AppointmentStatus
+from app.repositories.appointment_repository import AppointmentRepository
+
+FIRST_DAY = date(2031, 5, 5)
+DAYS = 5
+CANCELLED_DAY = FIRST_DAY + timedelta(days=2)
+
+
+@pytest.fixture
+def member(db, make_user, auth_headers):
+    """
+    A member with an appointment on each of DAYS days, the one on CANCELLED_DAY
+    cancelled. Another patient has the same appointments an hour later.
+    """
+    doctor_id = make_user('doctor@example.com', role='doctor').id
+    patient_id = make_user('patient@example.com').id
+    other_id = make_user('other@example.com').id
+    for patient, start in ((patient_id, time(9, 0)), (other_id, time(10, 0))):
+        for offset in range(DAYS):
+            appointment = AppointmentRepository.create_if_free(Appointment(
+                patient_id=patient, doctor_id=doctor_id, date=FIRST_DAY + timedelta(days=offset),
+                start_time=start, end_time=start.replace(minute=30),
+            ))
+            if appointment.date == CANCELLED_DAY:
+                appointment.status = AppointmentStatus.CANCELLED
+    db.session.commit()
+    return auth_headers(patient_id, 'member')
+
+
+def listing(client, headers, query: str = ''):
+    return client.get(f'/api/appointments{query}', headers=headers)
+
+
+def dates(items) -> list:
+    return [item['date'] for item in items]
+
+
+def test_cursor_pages_walk_the_whole_listing(client, member):
+    everything = listing(client, member).get_json()
+    assert dates(everything) == [str(FIRST_DAY + timedelta(days=offset)) for offset in range(DAYS)]
+
+    pages, cursor = [], None
+    while True:
+        response = listing(client, member, '?limit=2' + (f'&cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        body = response.get_json()
+        pages.append(body['items'])
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [item for page in pages for item in page] == everything
+
+
+def test_last_full_page_has_no_next_cursor(client, member):
+    body = listing(client, member, f'?limit={DAYS}').get_json()
+
+    assert len(body['items']) == DAYS
+    assert body['next_cursor'] is None
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'bm90IGpzb24', 'WyJ4IiwgIjA5OjAwIiwgMV0'])
+def test_bad_cursor_is_rejected(client, member, cursor):
+    response = listing(client, member, f'?limit=2&cursor={cursor}')
+
+    assert response.status_code == 400
+    assert response.get_json() == {'cursor': ['Invalid cursor.']}
+
+
+def test_status_filter(client, member):
+    cancelled = listing(client, member, '?status=cancelled').get_json()
+    scheduled = listing(client, member, '?status=scheduled').get_json()
+
+    assert dates(cancelled) == [str(CANCELLED_DAY)]
+    assert len(scheduled) == DAYS - 1 and str(CANCELLED_DAY) not in dates(scheduled)
+    assert listing(client, member, '?status=unknown').status_code == 400
+
+
+def test_date_filters_are_inclusive(client, member):
+    second, fourth = FIRST_DAY + timedelta(days=1), FIRST_DAY + timedelta(days=3)
+
+    assert dates(listing(client, member, f'?from={second}&to={fourth}').get_json()) == [
+        str(second), str(CANCELLED_DAY), str(fourth),
+    ]
+    assert dates(listing(client, member, f'?from={fourth}').get_json()) == [
+        str(fourth), str(FIRST_DAY + timedelta(days=4)),
+    ]
+    page = listing(client, member, f'?to={second}&limit=1').get_json()
+    assert dates(page['items']) == [str(FIRST_DAY)]
+    next_page = listing(client, member, f"?to={second}&limit=1&cursor={page['next_cursor']}").get_json()
+    assert dates(next_page['items']) == [str(second)]
+    assert next_page['next_cursor'] is None
+
+
+def test_filters_do_not_widen_a_members_scope(client, member):
+    everything = listing(client, member).get_json()
+
+    assert listing(client, member, '?from=2000-01-01').get_json() == everything
+
+
+@pytest.mark.parametrize('how', ['query', 'accept'])
+def test_ndjson_streams_one_compact_line_per_appointment(client, member, how):
+    if how == 'query':
+        response = listing(client, member, '?format=ndjson&status=scheduled')
+    else:
+        response = client.get('/api/appointments?status=scheduled',
+                              headers={**member, 'Accept': 'application/x-ndjson'})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    body = response.get_data(as_text=True)
+    lines = body.splitlines()
+    assert body.endswith('\n')
+    expected = listing(client, member, '?status=scheduled').get_json()
+    assert [json.loads(line) for line in lines] == expected
+    assert lines == [json.dumps(item, separators=(',', ':'), sort_keys=True) for item in expected]
@@ -0,0 +1,38 @@
+# Query budgets of the appointment listings on the tiny generated dataset
+import pytest
+
+from tests.helpers import assert_max_queries
+
+# The listing itself, plus an occasional denylist sync from @token_required
+BUDGET = 2
+
+
+def user_for(dataset, role: str) -> int:
+    return {'admin': dataset.admin_id, 'doctor': dataset.doctor_ids[0], 'member': dataset.patient_ids[0]}[role]
+
+
+@pytest.mark.parametrize('role', ['admin', 'doctor', 'member'])
+def test_listing_does_not_query_per_row(app, dataset, auth_headers, role):
+    client = app.test_client()
+    headers = auth_headers(user_for(dataset, role), role)
+
+    with app.app_context(), assert_max_queries(BUDGET):
+        response = client.get('/api/appointments', headers=headers)
+
+    assert response.status_code == 200
+    appointments = response.get_json()
+    assert len(appointments) > BUDGET
+    assert all(a['patient_name'].startswith('Patient ') and a['doctor_name'].startswith('Doctor ')
+               for a in appointments)
+
+
+@pytest.mark.parametrize('role', ['admin', 'doctor', 'member'])
+def test_page_does_not_query_per_row(app, dataset, auth_headers, role):
+    client = app.test_client()
+    headers = auth_headers(user_for(dataset, role), role)
+
+    with app.app_context(), assert_max_queries(BUDGET):
+        response = client.get('/api/appointments?limit=20', headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 20
@@ -0,0 +1,124 @@
+# Integration tests for AppointmentRepository's conflict checks and guarded insert
+from datetime import date, time
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.models.appointment import Appointment, AppointmentStatus
+from app.repositories.appointment_repository import AppointmentRepository
+
+DAY = date(2031, 5, 6)
+
+
+@pytest.fixture
+def people(make_user):
+    return make_user('doctor@example.com', role='doctor').id, make_user('patient@example.com').id
+
+
+def book(people, start: time, end: time, day: date = DAY):
+    doctor_id, patient_id = people
+    return AppointmentRepository.create_if_free(Appointment(
+        patient_id=patient_id, doctor_id=doctor_id, date=day, start_time=start, end_time=end,
+    ))
+
+
+def conflicting(people, start: time, end=None, day: date = DAY):
+    return AppointmentRepository.find_conflicting_appointment(people[0], day, start, end)
+
+
+@pytest.mark.parametrize('start, end', [
+    (time(9, 0), time(9, 30)),    # same slot
+    (time(9, 15), time(9, 45)),   # starts inside
+    (time(8, 45), time(9, 15)),   # ends inside
+    (time(8, 30), time(10, 0)),   # contains it
+    (time(9, 10), time(9, 20)),   # inside it
+])
+def test_overlapping_booking_conflicts(db, people, start, end):
+    existing = book(people, time(9, 0), time(9, 30))
+
+    assert conflicting(people, start, end).id == existing.id
+    assert book(people, start, end) is None
+
+
+@pytest.mark.parametrize('start, end', [(time(8, 30), time(9, 0)), (time(9, 30), time(10, 0))])
+def test_adjacent_booking_is_free(db, people, start, end):
+    book(people, time(9, 0), time(9, 30))
+
+    assert conflicting(people, start, end) is None
+    assert book(people, start, end) is not None
+
+
+def test_booking_on_another_day_is_free(db, people):
+    book(people, time(9, 0), time(9, 30))
+
+    assert book(people, time(9, 0), time(9, 30), day=date(2031, 5, 7)) is not None
+
+
+@pytest.mark.parametrize('start, end', [
+    (time(23, 0), time(23, 30)),
+    (time(23, 30), time(0, 0)),
+    (time(22, 0), time(0, 0)),
+])
+def test_appointment_ending_at_midnight_conflicts(db, people, start, end):
+    existing = book(people, time(23, 15), time(0, 0))
+
+    assert conflicting(people, start, end).id == existing.id
+    assert conflicting(people, time(23, 45)).id == existing.id
+    assert book(people, start, end) is None
+
+
+def test_appointment_ending_at_midnight_does_not_block_the_morning(db, people):
+    book(people, time(23, 15), time(0, 0))
+
+    assert conflicting(people, time(0, 0), time(0, 30)) is None
+    assert book(people, time(0, 0), time(0, 30)) is not None
+    assert book(people, time(22, 45), time(23, 15)) is not None
+
+
+def test_double_booking_returns_none_and_writes_nothing(db, people):
+    first = book(people, time(9, 0), time(9, 30))
+
+    assert book(people, time(9, 0), time(9, 30)) is None
+    assert db.session.execute(db.select(Appointment.id)).scalars().all() == [first.id]
+
+
+def test_cancelled_slot_can_be_rebooked(db, people):
+    cancelled = book(people, time(9, 0), time(9, 30))
+    cancelled.status = AppointmentStatus.CANCELLED
+    db.session.commit()
+
+    rebooked = book(people, time(9, 0), time(9, 30))
+
+    assert rebooked is not None and rebooked.id != cancelled.id
+    assert rebooked.status == AppointmentStatus.SCHEDULED
+    assert book(people, time(9, 0), time(9, 30)) is None
+
+
+def active_row(people, status=AppointmentStatus.SCHEDULED, end: time = time(9, 30)) -> Appointment:
+    doctor_id, patient_id = people
+    return Appointment(patient_id=patient_id, doctor_id=doctor_id, date=DAY, start_time=time(9, 0), end_time=end,
+                       status=status)
+
+
+def test_partial_unique_index_rejects_a_second_active_row(db, people):
+    db.session.add(active_row(people))
+    db.session.commit()
+
+    db.session.add(active_row(people))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    # Cancelled rows are outside the index
+    db.session.add_all([active_row(people, AppointmentStatus.CANCELLED), active_row(people, AppointmentStatus.CANCELLED)])
+    db.session.commit()
+    assert db.session.execute(db.select(db.func.count()).select_from(Appointment)).scalar() == 3
+
+
+def test_insert_racing_past_the_overlap_check_is_absorbed_by_the_unique_index(db, people):
+    # A zero-length row overlaps nothing, like a concurrent insert the check has not seen yet
+    db.session.add(active_row(people, end=time(9, 0)))
+    db.session.commit()
+
+    assert conflicting(people, time(9, 0), time(9, 30)) is None
+    assert book(people, time(9, 0), time(9, 30)) is None
@@ -1 +1,78 @@
 # Integration tests for Controllers/DB
+from tests.conftest import PASSWORD
+
+
+def register(client, email='patient@example.com', **extra):
+    return client.post('/auth/register', json={'email': email, 'password': PASSWORD, 'name': 'Patient', **extra})
+
+
+def login(client, email='patient@example.com', password=PASSWORD):
+    return client.post('/auth/login', json={'email': email, 'password': password})
+
+
+def test_register_then_login(client):
+    response = register(client)
+    assert response.status_code == 201
+    assert isinstance(response.get_json()['user_id'], int)
+
+    response = login(client)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['token'] and body['refresh_token']
+
+
+def test_register_duplicate_email_conflicts(client):
+    register(client)
+
+    response = register(client)
+
+    assert response.status_code == 409
+    assert response.get_json() == {'message': 'User already exists'}
+
+
+def test_register_validates_input(client):
+    assert client.post('/auth/register', json={}).status_code == 400
+    response = client.post('/auth/register', json={'email': 'not-an-email', 'password': '123', 'name': 'X'})
+    assert response.status_code == 422
+    assert set(response.get_json()) == {'email', 'password'}
+
+
+def test_login_with_wrong_password_is_unauthorized(client):
+    register(client)
+
+    response = login(client, password='wrong-password')
+
+    assert response.status_code == 401
+    assert response.get_json() == {'message': 'Invalid credentials'}
+
+
+def test_access_token_authorizes_requests(client):
+    register(client)
+    token = login(client).get_json()['token']
+
+    assert client.get('/api/appointments').status_code == 401
+    response = client.get('/api/appointments', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert response.get_json() == []
+
+
+def test_refresh_token_is_single_use(client):
+    register(client)
+    refresh_token = login(client).get_json()['refresh_token']
+
+    first = client.post('/auth/refresh', json={'refresh_token': refresh_token})
+    replay = client.post('/auth/refresh', json={'refresh_token': refresh_token})
+
+    assert first.status_code == 200
+    assert replay.status_code == 401
+
+
+def test_logout_revokes_the_session(client):
+    register(client)
+    tokens = login(client).get_json()
+    headers = {'Authorization': f"Bearer {tokens['token']}"}
+
+    assert client.post('/auth/logout', headers=headers).status_code == 200
+
+    assert client.get('/api/appointments', headers=headers).status_code == 401
+    assert client.post('/auth/refresh', json={'refresh_token': tokens['refresh_token']}).status_code == 401
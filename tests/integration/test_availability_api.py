@@ -0,0 +1,52 @@
+# Integration tests for availability, slot search and booking through the API
+from datetime import date, timedelta
+
+import pytest
+
+MONDAY = date(2031, 5, 5)
+
+
+@pytest.fixture
+def doctor(make_user, auth_headers):
+    user = make_user('doctor@example.com', role='doctor')
+    return user.id, auth_headers(user.id, 'doctor')
+
+
+@pytest.fixture
+def member(make_user, auth_headers):
+    user = make_user('patient@example.com')
+    return auth_headers(user.id, 'member')
+
+
+def set_availability(client, headers, start: str, end: str, day_of_week: int = 0):
+    return client.post('/api/availability', headers=headers, json={
+        'day_of_week': day_of_week, 'start_time': start, 'end_time': end, 'slot_duration_minutes': 30,
+    })
+
+
+def free_slots(client, doctor_id: int, headers, day: date = MONDAY):
+    return client.get(f'/api/availability/{doctor_id}/slots?from={day}&to={day}', headers=headers)
+
+
+@pytest.mark.parametrize('start, end', [('99:99', '10:00'), ('09:00', '24:30'), ('10:00', '09:00')])
+def test_invalid_working_window_is_rejected(client, doctor, start, end):
+    _, headers = doctor
+
+    assert set_availability(client, headers, start, end).status_code == 400
+
+
+def test_day_ending_at_midnight_can_be_searched_and_booked(client, doctor, member):
+    doctor_id, headers = doctor
+    assert set_availability(client, headers, '23:00', '24:00').status_code == 200
+
+    response = free_slots(client, doctor_id, member)
+    assert response.status_code == 200
+    assert [(s['start_time'], s['end_time']) for s in response.get_json()] == [
+        ('23:00:00', '23:30:00'), ('23:30:00', '00:00:00'),
+    ]
+
+    booking = {'doctor_id': doctor_id, 'date': MONDAY.isoformat(), 'start_time': '23:30'}
+    assert client.post('/api/appointments', headers=member, json=booking).status_code == 201
+    assert client.post('/api/appointments', headers=member, json={**booking, 'start_time': '23:15'}).status_code == 409
+    assert [s['start_time'] for s in free_slots(client, doctor_id, member).get_json()] == ['23:00:00']
+    assert free_slots(client, doctor_id, member, MONDAY + timedelta(days=7)).status_code == 200
@@ -0,0 +1,34 @@
+# Every benchmark script runs end to end at a tiny size (each on its own throwaway SQLite file)
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.helpers import ROOT
+
+SCRIPTS = [
+    ('bench_booking', ['--slots', '20', '--workers', '4', '--doctors', '2', '--patients', '5']),
+    ('bench_bulk_writes', ['--rows', '200']),
+    ('bench_password_hashing', ['--logins', '8', '--workers', '4', '--hash-workers', '1',
+                                '--method', 'pbkdf2:sha256:1000']),
+    ('bench_read_models', ['--rows', '500', '--repeat', '1']),
+    ('bench_serialization', ['--rows', '200', '--repeat', '1']),
+    ('bench_startup', ['--runs', '1', '--top', '3']),
+    ('bench_statement_cache', ['--iterations', '20']),
+    ('bench_token_required', ['--iterations', '200']),
+    ('plan_audit', ['--appointments', '2000', '--patients', '200']),
+    ('suite', ['--scale', 'tiny', '--requests', '10', '--warmup', '0']),
+    ('stress_booking', ['--requests', '50', '--workers', '4']),
+]
+
+
+@pytest.mark.parametrize('script, arguments', SCRIPTS, ids=[script for script, _ in SCRIPTS])
+def test_benchmark_script_runs(script, arguments):
+    env = {name: value for name, value in os.environ.items() if name not in ('DATABASE_URL', 'BENCH_DATABASE_URL')}
+    result = subprocess.run(
+        [sys.executable, '-m', f'benchmarks.{script}', *arguments],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=300,
+    )
+
+    assert result.returncode == 0, result.stderr[-3000:]
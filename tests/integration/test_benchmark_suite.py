@@ -0,0 +1,21 @@
+# The benchmark scenarios (benchmarks.suite) on the tiny generated dataset
+import random
+
+import pytest
+
+from benchmarks.suite import run_scenario, scenarios
+
+
+@pytest.fixture(scope='module')
+def suite_scenarios(app, dataset):
+    return {scenario.name: scenario for scenario in scenarios(app, dataset, 10, random.Random(42))}
+
+
+@pytest.mark.parametrize('name', [
+    'login', 'book appointment', 'appointments (member)', 'appointments (doctor)',
+    'appointments (admin page)', 'admin departments', 'admin departments (304)',
+])
+def test_scenario_runs_without_errors(app, suite_scenarios, name):
+    result = run_scenario(app, suite_scenarios[name], workers=2, warmup=0)
+
+    assert (result['requests'], result['errors']) == (10, 0)
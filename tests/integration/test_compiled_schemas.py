@@ -0,0 +1,87 @@
+# Compiled schemas and the orjson provider must reproduce marshmallow and jsonify exactly
+import importlib
+import pkgutil
+from datetime import timedelta
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import app.controllers
+from app.serialization import CompiledSchema
+
+
+def compiled_schemas():
+    """Every CompiledSchema a controller module builds at import."""
+    found = []
+    for module_info in pkgutil.iter_modules(app.controllers.__path__):
+        module = importlib.import_module(f'app.controllers.{module_info.name}')
+        found += [(f'{module_info.name}.{name}', value) for name, value in vars(module).items()
+                  if isinstance(value, CompiledSchema)]
+    return found
+
+
+SCHEMAS = compiled_schemas()
+
+
+@pytest.fixture(scope='module')
+def payloads(app, dataset):
+    """Rows as the endpoints get them (read-model records), plus ORM entities and in-memory objects."""
+    from app.models.appointment import Appointment
+    from app.models.department import Department
+    from app.models.doctor import DoctorAvailability
+    from app.services.admin_service import AdminService
+    from app.services.appointment_service import AppointmentService
+    from app.services.availability_service import AvailabilityService
+    from benchmarks.bench_serialization import build_rows
+
+    doctor = dataset.doctor_ids[0]
+    with app.app_context():
+        availability = AvailabilityService()
+        appointments, departments = build_rows(200)
+        yield {
+            'AppointmentSchema': [
+                AppointmentService().get_appointments_for_user(dataset.admin_id, 'admin')[:500],
+                AppointmentService().get_appointments_for_user(dataset.patient_ids[0], 'member'),
+                Appointment.query.limit(50).all(),
+                appointments,
+            ],
+            'DepartmentSchema': [AdminService().list_departments(), Department.query.all(), departments],
+            'DoctorAvailabilitySchema': [
+                availability.get_doctor_availability(doctor), DoctorAvailability.query.limit(20).all(),
+            ],
+            'SlotSchema': [
+                availability.find_free_slots(doctor, dataset.first_free_day, dataset.first_free_day + timedelta(days=6)),
+                availability.find_earliest_in_department(dataset.department_ids[0], dataset.first_free_day, 20),
+            ],
+        }
+
+
+def test_every_controller_schema_is_compiled():
+    assert {name for name, _ in SCHEMAS} >= {
+        'admin_controller.departments_schema', 'appointment_controller.appointments_schema',
+        'availability_controller.availabilities_schema', 'availability_controller.slots_schema',
+    }
+    assert all(compiled.compiled for _, compiled in SCHEMAS)
+
+
+@pytest.mark.parametrize('compiled', [c for _, c in SCHEMAS], ids=[name for name, _ in SCHEMAS])
+def test_compiled_dump_equals_schema_dump(app, payloads, compiled):
+    groups = payloads[type(compiled.schema).__name__]
+
+    with app.app_context():
+        for rows in groups:
+            assert rows, 'no rows to compare'
+            assert compiled.dump(rows) == compiled.schema.dump(rows)
+            assert compiled.dump(rows[0], many=False) == compiled.schema.dump(rows[0], many=False)
+
+
+@pytest.mark.parametrize('compiled', [c for _, c in SCHEMAS], ids=[name for name, _ in SCHEMAS])
+def test_fast_json_response_equals_jsonify(app, payloads, compiled):
+    stdlib = DefaultJSONProvider(app)
+
+    with app.app_context():
+        for rows in payloads[type(compiled.schema).__name__]:
+            dumped = compiled.dump(rows)
+            assert app.json.response(dumped).get_data() == stdlib.response(dumped).get_data()
+            assert app.json.response({'items': dumped, 'next_cursor': None}).get_data() == \
+                stdlib.response({'items': dumped, 'next_cursor': None}).get_data()
@@ -0,0 +1,153 @@
+# Integration tests for the earliest free slots across a department's doctors
+import math
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.models.appointment import Appointment
+from app.models.department import Department
+from app.models.doctor import DoctorAvailability, DoctorDepartment
+from app.repositories.appointment_repository import AppointmentRepository
+from app.services.availability_service import (
+    DEPARTMENT_SEARCH_WINDOW_DAYS,
+    MAX_SLOT_SEARCH_DAYS,
+    AvailabilityService,
+)
+from tests.helpers import count_queries
+
+MONDAY = date(2031, 5, 5)
+service = AvailabilityService()
+
+
+@pytest.fixture
+def department(db, make_user):
+    """
+    Cardiology with three doctors (first, second, third) plus an inactive one,
+    and a neurologist working earlier than all of them. The second doctor's
+    first Monday slot is booked.
+    """
+    cardiology, neurology = Department(name='Cardiology'), Department(name='Neurology')
+    db.session.add_all([cardiology, neurology])
+    db.session.flush()
+
+    doctors = {name: make_user(f'{name}@example.com', role='doctor') for name in
+               ('first', 'second', 'third', 'inactive', 'neurologist')}
+    doctors['inactive'].is_active = False
+    templates = {
+        'first': [(0, '09:30', '11:00')],
+        'second': [(0, '09:00', '10:00'), (2, '09:00', '09:30')],
+        'third': [(1, '08:00', '08:30')],
+        'inactive': [(0, '07:00', '08:00')],
+        'neurologist': [(0, '07:00', '08:00')],
+    }
+    for name, rows in templates.items():
+        doctor_id = doctors[name].id
+        department_id = neurology.id if name == 'neurologist' else cardiology.id
+        db.session.add(DoctorDepartment(doctor_id=doctor_id, department_id=department_id))
+        db.session.add_all([
+            DoctorAvailability(doctor_id=doctor_id, day_of_week=day, start_time=start, end_time=end,
+                               slot_duration_minutes=30)
+            for day, start, end in rows
+        ])
+    db.session.commit()
+
+    AppointmentRepository.create_if_free(Appointment(
+        patient_id=make_user('patient@example.com').id, doctor_id=doctors['second'].id,
+        date=MONDAY, start_time=time(9, 0), end_time=time(9, 30),
+    ))
+    ids = {name: user.id for name, user in doctors.items()}
+    return cardiology.id, ids
+
+
+def earliest(department_id: int, limit: int, start_date: date = MONDAY):
+    return [(slot.date, slot.start_time, slot.doctor_id)
+            for slot in service.find_earliest_in_department(department_id, start_date, limit)]
+
+
+def test_slots_come_earliest_first_across_doctors(department):
+    department_id, doctor = department
+
+    assert earliest(department_id, 7) == [
+        # Ties go to the lower doctor id
+        (MONDAY, time(9, 30), min(doctor['first'], doctor['second'])),
+        (MONDAY, time(9, 30), max(doctor['first'], doctor['second'])),
+        (MONDAY, time(10, 0), doctor['first']),
+        (MONDAY, time(10, 30), doctor['first']),
+        (MONDAY + timedelta(days=1), time(8, 0), doctor['third']),
+        (MONDAY + timedelta(days=2), time(9, 0), doctor['second']),
+        # Only the first Monday's 09:00 is booked
+        (MONDAY + timedelta(days=7), time(9, 0), doctor['second']),
+    ]
+
+
+def test_inactive_and_other_departments_doctors_are_left_out(department):
+    department_id, doctor = department
+
+    found = {doctor_id for _, _, doctor_id in earliest(department_id, 100)}
+
+    assert found == {doctor['first'], doctor['second'], doctor['third']}
+
+
+@pytest.mark.parametrize('limit', [1, 3, 5])
+def test_limit_caps_the_result(department, limit):
+    department_id, _ = department
+
+    assert earliest(department_id, limit) == earliest(department_id, 7)[:limit]
+
+
+def test_search_starts_on_the_given_date(department):
+    department_id, doctor = department
+
+    assert earliest(department_id, 1, MONDAY + timedelta(days=1)) == [
+        (MONDAY + timedelta(days=1), time(8, 0), doctor['third']),
+    ]
+
+
+def test_search_stops_after_the_maximum_window(department):
+    department_id, _ = department
+
+    slots = earliest(department_id, 1000)
+
+    assert slots[-1][0] < MONDAY + timedelta(days=MAX_SLOT_SEARCH_DAYS)
+    assert len(slots) == len(set(slots))
+
+
+def test_unknown_department_has_no_slots(department):
+    with count_queries() as log:
+        assert earliest(999999, 10) == []
+
+    assert log.count == 1
+
+
+def test_first_slots_take_two_queries(department):
+    department_id, _ = department
+
+    with count_queries() as log:
+        assert len(earliest(department_id, 4)) == 4
+
+    # Templates of every doctor, then one window of booked intervals shared by all of them
+    assert log.count == 2
+
+
+def test_query_count_grows_with_windows_not_doctors(department):
+    department_id, _ = department
+
+    with count_queries() as log:
+        earliest(department_id, 1000)
+
+    assert log.count <= 1 + math.ceil(MAX_SLOT_SEARCH_DAYS / DEPARTMENT_SEARCH_WINDOW_DAYS)
+
+
+def test_endpoint_returns_the_earliest_slots(client, department, auth_headers):
+    department_id, doctor = department
+    headers = auth_headers(doctor['first'], 'doctor')
+
+    response = client.get(f'/api/availability/departments/{department_id}/earliest?from={MONDAY}&limit=2',
+                          headers=headers)
+
+    assert response.status_code == 200
+    assert [(slot['date'], slot['start_time']) for slot in response.get_json()] == [
+        (str(MONDAY), '09:30:00'), (str(MONDAY), '09:30:00'),
+    ]
+    assert client.get(f'/api/availability/departments/{department_id}/earliest?limit=0',
+                      headers=headers).status_code == 400
@@ -0,0 +1,62 @@
+# Integration tests for /metrics access control and request instrumentation
+import pytest
+
+
+@pytest.fixture
+def metrics_config(app):
+    saved = {name: app.config[name] for name in ('METRICS_ALLOWED_NETWORKS', 'METRICS_TOKEN')}
+    yield app.config
+    app.config.update(saved)
+
+
+def scrape(client, address='127.0.0.1', **headers):
+    return client.get('/metrics', headers=headers, environ_base={'REMOTE_ADDR': address})
+
+
+def test_metrics_answer_loopback_by_default(client):
+    response = scrape(client)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+
+def test_metrics_refuse_clients_outside_the_allowed_networks(client, metrics_config):
+    assert scrape(client, '203.0.113.9').status_code == 403
+
+    metrics_config['METRICS_ALLOWED_NETWORKS'] = ['10.0.0.0/8']
+    assert scrape(client, '10.1.2.3').status_code == 200
+    assert scrape(client, '127.0.0.1').status_code == 403
+
+
+def test_metrics_token_is_required_when_set(client, metrics_config):
+    metrics_config['METRICS_TOKEN'] = 'scrape-secret'
+
+    assert scrape(client).status_code == 403
+    assert scrape(client, Authorization='Bearer wrong').status_code == 403
+    assert scrape(client, Authorization='Bearer scrape-secret').status_code == 200
+
+
+def sample(client, line_prefix: str) -> float:
+    """Value of the sample whose name and labels start the line, 0 when absent."""
+    for line in scrape(client).get_data(as_text=True).splitlines():
+        if line.startswith(line_prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def test_requests_shed_by_admission_control_are_counted_and_timed(client, monkeypatch):
+    from app.admission import admission_control
+
+    pool = admission_control.pools['booking']
+    monkeypatch.setattr(admission_control, 'enabled', True)
+    monkeypatch.setattr(pool, 'queue', 0)
+    monkeypatch.setattr(pool, 'in_flight', pool.limit)
+    labels = 'endpoint="appointments.book_appointment",method="POST"'
+    shed = f'http_requests_total{{{labels},status="503"}}'
+    timed = f'http_request_duration_seconds_count{{{labels}}}'
+    before_shed, before_timed = sample(client, shed), sample(client, timed)
+
+    assert client.post('/api/appointments', json={}).status_code == 503
+
+    assert sample(client, shed) == before_shed + 1
+    assert sample(client, timed) == before_timed + 1
@@ -0,0 +1,33 @@
+# Query plans of the repository statements (benchmarks.plan_audit) on a generated dataset
+import pytest
+
+from benchmarks.datagen import Scale
+from benchmarks.plan_audit import CASES, DEPARTMENTS, DOCTORS, audit, prepare
+
+# Enough doctors that availability and department links are large tables too
+DATASET_SCALE = Scale(doctors=DOCTORS, departments=DEPARTMENTS, patients=5000, appointments=50000)
+
+
+@pytest.fixture(scope='module')
+def audited(app, dataset):
+    with app.app_context():
+        _, large = prepare(DATASET_SCALE)
+    return dataset, large
+
+
+def test_dataset_has_large_tables(audited):
+    _, large = audited
+
+    assert {'appointments', 'users', 'doctor_availabilities', 'doctor_departments', 'revoked_tokens'} <= large
+
+
+@pytest.mark.parametrize('case', CASES, ids=[case.name for case in CASES])
+def test_statement_avoids_full_scans_of_large_tables(app, audited, case):
+    dataset, large = audited
+
+    with app.app_context():
+        results = audit(case, dataset, large)
+
+    assert results, 'the case executed no statement'
+    for offending, _, plan in results:
+        assert not offending, f'full scan of {", ".join(offending)}: {plan}'
@@ -0,0 +1,196 @@
+# Integration tests for read replica routing, on two SQLite files: a primary and a copy of it as the replica
+import json
+import os
+import shutil
+import time
+from datetime import date
+
+import pytest
+
+from app.db.session import replica_router
+from app.models.base import db
+from app.services.availability_cache import availability_cache
+from tests.conftest import PASSWORD
+from tests.helpers import count_queries, create_test_app, temporary_database_url
+
+MONDAY = date(2031, 5, 5)
+
+
+def sqlite_path(url: str) -> str:
+    return url[len('sqlite:///'):]
+
+
+@pytest.fixture(scope='module')
+def routed_app(app):
+    """
+    An app with one replica. The replica is a copy of the primary taken after
+    seeding, and nothing replicates to it afterwards, so rows written by a test
+    are only visible where the write went.
+    """
+    primary_url, replica_url = temporary_database_url(), temporary_database_url()
+    database_url = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_REPLICA_URLS'] = json.dumps([replica_url])
+    try:
+        routed = create_test_app(primary_url)
+    finally:
+        os.environ.pop('DATABASE_REPLICA_URLS')
+        os.environ['DATABASE_URL'] = database_url
+
+    from app.models.user import User, UserRole
+    from app.security.utils import hash_password
+
+    with routed.app_context():
+        people = {
+            email: User(email=email, password_hash=hash_password(PASSWORD), name='Test User', role=UserRole(role))
+            for email, role in (('doctor@example.com', 'doctor'), ('first@example.com', 'member'),
+                                ('second@example.com', 'member'))
+        }
+        db.session.add_all(people.values())
+        db.session.commit()
+        routed.config['PEOPLE'] = {email: (user.id, user.role.value) for email, user in people.items()}
+        db.session.remove()
+        db.engine.dispose()
+
+    doctor_id, _ = routed.config['PEOPLE']['doctor@example.com']
+    response = routed.test_client().post('/api/availability', headers=headers_for(routed, 'doctor@example.com'), json={
+        'day_of_week': 0, 'start_time': '09:00', 'end_time': '12:00', 'slot_duration_minutes': 30,
+    })
+    assert response.status_code == 200
+    with routed.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    shutil.copyfile(sqlite_path(primary_url), sqlite_path(replica_url))
+
+    yield routed
+
+    replica_router.init_app(app)
+    availability_cache.init_app(app)
+
+
+@pytest.fixture
+def routed(routed_app):
+    """The routed app's client, with fresh router state (healthy replica, no read-your-writes windows)."""
+    replica_router.init_app(routed_app)
+    availability_cache.init_app(routed_app)
+    with routed_app.app_context():
+        yield routed_app.test_client()
+
+
+def headers_for(app, email: str) -> dict:
+    from app.security.jwt_handler import issue_token_pair
+
+    user_id, role = app.config['PEOPLE'][email]
+    with app.app_context():
+        return {'Authorization': f"Bearer {issue_token_pair(user_id, role)['token']}"}
+
+
+@pytest.fixture
+def engines(routed):
+    return db.engines[None], db.engines['replica_0']
+
+
+def read_only_gets(app):
+    doctor_id, _ = app.config['PEOPLE']['doctor@example.com']
+    return [
+        '/api/appointments',
+        f'/api/availability/{doctor_id}',
+        f'/api/availability/{doctor_id}/slots?from={MONDAY}&to={MONDAY}',
+    ]
+
+
+def test_read_only_listing_and_availability_gets_go_to_the_replica(routed_app, routed, engines):
+    primary, replica = engines
+    headers = headers_for(routed_app, 'first@example.com')
+    listing, availability, slots = read_only_gets(routed_app)
+
+    for url in (listing, availability):
+        with count_queries(primary) as on_primary, count_queries(replica) as on_replica:
+            response = routed.get(url, headers=headers)
+
+        assert response.status_code == 200, url
+        assert on_primary.statements == [], url
+        assert on_replica.count > 0, url
+
+    # The shared availability cache fills from the primary, so a lagging replica
+    # cannot pin stale templates for its TTL; booked intervals come from the replica
+    with count_queries(primary) as on_primary, count_queries(replica) as on_replica:
+        response = routed.get(slots, headers=headers)
+    assert response.status_code == 200
+    assert all('appointments' not in statement for statement in on_primary.statements)
+    assert any('appointments' in statement for statement in on_replica.statements)
+
+
+def test_writes_and_the_requesters_next_reads_go_to_the_primary(routed_app, routed, engines):
+    primary, replica = engines
+    doctor_id, _ = routed_app.config['PEOPLE']['doctor@example.com']
+    first, second = headers_for(routed_app, 'first@example.com'), headers_for(routed_app, 'second@example.com')
+
+    with count_queries(primary) as on_primary:
+        response = routed.post('/api/appointments', headers=first, json={
+            'doctor_id': doctor_id, 'date': MONDAY.isoformat(), 'start_time': '09:00',
+        })
+    assert response.status_code == 201
+    assert any(statement.lstrip().upper().startswith('INSERT') for statement in on_primary.statements)
+
+    # Inside their read-your-writes window the booker reads the primary and sees the booking
+    with count_queries(primary) as on_primary, count_queries(replica) as on_replica:
+        listing = routed.get('/api/appointments', headers=first)
+        slots = routed.get(f'/api/availability/{doctor_id}/slots?from={MONDAY}&to={MONDAY}', headers=first)
+    assert [item['start_time'] for item in listing.get_json()] == ['09:00:00']
+    assert '09:00:00' not in [slot['start_time'] for slot in slots.get_json()]
+    assert on_primary.count > 0
+    assert on_replica.statements == []
+
+    # Other users keep reading the replica, which has not seen the write
+    with count_queries(primary) as on_primary:
+        listing = routed.get('/api/appointments', headers=second)
+    assert listing.get_json() == []
+    assert on_primary.statements == []
+
+
+def test_reads_after_a_write_in_the_same_transaction_use_the_primary(routed, engines):
+    from app.models.department import Department
+    from app.repositories.department_repository import DepartmentRepository
+
+    primary, replica = engines
+    try:
+        db.session.add(Department(name='Cardiology'))
+        db.session.flush()
+
+        with count_queries(primary) as on_primary, count_queries(replica) as on_replica:
+            names = [department.name for department in DepartmentRepository().list_records()]
+    finally:
+        db.session.rollback()
+
+    assert names == ['Cardiology']
+    assert on_primary.count == 1
+    assert on_replica.statements == []
+
+
+def test_unhealthy_replica_falls_back_to_the_primary(routed_app, routed, engines):
+    primary, replica = engines
+    replica_router.replicas[0].healthy = False
+    replica_router._next_check = time.monotonic() + 60
+    headers = headers_for(routed_app, 'first@example.com')
+
+    for url in read_only_gets(routed_app):
+        with count_queries(primary) as on_primary, count_queries(replica) as on_replica:
+            response = routed.get(url, headers=headers)
+
+        assert response.status_code == 200, url
+        assert on_primary.count > 0, url
+        assert on_replica.statements == [], url
+
+
+def test_without_a_replica_everything_uses_the_primary(app, client, make_user, auth_headers):
+    replica_router.init_app(app)
+    doctor = make_user('doctor@example.com', role='doctor')
+    member = auth_headers(make_user('patient@example.com').id, 'member')
+
+    assert replica_router.replicas == []
+    assert list(db.engines) == [None]
+    with count_queries() as on_primary:
+        for url in (f'/api/availability/{doctor.id}', f'/api/availability/{doctor.id}/slots', '/api/appointments'):
+            assert client.get(url, headers=member).status_code == 200
+    assert on_primary.count > 0
@@ -0,0 +1,124 @@
+# Integration tests for unit_of_work and the repositories' bulk writes
+import time
+
+import pytest
+
+from app.db.unit_of_work import in_unit_of_work, unit_of_work
+from app.models.department import Department
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.department_repository import DEPARTMENTS_VERSION, DepartmentRepository
+from app.repositories.user_repository import UserRepository
+
+repository = DepartmentRepository()
+
+
+def names(db):
+    return db.session.execute(db.select(Department.name).order_by(Department.name)).scalars().all()
+
+
+def test_unit_of_work_commits_once_at_the_end(db):
+    with unit_of_work():
+        repository.create(name='Cardiology')
+        assert in_unit_of_work()
+        assert db.session().in_transaction()
+        repository.create(name='Neurology')
+
+    assert not in_unit_of_work()
+    db.session.remove()
+    assert names(db) == ['Cardiology', 'Neurology']
+
+
+def test_unit_of_work_rolls_back_every_write_on_error(db):
+    before = DataVersionRepository.get(DEPARTMENTS_VERSION)
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            DataVersionRepository.bump(DEPARTMENTS_VERSION)
+            repository.create(name='Cardiology')
+            raise RuntimeError('boom')
+
+    assert not in_unit_of_work()
+    assert names(db) == []
+    assert DataVersionRepository.get(DEPARTMENTS_VERSION) == before
+
+
+def test_nested_unit_of_work_joins_the_outer_transaction(db):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            repository.create(name='Cardiology')
+            with unit_of_work():
+                repository.create(name='Neurology')
+            assert in_unit_of_work()
+            raise RuntimeError('boom')
+
+    assert names(db) == []
+
+
+def test_error_in_a_nested_unit_of_work_rolls_back_the_outer_one(db):
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            repository.create(name='Cardiology')
+            with unit_of_work():
+                repository.create(name='Neurology')
+                raise RuntimeError('boom')
+
+    assert not in_unit_of_work()
+    assert names(db) == []
+
+
+def test_bulk_upsert_updates_collisions_and_keeps_created_at(db):
+    repository.bulk_create([{'name': 'Cardiology', 'description': 'Old'}])
+    created = db.session.execute(db.select(Department)).scalar_one()
+    created_at, updated_at = created.created_at, created.updated_at
+    db.session.remove()
+    time.sleep(0.01)
+
+    count = repository.bulk_upsert(
+        [{'name': 'Cardiology', 'description': 'New'}, {'name': 'Neurology', 'description': 'New'}], ['name'],
+    )
+
+    assert count == 2
+    rows = {row.name: row for row in db.session.execute(db.select(Department)).scalars()}
+    assert set(rows) == {'Cardiology', 'Neurology'}
+    assert rows['Cardiology'].description == 'New'
+    assert rows['Cardiology'].created_at == created_at
+    assert rows['Cardiology'].updated_at > updated_at
+
+
+def test_bulk_writes_bump_the_version_of_a_cached_table(db):
+    version = DataVersionRepository.get(DEPARTMENTS_VERSION)
+
+    repository.bulk_create([{'name': 'Cardiology'}])
+    assert DataVersionRepository.get(DEPARTMENTS_VERSION) == version + 1
+
+    department_id = db.session.execute(db.select(Department.id)).scalar_one()
+    repository.bulk_update([{'id': department_id, 'description': 'Heart'}])
+    assert DataVersionRepository.get(DEPARTMENTS_VERSION) == version + 2
+
+    repository.bulk_upsert([{'name': 'Cardiology', 'description': 'Hearts'}], ['name'])
+    assert DataVersionRepository.get(DEPARTMENTS_VERSION) == version + 3
+
+    assert repository.bulk_update([]) == 0
+    assert DataVersionRepository.get(DEPARTMENTS_VERSION) == version + 3
+
+
+def test_bulk_version_bump_is_rolled_back_with_the_rows(db):
+    version = DataVersionRepository.get(DEPARTMENTS_VERSION)
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work():
+            repository.bulk_create([{'name': 'Cardiology'}])
+            raise RuntimeError('boom')
+
+    assert names(db) == []
+    assert DataVersionRepository.get(DEPARTMENTS_VERSION) == version
+
+
+def test_bulk_writes_to_an_uncached_table_leave_versions_alone(db):
+    from app.models.data_version import DataVersion
+
+    versions = dict(db.session.execute(db.select(DataVersion.name, DataVersion.version)).all())
+
+    UserRepository().bulk_create([{'email': 'a@example.com', 'password_hash': 'x', 'name': 'A'}])
+
+    assert dict(db.session.execute(db.select(DataVersion.name, DataVersion.version)).all()) == versions
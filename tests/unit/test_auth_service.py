@@ -1 +1,57 @@
 # Unit tests for Services/Models
+from werkzeug.security import generate_password_hash
+
+from app.models.user import UserRole
+from app.security.jwt import decode_token
+from app.services.auth_service import AuthService
+from tests.conftest import PASSWORD
+
+
+def test_register_hashes_password_and_defaults_to_member(db):
+    ok, message, user = AuthService().register_user({'email': 'new@example.com', 'password': PASSWORD, 'name': 'New'})
+
+    assert ok, message
+    assert user.role == UserRole.MEMBER
+    assert user.password_hash != PASSWORD
+    assert 'password' not in user.__dict__
+
+
+def test_register_rejects_existing_email(db, make_user):
+    make_user('taken@example.com')
+
+    ok, message, user = AuthService().register_user({'email': 'taken@example.com', 'password': PASSWORD, 'name': 'X'})
+
+    assert (ok, message, user) == (False, "User already exists", None)
+
+
+def test_login_returns_token_pair_for_user(db, make_user):
+    user = make_user('doc@example.com', role='doctor')
+
+    ok, _, tokens = AuthService().login_user({'email': 'doc@example.com', 'password': PASSWORD})
+
+    assert ok
+    claims = decode_token(tokens['token'])
+    assert (claims['sub'], claims['role']) == (str(user.id), 'doctor')
+    assert tokens['refresh_token'] != tokens['token']
+
+
+def test_login_rejects_wrong_password_and_unknown_email(db, make_user):
+    make_user('member@example.com')
+    service = AuthService()
+
+    assert service.login_user({'email': 'member@example.com', 'password': 'wrong-password'}) == \
+        (False, "Invalid credentials", None)
+    assert service.login_user({'email': 'nobody@example.com', 'password': PASSWORD}) == \
+        (False, "Invalid credentials", None)
+
+
+def test_login_upgrades_outdated_password_hash(db, make_user):
+    user = make_user('legacy@example.com')
+    user.password_hash = generate_password_hash(PASSWORD, method='pbkdf2:sha256:500')
+    db.session.commit()
+
+    ok, _, _ = AuthService().login_user({'email': 'legacy@example.com', 'password': PASSWORD})
+
+    assert ok
+    db.session.refresh(user)
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
@@ -0,0 +1,121 @@
+# Unit tests for the availability template cache and its invalidation
+import pytest
+
+from app.repositories.data_version_repository import DataVersionRepository
+from app.services.availability_cache import AVAILABILITY_VERSION, AvailabilityCache, availability_cache
+from app.services.availability_service import AvailabilityService
+from tests.helpers import count_queries
+
+service = AvailabilityService()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(clock):
+    return AvailabilityCache(ttl=300, version_check_interval=1, clock=clock)
+
+
+@pytest.fixture
+def doctor_id(make_user):
+    doctor_id = make_user('doctor@example.com', role='doctor').id
+    set_monday(doctor_id, '09:00', '10:00')
+    return doctor_id
+
+
+def set_monday(doctor_id: int, start: str, end: str) -> None:
+    service.create_availability(doctor_id, {'day_of_week': 0, 'start_time': start, 'end_time': end})
+
+
+def monday(cache: AvailabilityCache, doctor_id: int):
+    template = cache.get_day(doctor_id, 0)
+    return template.start, template.end
+
+
+def test_repeat_lookups_are_served_from_memory(cache, doctor_id):
+    assert monday(cache, doctor_id) == (9 * 60, 10 * 60)
+
+    with count_queries() as log:
+        assert monday(cache, doctor_id) == (9 * 60, 10 * 60)
+
+    assert log.count == 0
+    assert cache.stats()['hits'] == 1
+
+
+def test_creating_availability_invalidates_the_shared_cache(db, doctor_id):
+    availability_cache.clear()
+    assert monday(availability_cache, doctor_id) == (9 * 60, 10 * 60)
+
+    set_monday(doctor_id, '13:00', '15:00')
+
+    assert monday(availability_cache, doctor_id) == (13 * 60, 15 * 60)
+
+
+def test_write_in_another_worker_reaches_this_cache_through_the_version(cache, clock, doctor_id):
+    assert monday(cache, doctor_id) == (9 * 60, 10 * 60)
+    # create_availability bumps the counter but only invalidates its own worker's cache
+    set_monday(doctor_id, '13:00', '15:00')
+
+    # Within the check interval the old entry may still be served
+    assert monday(cache, doctor_id) == (9 * 60, 10 * 60)
+
+    clock.now += 1
+    assert monday(cache, doctor_id) == (13 * 60, 15 * 60)
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_version_bump_drops_every_entry(db, make_user, cache, clock, doctor_id):
+    other_id = make_user('other@example.com', role='doctor').id
+    cache.get_week(doctor_id)
+    cache.get_week(other_id)
+
+    DataVersionRepository.bump(AVAILABILITY_VERSION)
+    db.session.commit()
+    clock.now += 1
+    cache.get_week(doctor_id)
+
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['size'] == 1
+
+
+def test_unchanged_version_keeps_entries(cache, clock, doctor_id):
+    monday(cache, doctor_id)
+    clock.now += 5
+
+    with count_queries() as log:
+        monday(cache, doctor_id)
+
+    # Only the version check
+    assert log.count == 1
+    assert cache.stats()['invalidations'] == 0
+
+
+def test_entries_expire_after_the_ttl(cache, clock, doctor_id):
+    monday(cache, doctor_id)
+    clock.now += 301
+
+    monday(cache, doctor_id)
+
+    assert cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_entry_is_evicted(make_user, clock, doctor_id):
+    cache = AvailabilityCache(maxsize=1, clock=clock)
+    other_id = make_user('other@example.com', role='doctor').id
+
+    cache.get_week(doctor_id)
+    cache.get_week(other_id)
+
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['size'] == 1
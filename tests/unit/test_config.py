@@ -0,0 +1,36 @@
+# Unit tests for configuration loading
+import pytest
+
+from app.config import ConfigError, load_config
+from app.config.production import ProductionConfig
+
+
+def test_unset_app_env_loads_the_production_profile(monkeypatch):
+    monkeypatch.delenv('APP_ENV', raising=False)
+
+    config = load_config()
+
+    assert type(config) is ProductionConfig
+    assert config.DEBUG is False
+
+
+def test_unset_app_env_refuses_an_unconfigured_deployment(monkeypatch):
+    monkeypatch.delenv('APP_ENV', raising=False)
+    monkeypatch.delenv('SECRET_KEY', raising=False)
+
+    with pytest.raises(ConfigError):
+        load_config().validate()
+
+
+def test_app_env_selects_the_profile(monkeypatch):
+    monkeypatch.setenv('APP_ENV', 'development')
+
+    assert load_config().DEBUG is True
+
+
+def test_metrics_networks_are_validated(monkeypatch):
+    monkeypatch.setenv('APP_ENV', 'testing')
+    monkeypatch.setenv('METRICS_ALLOWED_NETWORKS', '["10.0.0.0/8", "not-a-network"]')
+
+    with pytest.raises(ConfigError, match='not-a-network'):
+        load_config().validate()
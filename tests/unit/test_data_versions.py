@@ -0,0 +1,24 @@
+# Unit tests for the data version counters
+from app.repositories.data_version_repository import DataVersionRepository
+
+
+def test_bump_creates_then_increments_a_counter(db):
+    assert DataVersionRepository.get('tests') == 0
+
+    DataVersionRepository.bump('tests')
+    db.session.commit()
+    assert DataVersionRepository.get('tests') == 1
+
+    DataVersionRepository.bump('tests')
+    DataVersionRepository.bump('tests')
+    db.session.commit()
+    assert DataVersionRepository.get('tests') == 3
+
+
+def test_bump_is_published_by_the_callers_commit(db):
+    before = DataVersionRepository.get('departments')
+
+    DataVersionRepository.bump('departments')
+    db.session.rollback()
+
+    assert DataVersionRepository.get('departments') == before
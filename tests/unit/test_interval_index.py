@@ -0,0 +1,33 @@
+# Unit tests for the booked-interval index
+from datetime import date, time
+
+from app.services.interval_index import IntervalIndex, end_to_minutes
+
+DAY = date(2031, 5, 6)
+
+
+def test_end_of_day_is_minute_1440():
+    assert end_to_minutes(time(0, 0)) == 1440
+    assert end_to_minutes(time(23, 30)) == 1410
+
+
+def test_overlaps_and_adjacent_intervals():
+    index = IntervalIndex.from_rows([(1, DAY, time(9), time(9, 30))])
+
+    assert index.overlaps(1, DAY, time(9, 15), time(9, 45))
+    assert index.overlaps(1, DAY, time(8, 30), time(10))
+    assert not index.overlaps(1, DAY, time(9, 30), time(10))
+    assert not index.overlaps(1, DAY, time(8, 30), time(9))
+    assert not index.overlaps(2, DAY, time(9), time(9, 30))
+
+
+def test_interval_ending_at_midnight_overlaps_the_late_evening():
+    index = IntervalIndex.from_rows([(1, DAY, time(23, 15), time(0, 0))])
+
+    assert index.overlaps(1, DAY, time(23), time(23, 30))
+    assert index.overlaps(1, DAY, time(23, 30), time(0, 0))
+    assert not index.overlaps(1, DAY, time(0), time(0, 30))
+    assert not index.overlaps(1, DAY, time(22, 45), time(23, 15))
+
+    index.add(1, DAY, time(22), time(23))
+    assert index.overlaps(1, DAY, time(22, 30), time(0, 0))
@@ -0,0 +1,92 @@
+# Unit tests for the verified-token cache: cached tokens still expire and can still be revoked
+import datetime
+import time
+
+import pytest
+
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.security import jwt as jwt_security
+from app.security.jwt import JWTState, VerifiedTokenCache, decode_token, generate_token
+from app.security.jwt_handler import issue_token_pair
+from app.security.revocation import revocation_list
+
+
+@pytest.fixture
+def verifications(db, monkeypatch):
+    """Count signature verifications, i.e. decodes the cache did not serve."""
+    calls = []
+    verify = jwt_security.jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return verify(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_security.jwt, 'decode', counting)
+    return calls
+
+
+@pytest.fixture
+def member(make_user):
+    user = make_user('patient@example.com')
+    return user.id
+
+
+def test_repeat_decodes_are_served_from_the_cache(verifications):
+    token = generate_token(1, 'member')
+
+    first, second = decode_token(token), decode_token(token)
+
+    assert first == second and first['sub'] == '1'
+    assert len(verifications) == 1
+
+
+def test_cached_token_stops_validating_once_it_expires(verifications):
+    token = generate_token(1, 'member', lifetime=datetime.timedelta(seconds=1))
+    claims = decode_token(token)
+    assert claims is not None and decode_token(token) is claims
+
+    time.sleep(max(0.0, claims['exp'] - time.time()) + 0.05)
+
+    assert decode_token(token) is None
+    assert len(verifications) == 2
+
+
+def test_cache_drops_entries_at_their_exp(monkeypatch):
+    cache = VerifiedTokenCache()
+    cache.put(b'digest', {'exp': 2000, 'sub': '1'})
+
+    monkeypatch.setattr(jwt_security.time, 'time', lambda: 1999.0)
+    assert cache.get(b'digest') == {'exp': 2000, 'sub': '1'}
+    monkeypatch.setattr(jwt_security.time, 'time', lambda: 2000.0)
+    assert cache.get(b'digest') is None
+
+
+def test_rotating_the_secret_makes_cached_tokens_unreachable(db):
+    cache = VerifiedTokenCache()
+    token = generate_token(1, 'member')
+
+    assert JWTState('old-secret', cache).digest(token) != JWTState('new-secret', cache).digest(token)
+
+
+def test_cached_token_is_rejected_after_logout(client, member, verifications):
+    headers = {'Authorization': f"Bearer {issue_token_pair(member, 'member')['token']}"}
+    assert client.get('/api/appointments', headers=headers).status_code == 200
+
+    assert client.post('/auth/logout', headers=headers).status_code == 200
+
+    assert client.get('/api/appointments', headers=headers).status_code == 401
+    assert len(verifications) == 1
+
+
+def test_cached_token_is_rejected_after_another_worker_revokes_it(app, client, member, verifications):
+    tokens = issue_token_pair(member, 'member')
+    headers = {'Authorization': f"Bearer {tokens['token']}"}
+    assert client.get('/api/appointments', headers=headers).status_code == 200
+
+    claims = decode_token(tokens['token'])
+    RevokedTokenRepository.add(claims['fam'], datetime.datetime.utcnow() + datetime.timedelta(hours=1))
+    # This worker only sees the row at its next sync
+    revocation_list.init_app(app)
+
+    assert client.get('/api/appointments', headers=headers).status_code == 401
+    assert len(verifications) == 1
@@ -0,0 +1,55 @@
+# Unit tests for the password hashing pool
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+
+from app.security.password_hasher import HashingBusy, PasswordHasher, normalize_method
+
+
+@pytest.mark.parametrize('method, expected', [
+    ('scrypt', 'scrypt:32768:8:1'),
+    ('scrypt:16384', 'scrypt:16384:8:1'),
+    ('scrypt:16384:4', 'scrypt:16384:4:1'),
+    ('scrypt:16384:4:2', 'scrypt:16384:4:2'),
+    ('pbkdf2', f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'),
+    ('pbkdf2:sha512:1000', 'pbkdf2:sha512:1000'),
+])
+def test_normalize_method(method, expected):
+    assert normalize_method(method) == expected
+
+
+def test_normalize_method_rejects_unknown_methods():
+    with pytest.raises(ValueError):
+        normalize_method('md5')
+    with pytest.raises(ValueError):
+        normalize_method('scrypt:1:2:3:4')
+
+
+def test_partial_scrypt_method_hashes_with_the_full_parameters():
+    hasher = PasswordHasher('scrypt:16384')
+
+    password_hash = hasher.hash('secret')
+
+    assert password_hash.startswith('scrypt:16384:8:1$')
+    assert hasher.verify(password_hash, 'secret')
+    assert not hasher.needs_rehash(password_hash)
+
+
+def test_timed_out_hash_keeps_its_slot_until_it_finishes(monkeypatch):
+    hasher = PasswordHasher('pbkdf2:sha256:1000', workers=1, queue_depth=0, timeout=0.05)
+    pool = ThreadPoolExecutor(1)
+    monkeypatch.setattr(hasher, '_executor', lambda: pool)
+    release = threading.Event()
+
+    with pytest.raises(HashingBusy):
+        hasher._run(release.wait)
+    # The first hash still runs, so there is no room for another
+    with pytest.raises(HashingBusy):
+        hasher._run(lambda: True)
+
+    release.set()
+    pool.submit(lambda: None).result()  # the pool's single thread has finished the first hash
+    assert hasher._run(lambda: True) is True
+    pool.shutdown()
@@ -0,0 +1,59 @@
+# Unit tests for the rate limiter
+from app.security.rate_limit import MemoryBackend, Rate
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_rejected_check_takes_no_token_from_any_bucket():
+    backend = MemoryBackend(clock=Clock())
+    ip, email = ('login:ip:10.0.0.1', Rate(3, 60)), ('login:email:a@example.com', Rate(1, 60))
+
+    assert [d.allowed for d in backend.hit_all([ip, email])] == [True, True]
+    for _ in range(5):
+        decisions = backend.hit_all([ip, email])
+        assert [d.allowed for d in decisions] == [True, False]
+        assert decisions[0].remaining == 2
+
+    other_email = ('login:email:b@example.com', Rate(1, 60))
+    assert all(d.allowed for d in backend.hit_all([ip, other_email]))
+    assert backend.hit(ip[0], ip[1]).remaining == 0
+
+
+def test_buckets_refill_over_time():
+    clock = Clock()
+    backend = MemoryBackend(clock=clock)
+    rate = Rate(2, 60)
+
+    assert backend.hit('k', rate).allowed and backend.hit('k', rate).allowed
+    denied = backend.hit('k', rate)
+    assert not denied.allowed and denied.retry_after == 30
+
+    clock.now = 30
+    assert backend.hit('k', rate).allowed
+
+
+def test_proxy_fix_trusts_the_configured_number_of_hops(app, monkeypatch):
+    from app import create_app
+
+    monkeypatch.setenv('PROXY_FIX_X_FOR', '1')
+    proxied = create_app('testing')
+
+    @proxied.route('/client-ip')
+    def client_ip():
+        from flask import request
+        return {'ip': request.remote_addr}
+
+    response = proxied.test_client().get(
+        '/client-ip', headers={'X-Forwarded-For': '203.0.113.9, 198.51.100.7'},
+        environ_base={'REMOTE_ADDR': '10.0.0.2'},
+    )
+    assert response.get_json() == {'ip': '198.51.100.7'}
+
+    response = app.test_client().get('/', headers={'X-Forwarded-For': '203.0.113.9'})
+    assert app.config['PROXY_FIX_X_FOR'] == 0 and response.request.remote_addr == '127.0.0.1'
@@ -0,0 +1,27 @@
+# Unit tests for the in-memory revocation list
+from datetime import datetime, timedelta
+
+from app.repositories.revoked_token_repository import RevokedTokenRepository
+from app.security.revocation import RevocationList
+
+
+def test_sync_picks_up_revocations_from_other_workers(db):
+    revocations = RevocationList(sync_interval=0)
+    assert not revocations.is_revoked({'jti': 'a', 'fam': 'session'})
+
+    RevokedTokenRepository.add('session', datetime.utcnow() + timedelta(hours=1))
+
+    assert revocations.is_revoked({'jti': 'b', 'fam': 'session'})
+
+
+def test_failed_sync_rolls_back_the_session(db, monkeypatch):
+    def broken(since):
+        db.session.execute(db.text('SELECT * FROM no_such_table'))
+
+    monkeypatch.setattr(RevokedTokenRepository, 'find_created_since', broken)
+    revocations = RevocationList(sync_interval=0)
+
+    assert not revocations.is_revoked({'jti': 'a'})
+
+    assert not db.session().in_transaction()
+    assert db.session.execute(db.text('SELECT 1')).scalar() == 1
@@ -0,0 +1,122 @@
+# Unit tests for slot expansion (app.services.slot_engine)
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.models.doctor import DoctorAvailability
+from app.schemas.availability_schema import DoctorAvailabilitySchema
+from app.services.availability_service import MAX_SLOT_SEARCH_DAYS, AvailabilityService
+from app.services.interval_index import IntervalIndex
+from app.services.slot_engine import (
+    build_day_template, build_week_templates, iter_free_slots, minutes_to_time, parse_hhmm,
+)
+
+MONDAY = date(2031, 5, 5)
+
+
+def availability(day_of_week: int, start: str, end: str, step: int = 30, active: bool = True):
+    return DoctorAvailability(doctor_id=1, day_of_week=day_of_week, start_time=start, end_time=end,
+                              slot_duration_minutes=step, is_active=active)
+
+
+def slots(week, start_date: date, end_date: date, booked=()):
+    index = IntervalIndex.from_rows((1, day, s, e) for day, s, e in booked)
+    return [(slot.date, slot.start_time, slot.end_time)
+            for slot in iter_free_slots(1, week, lambda day: index.day(1, day), start_date, end_date)]
+
+
+def test_templates_expand_into_slots_for_working_days_only():
+    week = build_week_templates([availability(0, '09:00', '10:30'), availability(2, '14:00', '15:00', step=60)])
+
+    assert slots(week, MONDAY, MONDAY + timedelta(days=6)) == [
+        (MONDAY, time(9), time(9, 30)),
+        (MONDAY, time(9, 30), time(10)),
+        (MONDAY, time(10), time(10, 30)),
+        (MONDAY + timedelta(days=2), time(14), time(15)),
+    ]
+
+
+def test_partial_trailing_slot_and_inactive_days_are_dropped():
+    assert build_day_template(availability(0, '09:00', '09:50')).slot_count == 1
+    assert build_day_template(availability(0, '09:00', '09:20')) is None
+    assert build_day_template(availability(0, '09:00', '12:00', active=False)) is None
+
+
+def test_booked_slots_are_removed():
+    week = build_week_templates([availability(0, '09:00', '11:00')])
+
+    free = slots(week, MONDAY, MONDAY, booked=[(MONDAY, time(9, 30), time(10))])
+
+    assert [start for _, start, _ in free] == [time(9), time(10), time(10, 30)]
+
+
+def test_unaligned_booking_blocks_both_neighbouring_slots():
+    week = build_week_templates([availability(0, '09:00', '11:00')])
+
+    free = slots(week, MONDAY, MONDAY, booked=[(MONDAY, time(9, 45), time(10, 15))])
+
+    assert [start for _, start, _ in free] == [time(9), time(10, 30)]
+
+
+def test_bookings_on_other_days_do_not_matter():
+    week = build_week_templates([availability(0, '09:00', '10:00')])
+
+    free = slots(week, MONDAY, MONDAY, booked=[(MONDAY + timedelta(days=7), time(9), time(10))])
+
+    assert len(free) == 2
+
+
+def test_day_ending_at_midnight_has_a_last_slot_ending_at_00_00():
+    week = build_week_templates([availability(0, '23:00', '24:00')])
+
+    assert slots(week, MONDAY, MONDAY) == [(MONDAY, time(23), time(23, 30)), (MONDAY, time(23, 30), time(0))]
+    assert slots(week, MONDAY, MONDAY, booked=[(MONDAY, time(23, 30), time(0))]) == [
+        (MONDAY, time(23), time(23, 30)),
+    ]
+
+
+def test_day_starting_at_midnight_is_not_blocked_by_the_previous_evening():
+    week = build_week_templates([availability(0, '00:00', '01:00'), availability(6, '23:00', '24:00')])
+    sunday = MONDAY - timedelta(days=1)
+
+    free = slots(week, sunday, MONDAY, booked=[(sunday, time(23, 30), time(0))])
+
+    assert free == [(sunday, time(23), time(23, 30)), (MONDAY, time(0), time(0, 30)), (MONDAY, time(0, 30), time(1))]
+
+
+def test_hhmm_parsing_and_formatting():
+    assert parse_hhmm('24:00') == 1440
+    assert minutes_to_time(1440) == time(0)
+    assert minutes_to_time(parse_hhmm('23:59')) == time(23, 59)
+    for value in ('99:99', '24:30', '12:60'):
+        with pytest.raises(ValueError):
+            parse_hhmm(value)
+
+
+@pytest.mark.parametrize('start, end, valid', [
+    ('09:00', '17:00', True),
+    ('23:00', '24:00', True),
+    ('99:99', '17:00', False),
+    ('09:00', '24:30', False),
+    ('24:00', '24:00', False),
+    ('09:60', '17:00', False),
+    ('17:00', '09:00', False),
+    ('09:00', '09:00', False),
+])
+def test_schema_validates_the_working_window(start, end, valid):
+    errors = DoctorAvailabilitySchema().validate({'day_of_week': 0, 'start_time': start, 'end_time': end})
+
+    assert (not errors) is valid
+
+
+def test_search_window_is_capped_at_90_days():
+    service = AvailabilityService()
+
+    with pytest.raises(ValueError, match=str(MAX_SLOT_SEARCH_DAYS)):
+        service.find_free_slots(1, MONDAY, MONDAY + timedelta(days=MAX_SLOT_SEARCH_DAYS))
+    with pytest.raises(ValueError):
+        service.find_free_slots(1, MONDAY, MONDAY - timedelta(days=1))
+
+
+def test_search_window_of_exactly_90_days_is_allowed(db):
+    assert AvailabilityService().find_free_slots(1, MONDAY, MONDAY + timedelta(days=MAX_SLOT_SEARCH_DAYS - 1)) == []
@@ -0,0 +1,13 @@
+"""
+Production WSGI entrypoint:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app the application is created and prepared once in the master
+and inherited by every worker.
+"""
+from app import create_app
+from app.serving import prepare_app
+
+app = create_app()
+prepare_app(app)